@@ -11,6 +11,11 @@ import { fetchCarouselSlides } from '../../redux/actions/carouselSlide';
 
 const AUTO_SCROLL_DELAY = 6000;
 const SWIPE_THRESHOLD = 50;
+// Preferred formats first, the browser picks the first source it supports
+const IMAGE_SOURCE_TYPES = [
+	{ format: 'avif', type: 'image/avif' },
+	{ format: 'webp', type: 'image/webp' },
+];
 
 const getAirportCode = (airport) => {
 	if (!airport) return '';
@@ -74,6 +79,7 @@ export function transformSlides(items = [], { includeInactive = false } = {}) {
 				title: source.title || '',
 				description: source.description || '',
 				image: image,
+				srcset: source.srcset || {},
 				alt: source.alt || '',
 				priceText: HOME.poster_carousel.price_from(metrics.price_from, metrics.currency),
 				durationText: formatDuration(metrics.duration_minutes),
@@ -207,18 +213,23 @@ const PosterCarousel = ({
 								pointerEvents: active ? 'auto' : 'none',
 							}}
 						>
-							<Box
-								component='img'
-								src={item.image}
-								alt={item.alt || item.title}
-								sx={{
-									position: 'absolute',
-									inset: 0,
-									width: '100%',
-									height: '100%',
-									objectFit: 'cover',
-								}}
-							/>
+							<picture>
+								{IMAGE_SOURCE_TYPES.filter(({ format }) => item.srcset[format]).map(({ format, type }) => (
+									<source key={format} type={type} srcSet={item.srcset[format]} sizes='100vw' />
+								))}
+								<Box
+									component='img'
+									src={item.image}
+									alt={item.alt || item.title}
+									sx={{
+										position: 'absolute',
+										inset: 0,
+										width: '100%',
+										height: '100%',
+										objectFit: 'cover',
+									}}
+								/>
+							</picture>
 							<Box
 								sx={{
 									position: 'absolute',
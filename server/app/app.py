@@ -1,5 +1,5 @@
-import os
 import importlib
+import pkgutil
 
 from flask import Flask
 from flask_migrate import Migrate
@@ -7,325 +7,121 @@ from flask_cors import CORS
 
 from app.config import Config
 from app.logging_config import configure_logging
-from app.database import db
+from app.database import db, build_engine_options, register_engine_events
 from app.utils.email import init_mail
-from app.utils.limiter import init_limiter, limiter
+from app.utils.json_provider import OrjsonProvider
+from app.utils.lazy_import import resolve_lazy_views
+from app.utils.limiter import init_limiter
+from app.middlewares.compression_middleware import register_compression
 from app.middlewares.error_handler import register_error_handlers
 from app.middlewares.session_middleware import register_session_handler
+from app.middlewares.query_counter_middleware import register_query_counter, register_sql_profiler
+from app.middlewares.request_context_middleware import register_request_context
 
-from app.controllers._dev_controller import *
-from app.controllers.auth_controller import *
-from app.controllers.health_controller import *
-from app.controllers.user_controller import *
-from app.controllers.airport_controller import *
-from app.controllers.aircraft_controller import *
-from app.controllers.route_controller import *
-from app.controllers.flight_controller import *
-from app.controllers.tariff_controller import *
-from app.controllers.flight_tariff_controller import *
-from app.controllers.tariff_fee_controller import *
-from app.controllers.discount_controller import *
-from app.controllers.passenger_controller import *
-from app.controllers.booking_controller import *
-from app.controllers.booking_passenger_controller import *
-from app.controllers.booking_flight_passenger_controller import *
-from app.controllers.booking_flight_controller import *
-from app.controllers.booking_process_controller import *
-from app.controllers.booking_dashboard_controller import *
-from app.controllers.ticket_controller import *
-from app.controllers.payment_controller import *
-from app.controllers.airline_controller import *
-from app.controllers.country_controller import *
-from app.controllers.search_controller import *
-from app.controllers.timezone_controller import *
-from app.controllers.fee_controller import *
-from app.controllers.consent_doc_controller import *
-from app.controllers.consent_event_controller import *
-from app.controllers.passenger_export_controller import *
-from app.controllers.carousel_controller import *
-from app.controllers.seo_controller import *
-from app.controllers.ticket_import_controller import *
+
+# Blueprint modules per route group, imported only by profiles that serve them
+BLUEPRINTS = {
+    'health': 'app.blueprints.health:health',
+    'public': 'app.blueprints.public:public',
+    'admin': 'app.blueprints.admin:admin',
+    'webhook': 'app.blueprints.webhook:webhook',
+}
 
 
 def __import_models():
-    models_dir = 'app/models'
-    for dir_path, dir_names, file_names in os.walk(models_dir):
-        for file_name in [f for f in file_names if f.endswith('.py') and f != '__init__.py']:
-            file_path_wo_ext, _ = os.path.splitext(os.path.join(dir_path, file_name))
-            module_name = file_path_wo_ext.replace(os.sep, '.').replace(f"{models_dir}.", '')
-            importlib.import_module(module_name, package=None)
+    """Register every model with the mapper, relationships refer to each other by name"""
+    import app.models
+
+    for module in pkgutil.iter_modules(app.models.__path__, prefix='app.models.'):
+        importlib.import_module(module.name)
 
     return True
 
 
-def __create_app(_config_class, _db):
-    app = Flask(__name__)
-    app.config.from_object(_config_class)
+def __register_session_listeners():
+    """Cache invalidation has to run in every process that writes, not only where its controllers loaded"""
+    from app.models.flight_fare import flight_fare_changes
+    from app.models.route_metric import route_metric_changes
+    from app.utils.airport_index import airport_index_changes
+    from app.utils.fare_calendar import fare_calendar_changes
+
+    for changes in (flight_fare_changes, route_metric_changes, airport_index_changes, fare_calendar_changes):
+        changes.register()
+
+
+def __load_blueprint(name):
+    module_name, attribute = BLUEPRINTS[name].split(':')
+    return getattr(importlib.import_module(module_name), attribute)
+
 
+def __register_http(app, features):
+    """Request handling shared by every profile that serves routes"""
     # Enable CORS for all routes
     CORS(app, resources={r"/*": {'origins': Config.CORS_ORIGINS}})
 
+    # after_request handlers run in reverse, so compression sees the final body and headers
+    register_compression(app)
+    init_limiter(app)
+    register_error_handlers(app)
+    register_session_handler(app)
+    register_request_context(app)
+    register_query_counter(app)
+    register_sql_profiler(app)
+
+    for name in ('health', *features):
+        app.register_blueprint(__load_blueprint(name))
+
+    # Production keeps controller imports lazy, dev and test pay for them to catch typos at boot
+    if Config.APP_ENV in ('dev', 'test'):
+        resolve_lazy_views(app)
+
+
+def create_app(profile=None):
+    """Build the application with the route groups of the given profile, see Config.APP_PROFILES"""
+    profile = profile or Config.APP_PROFILE
+    if profile not in Config.APP_PROFILES:
+        raise ValueError(f'Unknown app profile: {profile}')
+    features = Config.APP_PROFILES[profile]
+
+    app = Flask(__name__)
+    app.config.from_object(Config)
+    app.json = OrjsonProvider(app)
+    app.config['APP_PROFILE'] = profile
+
     # Required for tracking migrations
     __import_models()
+    __register_session_listeners()
 
-    _db.init_app(app)
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = build_engine_options(Config.PROCESS_TYPE)
+    db.init_app(app)
+    register_engine_events(app, db)
     init_mail(app)
-    init_limiter(app)
-    register_error_handlers(app)
-    register_session_handler(app)
 
-    # health
-    app.route('/health/live', methods=['GET'])(health_live)
-    app.route('/health/ready', methods=['GET'])(health_ready)
-
-    # auth
-    app.route('/register', methods=['POST'])(register)
-    app.route('/login', methods=['POST'])(limiter.limit(Config.LOGIN_RATE_LIMIT)(login))
-    app.route('/auth', methods=['GET'])(auth)
-    app.route('/forgot_password', methods=['POST'])(forgot_password)
-    app.route('/reset_password', methods=['POST'])(reset_password)
-    app.route('/activate', methods=['POST'])(activate_account)
-    app.route('/setup_2fa', methods=['POST'])(setup_2fa)
-    app.route('/verify_2fa', methods=['POST'])(verify_2fa)
-
-    # users
-    app.route('/users', methods=['GET'])(get_users)
-    app.route('/users', methods=['POST'])(create_user)
-    app.route('/users/<int:user_id>', methods=['GET'])(get_user)
-    app.route('/users/<int:user_id>', methods=['PUT'])(update_user)
-    app.route('/users/<int:user_id>', methods=['DELETE'])(delete_user)
-    app.route('/users/<int:user_id>/activate', methods=['PUT'])(activate_user)
-    app.route('/users/<int:user_id>/deactivate', methods=['PUT'])(deactivate_user)
-    app.route('/users/<int:user_id>/bookings', methods=['GET'])(get_user_bookings)
-    app.route('/users/<int:user_id>/passengers', methods=['GET'])(get_user_passengers)
-    app.route('/users/<int:user_id>/passengers', methods=['POST'])(create_user_passenger)
-    app.route('/users/<int:user_id>/passengers/<int:passenger_id>', methods=['PUT'])(update_user_passenger)
-    app.route('/users/<int:user_id>/passengers/<int:passenger_id>', methods=['DELETE'])(delete_user_passenger)
-    app.route('/users/change_password', methods=['PUT'])(change_password)
-
-    # airports
-    app.route('/airports', methods=['GET'])(get_airports)
-    app.route('/airports', methods=['POST'])(create_airport)
-    app.route('/airports/<int:airport_id>', methods=['GET'])(get_airport)
-    app.route('/airports/<int:airport_id>', methods=['PUT'])(update_airport)
-    app.route('/airports/<int:airport_id>', methods=['DELETE'])(delete_airport)
-    app.route('/airports/upload', methods=['POST'])(upload_airport)
-    app.route('/airports/template', methods=['GET'])(get_airport_template)
-    app.route('/airports/download', methods=['GET'])(download_airports)
-
-    # aircrafts
-    app.route('/aircrafts', methods=['GET'])(get_aircrafts)
-    app.route('/aircrafts', methods=['POST'])(create_aircraft)
-    app.route('/aircrafts/<int:aircraft_id>', methods=['GET'])(get_aircraft)
-    app.route('/aircrafts/<int:aircraft_id>', methods=['PUT'])(update_aircraft)
-    app.route('/aircrafts/<int:aircraft_id>', methods=['DELETE'])(delete_aircraft)
-
-    # airlines
-    app.route('/airlines', methods=['GET'])(get_airlines)
-    app.route('/airlines', methods=['POST'])(create_airline)
-    app.route('/airlines/<int:airline_id>', methods=['GET'])(get_airline)
-    app.route('/airlines/<int:airline_id>', methods=['PUT'])(update_airline)
-    app.route('/airlines/<int:airline_id>', methods=['DELETE'])(delete_airline)
-    app.route('/airlines/upload', methods=['POST'])(upload_airline)
-    app.route('/airlines/template', methods=['GET'])(get_airline_template)
-    app.route('/airlines/download', methods=['GET'])(download_airlines)
-
-    # countries
-    app.route('/countries', methods=['GET'])(get_countries)
-    app.route('/countries', methods=['POST'])(create_country)
-    app.route('/countries/<int:country_id>', methods=['GET'])(get_country)
-    app.route('/countries/<int:country_id>', methods=['PUT'])(update_country)
-    app.route('/countries/<int:country_id>', methods=['DELETE'])(delete_country)
-    app.route('/countries/upload', methods=['POST'])(upload_country)
-    app.route('/countries/template', methods=['GET'])(get_country_template)
-    app.route('/countries/download', methods=['GET'])(download_countries)
-
-    # timezones
-    app.route('/timezones', methods=['GET'])(get_timezones)
-    app.route('/timezones', methods=['POST'])(create_timezone)
-    app.route('/timezones/<int:timezone_id>', methods=['GET'])(get_timezone)
-    app.route('/timezones/<int:timezone_id>', methods=['PUT'])(update_timezone)
-    app.route('/timezones/<int:timezone_id>', methods=['DELETE'])(delete_timezone)
-    app.route('/timezones/upload', methods=['POST'])(upload_timezone)
-    app.route('/timezones/template', methods=['GET'])(get_timezone_template)
-    app.route('/timezones/download', methods=['GET'])(download_timezones)
-
-    # routes
-    app.route('/routes', methods=['GET'])(get_routes)
-    app.route('/routes', methods=['POST'])(create_route)
-    app.route('/routes/<int:route_id>', methods=['GET'])(get_route)
-    app.route('/routes/<int:route_id>', methods=['PUT'])(update_route)
-    app.route('/routes/<int:route_id>', methods=['DELETE'])(delete_route)
-
-    # carousel slides
-    app.route('/carousel_slides', methods=['GET'])(get_carousel_slides)
-    app.route('/carousel_slides', methods=['POST'])(create_carousel_slide)
-    app.route('/carousel_slides/<int:slide_id>', methods=['GET'])(get_carousel_slide)
-    app.route('/carousel_slides/<int:slide_id>', methods=['PUT'])(update_carousel_slide)
-    app.route('/carousel_slides/<int:slide_id>', methods=['DELETE'])(delete_carousel_slide)
-    app.route('/carousel_slides/<int:slide_id>/upload', methods=['POST'])(upload_carousel_slide_image)
-
-    # flights
-    app.route('/flights', methods=['GET'])(get_flights)
-    app.route('/flights', methods=['POST'])(create_flight)
-    app.route('/flights/<int:flight_id>', methods=['GET'])(get_flight)
-    app.route('/flights/<int:flight_id>', methods=['PUT'])(update_flight)
-    app.route('/flights/<int:flight_id>', methods=['DELETE'])(delete_flight)
-    app.route('/flights/upload', methods=['POST'])(upload_flight)
-    app.route('/flights/template', methods=['GET'])(get_flight_template)
-    app.route('/flights/download', methods=['GET'])(download_flights)
-
-    # tariffs
-    app.route('/tariffs', methods=['GET'])(get_tariffs)
-    app.route('/tariffs', methods=['POST'])(create_tariff)
-    app.route('/tariffs/<int:tariff_id>', methods=['GET'])(get_tariff)
-    app.route('/tariffs/<int:tariff_id>', methods=['PUT'])(update_tariff)
-    app.route('/tariffs/<int:tariff_id>', methods=['DELETE'])(delete_tariff)
-
-    # flight tariffs
-    app.route('/flight_tariffs', methods=['GET'])(get_flight_tariffs)
-    app.route('/flight_tariffs', methods=['POST'])(create_flight_tariff)
-    app.route('/flight_tariffs/<int:flight_tariff_id>', methods=['GET'])(get_flight_tariff)
-    app.route('/flight_tariffs/<int:flight_tariff_id>', methods=['PUT'])(update_flight_tariff)
-    app.route('/flight_tariffs/<int:flight_tariff_id>', methods=['DELETE'])(delete_flight_tariff)
-
-    # tariff fees
-    app.route('/tariff_fees', methods=['GET'])(get_tariff_fees)
-    app.route('/tariff_fees', methods=['POST'])(create_tariff_fee)
-    app.route('/tariff_fees/<int:tariff_fee_id>', methods=['GET'])(get_tariff_fee)
-    app.route('/tariff_fees/<int:tariff_fee_id>', methods=['PUT'])(update_tariff_fee)
-    app.route('/tariff_fees/<int:tariff_fee_id>', methods=['DELETE'])(delete_tariff_fee)
-
-    # discounts
-    app.route('/discounts', methods=['GET'])(get_discounts)
-    app.route('/discounts', methods=['POST'])(create_discount)
-    app.route('/discounts/<int:discount_id>', methods=['GET'])(get_discount)
-    app.route('/discounts/<int:discount_id>', methods=['PUT'])(update_discount)
-    app.route('/discounts/<int:discount_id>', methods=['DELETE'])(delete_discount)
-
-    # fees
-    app.route('/fees', methods=['GET'])(get_fees)
-    app.route('/fees', methods=['POST'])(create_fee)
-    app.route('/fees/<int:fee_id>', methods=['GET'])(get_fee)
-    app.route('/fees/<int:fee_id>', methods=['PUT'])(update_fee)
-    app.route('/fees/<int:fee_id>', methods=['DELETE'])(delete_fee)
-
-    # consent docs
-    app.route('/consent_docs', methods=['GET'])(get_consent_docs)
-    app.route('/consent_docs', methods=['POST'])(create_consent_doc)
-    app.route('/consent_docs/<uuid:doc_id>', methods=['GET'])(get_consent_doc)
-    app.route('/consent_docs/<uuid:doc_id>', methods=['PUT'])(update_consent_doc)
-    app.route('/consent_docs/<uuid:doc_id>', methods=['DELETE'])(delete_consent_doc)
-    app.route('/consent_docs/latest/<string:doc_type>', methods=['GET'])(get_latest_consent_doc)
-
-    # consent events
-    app.route('/consent_events', methods=['GET'])(get_consent_events)
-    app.route('/consent_events', methods=['POST'])(create_consent_event)
-    app.route('/consent_events/<uuid:event_id>', methods=['GET'])(get_consent_event)
-    app.route('/consent_events/<uuid:event_id>', methods=['PUT'])(update_consent_event)
-    app.route('/consent_events/<uuid:event_id>', methods=['DELETE'])(delete_consent_event)
-
-    # passengers
-    app.route('/passengers', methods=['GET'])(get_passengers)
-    app.route('/passengers', methods=['POST'])(create_passenger)
-    app.route('/passengers/<int:passenger_id>', methods=['GET'])(get_passenger)
-    app.route('/passengers/<int:passenger_id>', methods=['PUT'])(update_passenger)
-    app.route('/passengers/<int:passenger_id>', methods=['DELETE'])(delete_passenger)
-
-    # bookings
-    app.route('/bookings', methods=['GET'])(get_bookings)
-    app.route('/bookings', methods=['POST'])(create_booking)
-    app.route('/bookings/<int:booking_id>', methods=['GET'])(get_booking)
-    app.route('/bookings/<int:booking_id>', methods=['PUT'])(update_booking)
-    app.route('/bookings/<int:booking_id>', methods=['DELETE'])(delete_booking)
-
-    # booking passengers
-    app.route('/booking_passengers', methods=['GET'])(get_booking_passengers)
-    app.route('/booking_passengers', methods=['POST'])(create_booking_passenger)
-    app.route('/booking_passengers/<int:booking_passenger_id>', methods=['GET'])(get_booking_passenger)
-    app.route('/booking_passengers/<int:booking_passenger_id>', methods=['PUT'])(update_booking_passenger)
-    app.route('/booking_passengers/<int:booking_passenger_id>', methods=['DELETE'])(delete_booking_passenger)
-
-    # booking flight passengers
-    app.route('/booking_flight_passengers', methods=['GET'])(get_booking_flight_passengers)
-    app.route('/booking_flight_passengers', methods=['POST'])(create_booking_flight_passenger)
-    app.route('/booking_flight_passengers/<int:booking_flight_passenger_id>', methods=['GET'])(get_booking_flight_passenger)
-    app.route('/booking_flight_passengers/<int:booking_flight_passenger_id>', methods=['PUT'])(update_booking_flight_passenger)
-    app.route('/booking_flight_passengers/<int:booking_flight_passenger_id>', methods=['DELETE'])(delete_booking_flight_passenger)
-
-    # booking flights
-    app.route('/booking_flights', methods=['GET'])(get_booking_flights)
-    app.route('/booking_flights', methods=['POST'])(create_booking_flight)
-    app.route('/booking_flights/<int:booking_flight_id>', methods=['GET'])(get_booking_flight)
-    app.route('/booking_flights/<int:booking_flight_id>', methods=['PUT'])(update_booking_flight)
-    app.route('/booking_flights/<int:booking_flight_id>', methods=['DELETE'])(delete_booking_flight)
-
-    # tickets
-    app.route('/tickets', methods=['GET'])(get_tickets)
-    app.route('/tickets', methods=['POST'])(create_ticket)
-    app.route('/tickets/<int:ticket_id>', methods=['GET'])(get_ticket)
-    app.route('/tickets/<int:ticket_id>', methods=['PUT'])(update_ticket)
-    app.route('/tickets/<int:ticket_id>', methods=['DELETE'])(delete_ticket)
-
-    # payments
-    app.route('/payments', methods=['GET'])(get_payments)
-    app.route('/payments', methods=['POST'])(create_payment)
-    app.route('/payments/<int:payment_id>', methods=['GET'])(get_payment)
-    app.route('/payments/<int:payment_id>', methods=['PUT'])(update_payment)
-    app.route('/payments/<int:payment_id>', methods=['DELETE'])(delete_payment)
-
-    # search
-    app.route('/search/airports', methods=['GET'])(search_airports)
-    app.route('/search/flights', methods=['GET'])(search_flights)
-    app.route('/search/flights/nearby', methods=['GET'])(search_nearby_flights)
-    app.route('/search/flights/schedule', methods=['GET'])(schedule_flights)
-    app.route('/search/flights/<int:flight_id>/tariffs', methods=['GET'])(search_flight_tariffs)
-    app.route('/search/calculate/price', methods=['POST'])(calculate_price)
-    app.route('/search/booking', methods=['POST'])(search_booking)
-
-    # booking process
-    app.route('/booking/<public_id>/access', methods=['GET'])(get_booking_process_access)
-    app.route('/booking/<public_id>/details', methods=['GET'])(get_booking_process_details)
-    app.route('/booking/<public_id>/pdf', methods=['GET'])(get_booking_process_pdf)
-    app.route('/booking/<public_id>/itinerary-pdf/<int:booking_flight_id>', methods=['GET'])(get_booking_flight_itinerary_pdf)
-    app.route('/booking/create', methods=['POST'])(create_booking_process)
-    app.route('/booking/passengers', methods=['POST'])(create_booking_process_passengers)
-    app.route('/booking/confirm', methods=['POST'])(confirm_booking_process)
-    app.route('/booking/payment/<public_id>/details', methods=['GET'])(get_booking_process_payment)
-    app.route('/booking/<public_id>/<ticket_id>/refund', methods=['GET'])(get_request_refund_details)
-    app.route('/booking/<public_id>/<ticket_id>/refund', methods=['POST'])(request_refund)
-    app.route('/booking/dashboard', methods=['GET'])(get_booking_dashboard)
-    app.route('/booking/dashboard/bookings/<int:booking_id>/tickets/<int:ticket_id>/refund', methods=['GET'])(get_booking_ticket_refund_details)
-    app.route('/booking/dashboard/bookings/<int:booking_id>/tickets/<int:ticket_id>/refund/confirm', methods=['POST'])(confirm_booking_ticket_refund)
-    app.route('/booking/dashboard/bookings/<int:booking_id>/tickets/<int:ticket_id>/refund/reject', methods=['POST'])(reject_booking_ticket_refund)
-
-    # exports
-    app.route('/exports/flight-passengers', methods=['POST'])(export_pending_ticket_passengers)
-    app.route('/exports/flight-passengers', methods=['GET'])(get_pending_ticket_passengers_flights)
-    app.route('/exports/flight-passengers/flight', methods=['POST'])(export_pending_ticket_passengers_by_flight)
-    app.route('/exports/flight-passengers/flight/routes', methods=['GET'])(get_pending_ticket_passengers_routes)
-    app.route('/exports/flight-passengers/flight/routes/<int:route_id>', methods=['GET'])(get_pending_ticket_passengers_flights_by_route)
-
-    # imports
-    app.route('/imports/tickets', methods=['POST'])(import_tickets)
-    app.route('/imports/tickets/confirm', methods=['POST'])(confirm_import_tickets)
-
-    # seo
-    app.route('/seo/static-routes', methods=['GET'])(list_static_seo_routes)
-    app.route('/seo/schedule/<string:origin_code>/<string:dest_code>', methods=['GET'])(render_static_schedule_page)
-
-    # dev
-    app.route('/dev/clear/<string:table_name>', methods=['DELETE'])(clear_table)
-    app.route('/dev/clear_filtered/<string:table_name>', methods=['DELETE'])(clear_filtered_table)
-
-    # external
-    app.route('/webhooks/yookassa', methods=['POST'])(yookassa_webhook)
+    # Celery workers only need the database, mail and templates
+    if features:
+        __register_http(app, features)
 
     migrate = Migrate(app, db)
 
     return app
 
 
-configure_logging()
+_app = None
 
-app = __create_app(Config, db)
+
+def get_app():
+    """Application of this process, built on first use with its Config.APP_PROFILE"""
+    global _app
+    if _app is None:
+        _app = create_app()
+    return _app
+
+
+def __getattr__(name):
+    # gunicorn and the flask CLI load app.app:app
+    if name == 'app':
+        return get_app()
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
+configure_logging()
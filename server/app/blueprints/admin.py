@@ -0,0 +1,222 @@
+"""Back office API: reference data management, dashboards, exports and imports"""
+from flask import Blueprint
+
+from app.middlewares.session_middleware import statement_timeout
+from app.utils.lazy_import import LazyModule
+
+user_controller = LazyModule('app.controllers.user_controller')
+airport_controller = LazyModule('app.controllers.airport_controller')
+aircraft_controller = LazyModule('app.controllers.aircraft_controller')
+airline_controller = LazyModule('app.controllers.airline_controller')
+country_controller = LazyModule('app.controllers.country_controller')
+timezone_controller = LazyModule('app.controllers.timezone_controller')
+route_controller = LazyModule('app.controllers.route_controller')
+carousel_controller = LazyModule('app.controllers.carousel_controller')
+flight_controller = LazyModule('app.controllers.flight_controller')
+tariff_controller = LazyModule('app.controllers.tariff_controller')
+flight_tariff_controller = LazyModule('app.controllers.flight_tariff_controller')
+tariff_fee_controller = LazyModule('app.controllers.tariff_fee_controller')
+discount_controller = LazyModule('app.controllers.discount_controller')
+fee_controller = LazyModule('app.controllers.fee_controller')
+consent_doc_controller = LazyModule('app.controllers.consent_doc_controller')
+consent_event_controller = LazyModule('app.controllers.consent_event_controller')
+passenger_controller = LazyModule('app.controllers.passenger_controller')
+booking_controller = LazyModule('app.controllers.booking_controller')
+booking_passenger_controller = LazyModule('app.controllers.booking_passenger_controller')
+booking_flight_passenger_controller = LazyModule('app.controllers.booking_flight_passenger_controller')
+booking_flight_controller = LazyModule('app.controllers.booking_flight_controller')
+ticket_controller = LazyModule('app.controllers.ticket_controller')
+payment_controller = LazyModule('app.controllers.payment_controller')
+payment_webhook_event_controller = LazyModule('app.controllers.payment_webhook_event_controller')
+booking_dashboard_controller = LazyModule('app.controllers.booking_dashboard_controller')
+passenger_export_controller = LazyModule('app.controllers.passenger_export_controller')
+ticket_import_controller = LazyModule('app.controllers.ticket_import_controller')
+_dev_controller = LazyModule('app.controllers._dev_controller')
+debug_controller = LazyModule('app.controllers.debug_controller')
+
+admin = Blueprint('admin', __name__)
+
+# users
+admin.route('/users', methods=['GET'])(user_controller.get_users)
+admin.route('/users', methods=['POST'])(user_controller.create_user)
+admin.route('/users/<int:user_id>', methods=['GET'])(user_controller.get_user)
+admin.route('/users/<int:user_id>', methods=['DELETE'])(user_controller.delete_user)
+admin.route('/users/<int:user_id>/activate', methods=['PUT'])(user_controller.activate_user)
+admin.route('/users/<int:user_id>/deactivate', methods=['PUT'])(user_controller.deactivate_user)
+
+# airports
+admin.route('/airports', methods=['POST'])(airport_controller.create_airport)
+admin.route('/airports/<int:airport_id>', methods=['PUT'])(airport_controller.update_airport)
+admin.route('/airports/<int:airport_id>', methods=['DELETE'])(airport_controller.delete_airport)
+admin.route('/airports/upload', methods=['POST'])(statement_timeout('report')(airport_controller.upload_airport))
+admin.route('/airports/template', methods=['GET'])(airport_controller.get_airport_template)
+admin.route('/airports/download', methods=['GET'])(statement_timeout('report')(airport_controller.download_airports))
+
+# aircrafts
+admin.route('/aircrafts', methods=['POST'])(aircraft_controller.create_aircraft)
+admin.route('/aircrafts/<int:aircraft_id>', methods=['PUT'])(aircraft_controller.update_aircraft)
+admin.route('/aircrafts/<int:aircraft_id>', methods=['DELETE'])(aircraft_controller.delete_aircraft)
+
+# airlines
+admin.route('/airlines', methods=['POST'])(airline_controller.create_airline)
+admin.route('/airlines/<int:airline_id>', methods=['PUT'])(airline_controller.update_airline)
+admin.route('/airlines/<int:airline_id>', methods=['DELETE'])(airline_controller.delete_airline)
+admin.route('/airlines/upload', methods=['POST'])(statement_timeout('report')(airline_controller.upload_airline))
+admin.route('/airlines/template', methods=['GET'])(airline_controller.get_airline_template)
+admin.route('/airlines/download', methods=['GET'])(statement_timeout('report')(airline_controller.download_airlines))
+
+# countries
+admin.route('/countries', methods=['POST'])(country_controller.create_country)
+admin.route('/countries/<int:country_id>', methods=['PUT'])(country_controller.update_country)
+admin.route('/countries/<int:country_id>', methods=['DELETE'])(country_controller.delete_country)
+admin.route('/countries/upload', methods=['POST'])(statement_timeout('report')(country_controller.upload_country))
+admin.route('/countries/template', methods=['GET'])(country_controller.get_country_template)
+admin.route('/countries/download', methods=['GET'])(statement_timeout('report')(country_controller.download_countries))
+
+# timezones
+admin.route('/timezones', methods=['GET'])(timezone_controller.get_timezones)
+admin.route('/timezones', methods=['POST'])(timezone_controller.create_timezone)
+admin.route('/timezones/<int:timezone_id>', methods=['GET'])(timezone_controller.get_timezone)
+admin.route('/timezones/<int:timezone_id>', methods=['PUT'])(timezone_controller.update_timezone)
+admin.route('/timezones/<int:timezone_id>', methods=['DELETE'])(timezone_controller.delete_timezone)
+admin.route('/timezones/upload', methods=['POST'])(statement_timeout('report')(timezone_controller.upload_timezone))
+admin.route('/timezones/template', methods=['GET'])(timezone_controller.get_timezone_template)
+admin.route('/timezones/download', methods=['GET'])(statement_timeout('report')(timezone_controller.download_timezones))
+
+# routes
+admin.route('/routes', methods=['POST'])(route_controller.create_route)
+admin.route('/routes/<int:route_id>', methods=['PUT'])(route_controller.update_route)
+admin.route('/routes/<int:route_id>', methods=['DELETE'])(route_controller.delete_route)
+
+# carousel slides
+admin.route('/carousel_slides', methods=['POST'])(carousel_controller.create_carousel_slide)
+admin.route('/carousel_slides/<int:slide_id>', methods=['PUT'])(carousel_controller.update_carousel_slide)
+admin.route('/carousel_slides/<int:slide_id>', methods=['DELETE'])(carousel_controller.delete_carousel_slide)
+admin.route('/carousel_slides/<int:slide_id>/upload', methods=['POST'])(carousel_controller.upload_carousel_slide_image)
+
+# flights
+admin.route('/flights', methods=['POST'])(flight_controller.create_flight)
+admin.route('/flights/<int:flight_id>', methods=['PUT'])(flight_controller.update_flight)
+admin.route('/flights/<int:flight_id>', methods=['DELETE'])(flight_controller.delete_flight)
+admin.route('/flights/upload', methods=['POST'])(statement_timeout('report')(flight_controller.upload_flight))
+admin.route('/flights/template', methods=['GET'])(flight_controller.get_flight_template)
+admin.route('/flights/download', methods=['GET'])(statement_timeout('report')(flight_controller.download_flights))
+
+# tariffs
+admin.route('/tariffs', methods=['POST'])(tariff_controller.create_tariff)
+admin.route('/tariffs/<int:tariff_id>', methods=['PUT'])(tariff_controller.update_tariff)
+admin.route('/tariffs/<int:tariff_id>', methods=['DELETE'])(tariff_controller.delete_tariff)
+
+# flight tariffs
+admin.route('/flight_tariffs', methods=['GET'])(flight_tariff_controller.get_flight_tariffs)
+admin.route('/flight_tariffs', methods=['POST'])(flight_tariff_controller.create_flight_tariff)
+admin.route('/flight_tariffs/<int:flight_tariff_id>', methods=['GET'])(flight_tariff_controller.get_flight_tariff)
+admin.route('/flight_tariffs/<int:flight_tariff_id>', methods=['PUT'])(flight_tariff_controller.update_flight_tariff)
+admin.route('/flight_tariffs/<int:flight_tariff_id>', methods=['DELETE'])(flight_tariff_controller.delete_flight_tariff)
+
+# tariff fees
+admin.route('/tariff_fees', methods=['GET'])(tariff_fee_controller.get_tariff_fees)
+admin.route('/tariff_fees', methods=['POST'])(tariff_fee_controller.create_tariff_fee)
+admin.route('/tariff_fees/<int:tariff_fee_id>', methods=['GET'])(tariff_fee_controller.get_tariff_fee)
+admin.route('/tariff_fees/<int:tariff_fee_id>', methods=['PUT'])(tariff_fee_controller.update_tariff_fee)
+admin.route('/tariff_fees/<int:tariff_fee_id>', methods=['DELETE'])(tariff_fee_controller.delete_tariff_fee)
+
+# discounts
+admin.route('/discounts', methods=['GET'])(discount_controller.get_discounts)
+admin.route('/discounts', methods=['POST'])(discount_controller.create_discount)
+admin.route('/discounts/<int:discount_id>', methods=['GET'])(discount_controller.get_discount)
+admin.route('/discounts/<int:discount_id>', methods=['PUT'])(discount_controller.update_discount)
+admin.route('/discounts/<int:discount_id>', methods=['DELETE'])(discount_controller.delete_discount)
+
+# fees
+admin.route('/fees', methods=['POST'])(fee_controller.create_fee)
+admin.route('/fees/<int:fee_id>', methods=['PUT'])(fee_controller.update_fee)
+admin.route('/fees/<int:fee_id>', methods=['DELETE'])(fee_controller.delete_fee)
+
+# consent docs
+admin.route('/consent_docs', methods=['POST'])(consent_doc_controller.create_consent_doc)
+admin.route('/consent_docs/<uuid:doc_id>', methods=['PUT'])(consent_doc_controller.update_consent_doc)
+admin.route('/consent_docs/<uuid:doc_id>', methods=['DELETE'])(consent_doc_controller.delete_consent_doc)
+
+# consent events
+admin.route('/consent_events', methods=['POST'])(consent_event_controller.create_consent_event)
+admin.route('/consent_events/<uuid:event_id>', methods=['PUT'])(consent_event_controller.update_consent_event)
+admin.route('/consent_events/<uuid:event_id>', methods=['DELETE'])(consent_event_controller.delete_consent_event)
+
+# passengers
+admin.route('/passengers', methods=['GET'])(passenger_controller.get_passengers)
+admin.route('/passengers', methods=['POST'])(passenger_controller.create_passenger)
+admin.route('/passengers/<int:passenger_id>', methods=['GET'])(passenger_controller.get_passenger)
+admin.route('/passengers/<int:passenger_id>', methods=['PUT'])(passenger_controller.update_passenger)
+admin.route('/passengers/<int:passenger_id>', methods=['DELETE'])(passenger_controller.delete_passenger)
+
+# bookings
+admin.route('/bookings', methods=['GET'])(booking_controller.get_bookings)
+admin.route('/bookings', methods=['POST'])(booking_controller.create_booking)
+admin.route('/bookings/<int:booking_id>', methods=['PUT'])(booking_controller.update_booking)
+admin.route('/bookings/<int:booking_id>', methods=['DELETE'])(booking_controller.delete_booking)
+
+# booking passengers
+admin.route('/booking_passengers', methods=['GET'])(booking_passenger_controller.get_booking_passengers)
+admin.route('/booking_passengers', methods=['POST'])(booking_passenger_controller.create_booking_passenger)
+admin.route('/booking_passengers/<int:booking_passenger_id>', methods=['GET'])(booking_passenger_controller.get_booking_passenger)
+admin.route('/booking_passengers/<int:booking_passenger_id>', methods=['PUT'])(booking_passenger_controller.update_booking_passenger)
+admin.route('/booking_passengers/<int:booking_passenger_id>', methods=['DELETE'])(booking_passenger_controller.delete_booking_passenger)
+
+# booking flight passengers
+admin.route('/booking_flight_passengers', methods=['GET'])(booking_flight_passenger_controller.get_booking_flight_passengers)
+admin.route('/booking_flight_passengers', methods=['POST'])(booking_flight_passenger_controller.create_booking_flight_passenger)
+admin.route('/booking_flight_passengers/<int:booking_flight_passenger_id>', methods=['GET'])(booking_flight_passenger_controller.get_booking_flight_passenger)
+admin.route('/booking_flight_passengers/<int:booking_flight_passenger_id>', methods=['PUT'])(booking_flight_passenger_controller.update_booking_flight_passenger)
+admin.route('/booking_flight_passengers/<int:booking_flight_passenger_id>', methods=['DELETE'])(booking_flight_passenger_controller.delete_booking_flight_passenger)
+
+# booking flights
+admin.route('/booking_flights', methods=['GET'])(booking_flight_controller.get_booking_flights)
+admin.route('/booking_flights', methods=['POST'])(booking_flight_controller.create_booking_flight)
+admin.route('/booking_flights/<int:booking_flight_id>', methods=['GET'])(booking_flight_controller.get_booking_flight)
+admin.route('/booking_flights/<int:booking_flight_id>', methods=['PUT'])(booking_flight_controller.update_booking_flight)
+admin.route('/booking_flights/<int:booking_flight_id>', methods=['DELETE'])(booking_flight_controller.delete_booking_flight)
+
+# tickets
+admin.route('/tickets', methods=['GET'])(ticket_controller.get_tickets)
+admin.route('/tickets', methods=['POST'])(ticket_controller.create_ticket)
+admin.route('/tickets/<int:ticket_id>', methods=['GET'])(ticket_controller.get_ticket)
+admin.route('/tickets/<int:ticket_id>', methods=['PUT'])(ticket_controller.update_ticket)
+admin.route('/tickets/<int:ticket_id>', methods=['DELETE'])(ticket_controller.delete_ticket)
+
+# payments
+admin.route('/payments', methods=['GET'])(payment_controller.get_payments)
+admin.route('/payments', methods=['POST'])(payment_controller.create_payment)
+admin.route('/payments/<int:payment_id>', methods=['GET'])(payment_controller.get_payment)
+admin.route('/payments/<int:payment_id>', methods=['PUT'])(payment_controller.update_payment)
+admin.route('/payments/<int:payment_id>', methods=['DELETE'])(payment_controller.delete_payment)
+
+# payment webhook events
+admin.route('/payment_webhook_events', methods=['GET'])(payment_webhook_event_controller.get_payment_webhook_events)
+admin.route('/payment_webhook_events/<int:event_id>', methods=['GET'])(payment_webhook_event_controller.get_payment_webhook_event)
+admin.route('/payment_webhook_events/<int:event_id>/replay', methods=['POST'])(payment_webhook_event_controller.replay_payment_webhook_event)
+
+# booking process
+admin.route('/booking/dashboard', methods=['GET'])(statement_timeout('report')(booking_dashboard_controller.get_booking_dashboard))
+admin.route('/booking/dashboard/search', methods=['GET'])(statement_timeout('search')(booking_dashboard_controller.search_bookings_typeahead))
+admin.route('/booking/dashboard/bookings/<int:booking_id>/tickets/<int:ticket_id>/refund', methods=['GET'])(booking_dashboard_controller.get_booking_ticket_refund_details)
+admin.route('/booking/dashboard/bookings/<int:booking_id>/tickets/<int:ticket_id>/refund/confirm', methods=['POST'])(booking_dashboard_controller.confirm_booking_ticket_refund)
+admin.route('/booking/dashboard/bookings/<int:booking_id>/tickets/<int:ticket_id>/refund/reject', methods=['POST'])(booking_dashboard_controller.reject_booking_ticket_refund)
+
+# exports
+admin.route('/exports/flight-passengers', methods=['POST'])(statement_timeout('report')(passenger_export_controller.export_pending_ticket_passengers))
+admin.route('/exports/flight-passengers', methods=['GET'])(statement_timeout('report')(passenger_export_controller.get_pending_ticket_passengers_flights))
+admin.route('/exports/flight-passengers/flight', methods=['POST'])(statement_timeout('report')(passenger_export_controller.export_pending_ticket_passengers_by_flight))
+admin.route('/exports/flight-passengers/flight/routes', methods=['GET'])(passenger_export_controller.get_pending_ticket_passengers_routes)
+admin.route('/exports/flight-passengers/flight/routes/<int:route_id>', methods=['GET'])(passenger_export_controller.get_pending_ticket_passengers_flights_by_route)
+
+# imports
+admin.route('/imports/tickets', methods=['POST'])(statement_timeout('report')(ticket_import_controller.import_tickets))
+admin.route('/imports/tickets/confirm', methods=['POST'])(statement_timeout('report')(ticket_import_controller.confirm_import_tickets))
+
+# dev
+admin.route('/dev/clear/<string:table_name>', methods=['DELETE'])(_dev_controller.clear_table)
+admin.route('/dev/clear_filtered/<string:table_name>', methods=['DELETE'])(_dev_controller.clear_filtered_table)
+
+# debug
+admin.route('/debug/profile/<string:request_id>', methods=['GET'])(debug_controller.get_request_profile)
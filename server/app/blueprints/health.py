@@ -0,0 +1,12 @@
+"""Liveness and readiness probes, served by every HTTP process"""
+from flask import Blueprint
+
+from app.utils.lazy_import import LazyModule
+
+health_controller = LazyModule('app.controllers.health_controller')
+
+health = Blueprint('health', __name__)
+
+# health
+health.route('/health/live', methods=['GET'])(health_controller.health_live)
+health.route('/health/ready', methods=['GET'])(health_controller.health_ready)
@@ -0,0 +1,122 @@
+"""Customer facing API: search, booking, account and reference data reads"""
+from flask import Blueprint
+
+from app.config import Config
+from app.middlewares.session_middleware import statement_timeout
+from app.utils.lazy_import import LazyModule
+from app.utils.limiter import limiter
+
+auth_controller = LazyModule('app.controllers.auth_controller')
+user_controller = LazyModule('app.controllers.user_controller')
+airport_controller = LazyModule('app.controllers.airport_controller')
+aircraft_controller = LazyModule('app.controllers.aircraft_controller')
+airline_controller = LazyModule('app.controllers.airline_controller')
+country_controller = LazyModule('app.controllers.country_controller')
+route_controller = LazyModule('app.controllers.route_controller')
+carousel_controller = LazyModule('app.controllers.carousel_controller')
+flight_controller = LazyModule('app.controllers.flight_controller')
+tariff_controller = LazyModule('app.controllers.tariff_controller')
+fee_controller = LazyModule('app.controllers.fee_controller')
+consent_doc_controller = LazyModule('app.controllers.consent_doc_controller')
+consent_event_controller = LazyModule('app.controllers.consent_event_controller')
+booking_controller = LazyModule('app.controllers.booking_controller')
+search_controller = LazyModule('app.controllers.search_controller')
+booking_process_controller = LazyModule('app.controllers.booking_process_controller')
+seo_controller = LazyModule('app.controllers.seo_controller')
+
+public = Blueprint('public', __name__)
+
+# auth
+public.route('/register', methods=['POST'])(auth_controller.register)
+public.route('/login', methods=['POST'])(limiter.limit(Config.LOGIN_RATE_LIMIT)(auth_controller.login))
+public.route('/auth', methods=['GET'])(auth_controller.auth)
+public.route('/forgot_password', methods=['POST'])(auth_controller.forgot_password)
+public.route('/reset_password', methods=['POST'])(auth_controller.reset_password)
+public.route('/activate', methods=['POST'])(auth_controller.activate_account)
+public.route('/setup_2fa', methods=['POST'])(auth_controller.setup_2fa)
+public.route('/verify_2fa', methods=['POST'])(auth_controller.verify_2fa)
+
+# users
+public.route('/users/<int:user_id>', methods=['PUT'])(user_controller.update_user)
+public.route('/users/<int:user_id>/bookings', methods=['GET'])(user_controller.get_user_bookings)
+public.route('/users/<int:user_id>/passengers', methods=['GET'])(user_controller.get_user_passengers)
+public.route('/users/<int:user_id>/passengers', methods=['POST'])(user_controller.create_user_passenger)
+public.route('/users/<int:user_id>/passengers/<int:passenger_id>', methods=['PUT'])(user_controller.update_user_passenger)
+public.route('/users/<int:user_id>/passengers/<int:passenger_id>', methods=['DELETE'])(user_controller.delete_user_passenger)
+public.route('/users/change_password', methods=['PUT'])(user_controller.change_password)
+
+# airports
+public.route('/airports', methods=['GET'])(airport_controller.get_airports)
+public.route('/airports/<int:airport_id>', methods=['GET'])(airport_controller.get_airport)
+
+# aircrafts
+public.route('/aircrafts', methods=['GET'])(aircraft_controller.get_aircrafts)
+public.route('/aircrafts/<int:aircraft_id>', methods=['GET'])(aircraft_controller.get_aircraft)
+
+# airlines
+public.route('/airlines', methods=['GET'])(airline_controller.get_airlines)
+public.route('/airlines/<int:airline_id>', methods=['GET'])(airline_controller.get_airline)
+
+# countries
+public.route('/countries', methods=['GET'])(country_controller.get_countries)
+public.route('/countries/<int:country_id>', methods=['GET'])(country_controller.get_country)
+
+# routes
+public.route('/routes', methods=['GET'])(route_controller.get_routes)
+public.route('/routes/<int:route_id>', methods=['GET'])(route_controller.get_route)
+
+# carousel slides
+public.route('/carousel_slides', methods=['GET'])(carousel_controller.get_carousel_slides)
+public.route('/carousel_slides/<int:slide_id>', methods=['GET'])(carousel_controller.get_carousel_slide)
+
+# flights
+public.route('/flights', methods=['GET'])(flight_controller.get_flights)
+public.route('/flights/<int:flight_id>', methods=['GET'])(flight_controller.get_flight)
+
+# tariffs
+public.route('/tariffs', methods=['GET'])(tariff_controller.get_tariffs)
+public.route('/tariffs/<int:tariff_id>', methods=['GET'])(tariff_controller.get_tariff)
+
+# fees
+public.route('/fees', methods=['GET'])(fee_controller.get_fees)
+public.route('/fees/<int:fee_id>', methods=['GET'])(fee_controller.get_fee)
+
+# consent docs
+public.route('/consent_docs', methods=['GET'])(consent_doc_controller.get_consent_docs)
+public.route('/consent_docs/<uuid:doc_id>', methods=['GET'])(consent_doc_controller.get_consent_doc)
+public.route('/consent_docs/latest/<string:doc_type>', methods=['GET'])(consent_doc_controller.get_latest_consent_doc)
+
+# consent events
+public.route('/consent_events', methods=['GET'])(consent_event_controller.get_consent_events)
+public.route('/consent_events/<uuid:event_id>', methods=['GET'])(consent_event_controller.get_consent_event)
+
+# bookings
+public.route('/bookings/<int:booking_id>', methods=['GET'])(booking_controller.get_booking)
+
+# search
+public.route('/search/airports', methods=['GET'])(statement_timeout('search')(search_controller.search_airports))
+public.route('/search/airports/suggest', methods=['GET'])(statement_timeout('search')(search_controller.suggest_airports))
+public.route('/search/flights', methods=['GET'])(statement_timeout('search')(search_controller.search_flights))
+public.route('/search/flights/nearby', methods=['GET'])(statement_timeout('search')(search_controller.search_nearby_flights))
+public.route('/search/flights/round_trip', methods=['GET'])(statement_timeout('search')(search_controller.search_round_trip_flights))
+public.route('/search/flights/schedule', methods=['GET'])(statement_timeout('search')(search_controller.schedule_flights))
+public.route('/search/calendar', methods=['GET'])(statement_timeout('search')(search_controller.fare_calendar))
+public.route('/search/flights/<int:flight_id>/tariffs', methods=['GET'])(statement_timeout('search')(search_controller.search_flight_tariffs))
+public.route('/search/calculate/price', methods=['POST'])(statement_timeout('search')(search_controller.calculate_price))
+public.route('/search/booking', methods=['POST'])(booking_controller.search_booking)
+
+# booking process
+public.route('/booking/<public_id>/access', methods=['GET'])(booking_process_controller.get_booking_process_access)
+public.route('/booking/<public_id>/details', methods=['GET'])(booking_process_controller.get_booking_process_details)
+public.route('/booking/<public_id>/pdf', methods=['GET'])(booking_process_controller.get_booking_process_pdf)
+public.route('/booking/<public_id>/itinerary-pdf/<int:booking_flight_id>', methods=['GET'])(booking_process_controller.get_booking_flight_itinerary_pdf)
+public.route('/booking/create', methods=['POST'])(booking_process_controller.create_booking_process)
+public.route('/booking/passengers', methods=['POST'])(booking_process_controller.create_booking_process_passengers)
+public.route('/booking/confirm', methods=['POST'])(booking_process_controller.confirm_booking_process)
+public.route('/booking/payment/<public_id>/details', methods=['GET'])(booking_process_controller.get_booking_process_payment)
+public.route('/booking/<public_id>/<ticket_id>/refund', methods=['GET'])(booking_process_controller.get_request_refund_details)
+public.route('/booking/<public_id>/<ticket_id>/refund', methods=['POST'])(booking_process_controller.request_refund)
+
+# seo
+public.route('/seo/static-routes', methods=['GET'])(seo_controller.list_static_seo_routes)
+public.route('/seo/schedule/<string:origin_code>/<string:dest_code>', methods=['GET'])(seo_controller.render_static_schedule_page)
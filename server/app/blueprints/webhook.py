@@ -0,0 +1,12 @@
+"""Payment provider notifications"""
+from flask import Blueprint
+
+from app.middlewares.session_middleware import statement_timeout
+from app.utils.lazy_import import LazyModule
+
+booking_process_controller = LazyModule('app.controllers.booking_process_controller')
+
+webhook = Blueprint('webhook', __name__)
+
+# external
+webhook.route('/webhooks/yookassa', methods=['POST'])(statement_timeout('webhook')(booking_process_controller.yookassa_webhook))
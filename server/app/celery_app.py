@@ -1,18 +1,52 @@
 from celery import Celery
 from celery.schedules import crontab
-from celery.signals import setup_logging
+from celery.signals import setup_logging, worker_process_init
+from kombu import Queue
 
-from app.app import app
+from app.app import get_app
 from app.config import Config
-from app.logging_config import configure_logging
+from app.database import db
+from app.logging_config import configure_logging, restart_queue_listeners
 
 
+# Worker processes get the route-less 'celery' profile, web processes enqueueing tasks reuse their own app
+app = get_app()
+
+# Each queue has its own worker program in supervisord.conf, so a rendering burst
+# never delays booking expiry. Notifications share the reports worker while email
+# is still sent inline
+TASK_QUEUES = ('booking', 'notifications', 'rendering', 'reports')
+
+TASK_ROUTES = {
+    'app.tasks.booking.set_expired_bookings': {'queue': 'booking'},
+    'app.tasks.booking.delete_expired_bookings': {'queue': 'reports'},
+    'app.tasks.payment.*': {'queue': 'booking'},
+    # Fare index refreshes follow every booking change and must not queue behind nightly jobs
+    'app.tasks.route.refresh_flight_fares': {'queue': 'booking'},
+    'app.tasks.seo.*': {'queue': 'rendering'},
+    'app.tasks.image.*': {'queue': 'rendering'},
+    'app.tasks.route.*': {'queue': 'reports'},
+}
+
 celery = Celery(
     __name__,
     broker=Config.CELERY_BROKER_URL,
+    include=['app.tasks.booking', 'app.tasks.seo', 'app.tasks.payment', 'app.tasks.route', 'app.tasks.image'],
 )
 celery.config_from_object(Config)
-celery.conf.update(task_track_started=True)
+celery.conf.update(
+    task_track_started=True,
+    task_queues=[Queue(name) for name in TASK_QUEUES],
+    task_routes=TASK_ROUTES,
+    # Unrouted tasks must not land next to booking expiry
+    task_default_queue='reports',
+    # Defaults for tasks without their own limits, see the task decorators
+    task_soft_time_limit=Config.CELERY_TASK_SOFT_TIME_LIMIT_SECONDS,
+    task_time_limit=Config.CELERY_TASK_TIME_LIMIT_SECONDS,
+    # Redis redelivers unacked tasks after this, so it has to stay above every time limit
+    broker_transport_options={'visibility_timeout': Config.CELERY_VISIBILITY_TIMEOUT_SECONDS},
+    worker_prefetch_multiplier=1,
+)
 
 
 @setup_logging.connect
@@ -20,6 +54,19 @@ def init_celery_logging(**_kwargs):
     configure_logging(force=True)
 
 
+@worker_process_init.connect
+def init_worker_process_logging(**_kwargs):
+    # Prefork children inherit the queue handlers but not the listener threads
+    restart_queue_listeners()
+
+
+@worker_process_init.connect
+def init_worker_process_database(**_kwargs):
+    # Pooled connections of the parent must not be shared with the children
+    with app.app_context():
+        db.engine.dispose(close=False)
+
+
 class AppContextTask(celery.Task):
     abstract = True
 
@@ -35,6 +82,9 @@ celery.Task = AppContextTask
 def setup_periodic_tasks(sender, **kwargs):
     from app.tasks.booking import set_expired_bookings, delete_expired_bookings
     from app.tasks.seo import generate_seo_prerender
+    from app.tasks.payment import requeue_pending_webhook_events
+    from app.tasks.route import refresh_route_metrics
+    from app.tasks.image import generate_carousel_image_variants
 
     sender.add_periodic_task(
         60.0,
@@ -53,3 +103,22 @@ def setup_periodic_tasks(sender, **kwargs):
         generate_seo_prerender.s(),
         name="generate-seo-prerender",
     )
+
+    sender.add_periodic_task(
+        300.0,
+        requeue_pending_webhook_events.s(),
+        name="requeue-pending-webhook-events",
+    )
+
+    sender.add_periodic_task(
+        crontab(minute='*/15'),
+        refresh_route_metrics.s(),
+        name="refresh-route-metrics",
+    )
+
+    # Catches slides whose variants were never enqueued or failed to render
+    sender.add_periodic_task(
+        crontab(minute=30),
+        generate_carousel_image_variants.s(),
+        name="generate-carousel-image-variants",
+    )
@@ -4,20 +4,107 @@ import os
 class Config:
 
     APP_ENV = os.environ.get('SERVER_APP_ENV')
+    PROCESS_TYPE = os.environ.get('SERVER_PROCESS_TYPE', 'web')
+
+    # Route groups each app profile serves; split deployments run e.g. a public only web tier
+    APP_PROFILES = {
+        'web': ('public', 'admin', 'webhook'),
+        'public': ('public',),
+        'admin': ('admin',),
+        'webhook': ('webhook',),
+        'celery': (),
+    }
+    APP_PROFILE = os.environ.get('SERVER_APP_PROFILE', 'web' if PROCESS_TYPE == 'web' else 'celery')
 
     CLIENT_URL = os.environ.get('SERVER_CLIENT_URL')
     STORAGE_URL = os.environ.get('SERVER_STORAGE_URL')
 
     BASE_DIR = os.path.abspath(os.path.dirname(__file__))
     LOG_DIR = os.environ.get('APP_LOG_DIR')
+    # Hand records to a listener thread per process instead of writing on the request thread
+    LOG_QUEUE_ENABLED = os.environ.get('SERVER_LOG_QUEUE') == 'True'
+    # Share of INFO access and request log lines that are kept, warnings and errors are never sampled
+    LOG_INFO_SAMPLE_RATE = float(os.environ.get('SERVER_LOG_INFO_SAMPLE_RATE', 1.0))
+    LOG_SLOW_REQUEST_MS = int(os.environ.get('SERVER_LOG_SLOW_REQUEST_MS', 1000))
     STORAGE_DIR = os.environ.get('STORAGE_DIR')
 
+    # Storage backend: 'local' keeps files on the shared volume, 's3' puts them in an S3 compatible bucket
+    STORAGE_BACKEND = os.environ.get('SERVER_STORAGE_BACKEND', 'local')
+    # Local downloads: 'stream' sends them from the app, 'accel' hands them to a fronting nginx
+    # through X-Accel-Redirect, 'signed' redirects to an expiring storage-cdn link
+    STORAGE_DELIVERY = os.environ.get('SERVER_STORAGE_DELIVERY', 'stream')
+    STORAGE_ACCEL_REDIRECT_PREFIX = os.environ.get('SERVER_STORAGE_ACCEL_REDIRECT_PREFIX', '/protected')
+    STORAGE_LINK_SECRET = os.environ.get('SERVER_STORAGE_LINK_SECRET')
+    STORAGE_LINK_TTL_SECONDS = int(os.environ.get('SERVER_STORAGE_LINK_TTL_SECONDS', 300))
+    STORAGE_S3_BUCKET = os.environ.get('SERVER_STORAGE_S3_BUCKET')
+    STORAGE_S3_ENDPOINT_URL = os.environ.get('SERVER_STORAGE_S3_ENDPOINT_URL')
+    STORAGE_S3_PUBLIC_ENDPOINT_URL = os.environ.get('SERVER_STORAGE_S3_PUBLIC_ENDPOINT_URL')
+    STORAGE_S3_PUBLIC_URL = os.environ.get('SERVER_STORAGE_S3_PUBLIC_URL')
+    STORAGE_S3_REGION = os.environ.get('SERVER_STORAGE_S3_REGION', 'us-east-1')
+    STORAGE_S3_ACCESS_KEY = os.environ.get('SERVER_STORAGE_S3_ACCESS_KEY')
+    STORAGE_S3_SECRET_KEY = os.environ.get('SERVER_STORAGE_S3_SECRET_KEY')
+
     SECRET_KEY = os.environ.get('SERVER_SECRET_KEY')
 
     # Database configuration
     SQLALCHEMY_DATABASE_URI = os.environ.get('SERVER_DATABASE_URI')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+
+    # Transaction pooling in pgbouncer already multiplexes server connections,
+    # so the client-side pool can be disabled entirely
+    DB_USE_NULL_POOL = os.environ.get('SERVER_DB_USE_NULL_POOL') == 'True'
+    DB_POOL_PRE_PING = os.environ.get('SERVER_DB_POOL_PRE_PING', 'True') == 'True'
+    DB_POOL_RECYCLE_SECONDS = int(os.environ.get('SERVER_DB_POOL_RECYCLE_SECONDS', 1800))
+    DB_POOL_TIMEOUT_SECONDS = int(os.environ.get('SERVER_DB_POOL_TIMEOUT_SECONDS', 10))
+
+    # Per process type pool sizing: web workers serve concurrent requests,
+    # celery workers run one task per pool slot, beat only dispatches schedules
+    DB_ENGINE_PROFILES = {
+        'web': {
+            'pool_size': int(os.environ.get('SERVER_DB_WEB_POOL_SIZE', 5)),
+            'max_overflow': int(os.environ.get('SERVER_DB_WEB_MAX_OVERFLOW', 5)),
+            'statement_timeout_ms': int(os.environ.get('SERVER_DB_WEB_STATEMENT_TIMEOUT_MS', 30000)),
+        },
+        'celery': {
+            'pool_size': int(os.environ.get('SERVER_DB_CELERY_POOL_SIZE', 2)),
+            'max_overflow': int(os.environ.get('SERVER_DB_CELERY_MAX_OVERFLOW', 2)),
+            'statement_timeout_ms': int(os.environ.get('SERVER_DB_CELERY_STATEMENT_TIMEOUT_MS', 300000)),
+        },
+        'beat': {
+            'pool_size': 1,
+            'max_overflow': 0,
+            'statement_timeout_ms': int(os.environ.get('SERVER_DB_BEAT_STATEMENT_TIMEOUT_MS', 30000)),
+        },
+    }
+
+    # Server-side statement timeouts per endpoint class (0 disables the limit)
+    DB_STATEMENT_TIMEOUTS_MS = {
+        'search': int(os.environ.get('SERVER_DB_SEARCH_STATEMENT_TIMEOUT_MS', 5000)),
+        'webhook': int(os.environ.get('SERVER_DB_WEBHOOK_STATEMENT_TIMEOUT_MS', 10000)),
+        'report': int(os.environ.get('SERVER_DB_REPORT_STATEMENT_TIMEOUT_MS', 120000)),
+    }
     LIMITER_STORAGE_URI = os.environ.get('SERVER_LIMITER_STORAGE_URI')
+    CACHE_REDIS_URL = os.environ.get('SERVER_CACHE_REDIS_URL')
+    QUERY_COUNT_HEADER_ENABLED = os.environ.get('SERVER_QUERY_COUNT_HEADER') == 'True'
+
+    # Opt-in per request SQL profiling, results kept in the cache Redis for /debug/profile
+    SQL_PROFILER_ENABLED = os.environ.get('SERVER_SQL_PROFILER') == 'True'
+    SQL_PROFILER_QUERY_ALARM = int(os.environ.get('SERVER_SQL_PROFILER_QUERY_ALARM', 50))
+    SQL_PROFILER_REPEAT_THRESHOLD = int(os.environ.get('SERVER_SQL_PROFILER_REPEAT_THRESHOLD', 3))
+    SQL_PROFILE_TTL_SECONDS = int(os.environ.get('SERVER_SQL_PROFILE_TTL_SECONDS', 3600))
+
+    # Negotiated gzip/brotli for buffered responses, internal consumers reach gunicorn without a proxy
+    COMPRESSION_ENABLED = os.environ.get('SERVER_COMPRESSION', 'True') == 'True'
+    COMPRESSION_MIN_SIZE = int(os.environ.get('SERVER_COMPRESSION_MIN_SIZE', 1024))
+    COMPRESSION_LEVELS = {'br': 4, 'gzip': 6}
+    COMPRESSION_MIMETYPES = (
+        'application/json',
+        'text/html',
+        'text/plain',
+        'text/csv',
+        'text/xml',
+        'application/xml',
+    )
 
     # Security settings
     CSRF_ENABLED = True
@@ -36,9 +123,19 @@ class Config:
     # Yookassa settings
     YOOKASSA_SHOP_ID = os.environ.get('YOOKASSA_SHOP_ID')
     YOOKASSA_SECRET_KEY = os.environ.get('YOOKASSA_SECRET_KEY')
+    YOOKASSA_API_URL = os.environ.get('YOOKASSA_API_URL')
+    WEBHOOK_EVENT_MAX_RETRIES = 8
+    WEBHOOK_EVENT_RETRY_BACKOFF_SECONDS = 10
+    WEBHOOK_EVENT_STALE_MINUTES = 15
 
     # Celery settings
     CELERY_BROKER_URL = os.environ.get('SERVER_CELERY_BROKER_URL')
+    # Singleton lock of periodic tasks, renewed by a heartbeat so the TTL only bounds a dead worker
+    TASK_LOCK_TTL_SECONDS = int(os.environ.get('SERVER_TASK_LOCK_TTL_SECONDS', 120))
+    TASK_LOCK_HEARTBEAT_SECONDS = int(os.environ.get('SERVER_TASK_LOCK_HEARTBEAT_SECONDS', 30))
+    CELERY_TASK_SOFT_TIME_LIMIT_SECONDS = 300
+    CELERY_TASK_TIME_LIMIT_SECONDS = 360
+    CELERY_VISIBILITY_TIMEOUT_SECONDS = 3600
 
     # Business logic settings
     JWT_EXP_HOURS = 72
@@ -54,5 +151,24 @@ class Config:
     BOOKING_PAYMENT_EXP_HOURS = 1
     BOOKING_INVOICE_EXP_HOURS = 24
     BOOKING_EXP_DELETION_DAYS = 1
+    # Bookings expired per transaction, so a backlog never holds row locks for the whole run
+    BOOKING_EXPIRY_BATCH_SIZE = 200
+
+    BOOKING_SEARCH_MIN_QUERY_LENGTH = 3
+    BOOKING_SEARCH_TYPEAHEAD_LIMIT = 10
 
     SEO_PRERENDER_ROUTE_LIMIT = 10
+    # Written once per run, so the slowest settings cost nothing per request
+    SEO_PRERENDER_COMPRESSION_LEVELS = {'br': 11, 'gzip': 9}
+
+    # Responsive carousel variants, never wider than the uploaded original
+    IMAGE_VARIANT_WIDTHS = (480, 960, 1440, 1920)
+    IMAGE_VARIANT_FORMATS = ('avif', 'webp')
+    IMAGE_VARIANT_QUALITY = 75
+
+    AIRPORT_SUGGEST_LIMIT = 10
+    AIRPORT_INDEX_VERSION_CHECK_SECONDS = 5
+    FARE_CALENDAR_CACHE_SECONDS = 120
+
+    SEARCH_PAGE_LIMIT = 20
+    SEARCH_MAX_PAGE_LIMIT = 100
@@ -94,6 +94,10 @@ class RouteMessages:
 class SearchMessages:
     UNKNOWN_ORIGIN_OR_DESTINATION = 'Неизвестный аэропорт отправления или назначения'
     ORIGIN_AND_DESTINATION_REQUIRED = 'Требуются аэропорт отправления и назначения'
+    INVALID_MONTH = 'Некорректный месяц, ожидается формат ГГГГ-ММ'
+    INVALID_SORT = 'Некорректный ключ сортировки'
+    INVALID_SEAT_CLASS = 'Некорректный класс обслуживания'
+    INVALID_CURSOR = 'Некорректный курсор страницы'
 
 
 class FlightMessages:
@@ -132,6 +136,7 @@ class ExportMessages:
 
 class DevMessages:
     INVALID_TABLE_NAME = 'Неверное имя таблицы'
+    PROFILE_NOT_FOUND = 'Профиль запроса не найден или устарел'
 
 
 class FileMessages:
@@ -155,6 +160,7 @@ class ErrorMessages:
     AUTHENTICATION_FAILED = 'Ошибка аутентификации'
     ACCESS_DENIED = 'Доступ запрещен'
     OPERATION_NOT_PERMITTED = 'Операция не разрешена'
+    SERVICE_UNAVAILABLE = 'Сервис временно недоступен, повторите попытку позже'
 
 
 class DateTimeMessages:
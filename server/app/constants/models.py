@@ -7,7 +7,9 @@ class ModelVerboseNames:
 
     Flight = 'Рейс'
     Route = 'Маршрут'
+    RouteMetric = 'Показатели маршрута'
     FlightTariff = 'Тариф рейса'
+    FlightFare = 'Минимальный тариф рейса'
     Tariff = 'Тариф'
     TariffFee = 'Сбор тарифа'
     Fee = 'Сбор'
@@ -23,6 +25,7 @@ class ModelVerboseNames:
     User = 'Пользователь'
 
     Payment = 'Платёж'
+    PaymentWebhookEvent = 'Событие платёжного уведомления'
     Ticket = 'Билет'
 
     PasswordResetToken = 'Токен сброса пароля'
@@ -2,9 +2,9 @@ from collections import defaultdict
 from datetime import datetime, timedelta, timezone
 
 from flask import request, jsonify
-from sqlalchemy import func, or_, cast, String
 from sqlalchemy.orm import joinedload
 
+from app.config import Config
 from app.constants.messages import BookingMessages
 from app.middlewares.auth_middleware import admin_required
 from app.models.booking import Booking
@@ -190,30 +190,13 @@ def get_booking_dashboard(current_user):
     joined_flights = False
 
     if booking_number:
-        like_pattern = f'%{booking_number}%'
         query = query.filter(
-            or_(
-                Booking.booking_number.ilike(like_pattern),
-                cast(Booking.public_id, String).ilike(like_pattern),
-            )
+            Booking.search_reference.like(Booking.build_search_pattern(booking_number), escape='\\')
         )
 
     if buyer_query:
-        lowered = f"%{buyer_query.lower()}%"
         query = query.filter(
-            or_(
-                func.lower(Booking.buyer_first_name).like(lowered),
-                func.lower(Booking.buyer_last_name).like(lowered),
-                func.lower(
-                    func.concat(
-                        Booking.buyer_last_name,
-                        ' ',
-                        Booking.buyer_first_name
-                    )
-                ).like(lowered),
-                func.lower(Booking.email_address).like(lowered),
-                func.lower(Booking.phone_number).like(lowered),
-            )
+            Booking.search_buyer.like(Booking.build_search_pattern(buyer_query), escape='\\')
         )
 
     if route_id:
@@ -369,6 +352,36 @@ def get_booking_dashboard(current_user):
     return jsonify(response), 200
 
 
+@admin_required
+def search_bookings_typeahead(current_user):
+    query = (request.args.get('q') or '').strip()
+    limit = min(
+        request.args.get('limit', Config.BOOKING_SEARCH_TYPEAHEAD_LIMIT, type=int),
+        Config.BOOKING_SEARCH_TYPEAHEAD_LIMIT,
+    )
+
+    # Shorter terms have no trigrams and would scan every booking
+    if len(query) < Config.BOOKING_SEARCH_MIN_QUERY_LENGTH or limit <= 0:
+        return jsonify([]), 200
+
+    rows = Booking.search_typeahead(query, limit)
+    return jsonify([
+        {
+            'id': row.id,
+            'public_id': str(row.public_id),
+            'booking_number': row.booking_number,
+            'status': row.status.value if row.status else None,
+            'buyer_last_name': row.buyer_last_name,
+            'buyer_first_name': row.buyer_first_name,
+            'email_address': row.email_address,
+            'phone_number': row.phone_number,
+            'created_at': row.created_at.isoformat() if row.created_at else None,
+            'score': round(float(row.score or 0), 4),
+        }
+        for row in rows
+    ]), 200
+
+
 @admin_required
 def get_booking_ticket_refund_details(current_user, booking_id, ticket_id):
     booking, ticket, booking_flight_passenger, booking_flight = _get_booking_ticket_context(
@@ -25,7 +25,7 @@ from app.utils.business_logic import (
     get_seats_number,
     calculate_refund_details,
 )
-from app.utils.yookassa import create_payment, create_invoice, handle_yookassa_webhook
+from app.utils.yookassa import create_payment, create_invoice, record_yookassa_webhook
 from app.utils.enum import (
     BOOKING_STATUS,
     CONSENT_EVENT_TYPE,
@@ -323,16 +323,6 @@ def get_booking_flight_itinerary_pdf(current_user, public_id, booking_flight_id)
     if not booking_flight.itinerary_receipt_path:
         return jsonify({'message': BookingMessages.ITINERARY_RECEIPT_NOT_FOUND}), 404
 
-    ticket_storage = TicketManager()
-
-    try:
-        pdf_data = ticket_storage.read_file(
-            booking_flight.itinerary_receipt_path,
-            subfolder_name='imports'
-        )
-    except (ValueError, OSError):
-        return jsonify({'message': BookingMessages.ITINERARY_RECEIPT_NOT_FOUND}), 404
-
     flight = booking_flight.flight_tariff.flight
 
     filename = ITINERARY_PDF_FILENAME_TEMPLATE.format(
@@ -341,12 +331,18 @@ def get_booking_flight_itinerary_pdf(current_user, public_id, booking_flight_id)
         date=format_date(flight.scheduled_departure)
     )
 
-    return send_file(
-        BytesIO(pdf_data),
-        mimetype='application/pdf',
-        as_attachment=True,
-        download_name=filename,
-    ), 200
+    ticket_storage = TicketManager()
+
+    # The status comes from the storage response, it may be a redirect to a signed link
+    try:
+        return ticket_storage.download_response(
+            booking_flight.itinerary_receipt_path,
+            subfolder_name='imports',
+            mimetype='application/pdf',
+            download_name=filename,
+        )
+    except (ValueError, OSError):
+        return jsonify({'message': BookingMessages.ITINERARY_RECEIPT_NOT_FOUND}), 404
 
 
 @current_user
@@ -484,5 +480,11 @@ def request_refund(current_user, public_id, ticket_id):
 
 def yookassa_webhook():
     payload = request.json or {}
-    handle_yookassa_webhook(payload)
+    event_id = record_yookassa_webhook(payload)
+
+    # Duplicates are acknowledged without re-queueing; processing runs in Celery
+    if event_id is not None:
+        from app.tasks.payment import process_yookassa_webhook_event
+        process_yookassa_webhook_event.delay(event_id)
+
     return jsonify({'status': 'ok'}), 200
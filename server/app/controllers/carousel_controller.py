@@ -1,10 +1,16 @@
+import logging
+from pathlib import Path
+
 from flask import jsonify, request
 
 from app.constants.messages import FileMessages
 from app.models.carousel_slide import CarouselSlide
 from app.middlewares.auth_middleware import admin_required
+from app.utils.image import content_digest
 from app.utils.storage import ImageManager
 
+logger = logging.getLogger(__name__)
+
 
 def get_carousel_slides():
     slides = CarouselSlide.get_all()
@@ -45,8 +51,10 @@ def upload_carousel_slide_image(current_user, slide_id):
     image_manager = ImageManager()
 
     try:
+        # Content addressed names never change meaning, so storage-cdn caches them forever
         image_path, image_filename = image_manager.save_file(
             file,
+            filename=f'{content_digest(file.stream)}{Path(file.filename).suffix.lower()}',
             subfolder_name='carousel'
         )
     except Exception as exc:
@@ -59,4 +67,12 @@ def upload_carousel_slide_image(current_user, slide_id):
         commit=True,
     )
 
+    from app.tasks.image import generate_carousel_image_variants
+
+    try:
+        generate_carousel_image_variants.delay(updated.id)
+    except Exception:
+        # The periodic run renders slides that are still missing variants
+        logger.warning('Failed to enqueue carousel image variants', exc_info=True)
+
     return jsonify(updated.to_dict()), 201
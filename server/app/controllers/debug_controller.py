@@ -0,0 +1,15 @@
+from flask import jsonify
+
+from app.constants.messages import DevMessages
+from app.middlewares.auth_middleware import admin_required
+from app.middlewares.query_counter_middleware import profile_key
+from app.models._base_model import NotFoundError
+from app.utils import cache
+
+
+@admin_required
+def get_request_profile(current_user, request_id):
+    profile = cache.get_json(profile_key(request_id))
+    if profile is None:
+        raise NotFoundError(DevMessages.PROFILE_NOT_FOUND)
+    return jsonify({'request_id': request_id, **profile}), 200
@@ -7,7 +7,7 @@ from sqlalchemy import text
 from sqlalchemy.exc import SQLAlchemyError
 
 from app.config import Config
-from app.database import db
+from app.database import db, get_pool_status
 
 
 def _check_database():
@@ -51,6 +51,7 @@ def health_ready():
     checks['database'] = {'status': 'pass' if db_ok else 'fail'}
     if db_error:
         checks['database']['error'] = db_error
+    checks['database']['pool'] = get_pool_status()
     overall_ok &= db_ok
 
     redis_ok, redis_error = _check_redis()
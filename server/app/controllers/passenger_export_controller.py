@@ -176,7 +176,7 @@ def _group_pending_flights(unticketed_records):
 
         flight_entry = flights_map.get(flight.id)
         if not flight_entry:
-            departure_dt = combine_date_time(
+            departure_dt = flight.scheduled_departure_at or combine_date_time(
                 flight.scheduled_departure, flight.scheduled_departure_time
             )
             flight_entry = {
@@ -474,7 +474,7 @@ def get_pending_ticket_passengers_flights_by_route(current_user, route_id):
     flights = (
         Flight.query.options(joinedload(Flight.airline))
         .filter(Flight.route_id == route_id)
-        .order_by(Flight.scheduled_departure)
+        .order_by(Flight.scheduled_departure_at)
         .all()
     )
 
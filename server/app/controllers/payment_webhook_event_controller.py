@@ -0,0 +1,28 @@
+from flask import request, jsonify
+
+from app.models.payment_webhook_event import PaymentWebhookEvent
+from app.middlewares.auth_middleware import admin_required
+from app.utils.enum import WEBHOOK_EVENT_STATUS
+
+
+@admin_required
+def get_payment_webhook_events(current_user):
+    status = request.args.get('status')
+    events = PaymentWebhookEvent.get_all(WEBHOOK_EVENT_STATUS(status) if status else None)
+    return jsonify([e.to_dict() for e in events]), 200
+
+
+@admin_required
+def get_payment_webhook_event(current_user, event_id):
+    event = PaymentWebhookEvent.get_or_404(event_id)
+    return jsonify(event.to_dict(return_children=True)), 200
+
+
+@admin_required
+def replay_payment_webhook_event(current_user, event_id):
+    event = PaymentWebhookEvent.reset_for_replay(event_id, commit=True)
+
+    from app.tasks.payment import process_yookassa_webhook_event
+    process_yookassa_webhook_event.delay(event.id)
+
+    return jsonify(event.to_dict()), 200
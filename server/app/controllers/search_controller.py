@@ -1,28 +1,62 @@
 from flask import jsonify, request
-from sqlalchemy import or_
 
-from app.database import db
-from app.models.airport import Airport
-from app.models.route import Route
-from app.utils.business_logic import get_seats_number, calculate_price_details
-from app.utils.search import build_schedule, get_available_tariffs, query_flights
+from app.config import Config
+from app.constants.messages import SearchMessages
+from app.utils.airport_index import get_airport_index
+from app.utils.business_logic import get_passenger_counts, get_seats_number, calculate_price_details
+from app.utils.fare_calendar import get_fare_calendar
+from app.utils.search import (
+    build_schedule,
+    build_schedule_page,
+    get_available_tariffs,
+    query_flights,
+    query_flights_page,
+    query_round_trip,
+    query_round_trip_page,
+    search_round_trip_combinations,
+)
+from app.utils.enum import SEAT_CLASS
+
+
+def _seat_class_param(params):
+    """Requested seat class, None when any class will do"""
+    seat_class = params.get('class')
+    if not seat_class:
+        return None
+    if seat_class not in SEAT_CLASS.__members__:
+        raise ValueError(SearchMessages.INVALID_SEAT_CLASS)
+    return seat_class
+
+
+def _page_params(params):
+    """Cursor page settings, or None when the client asked for the full list"""
+    if 'limit' not in params and 'cursor' not in params:
+        return None
+
+    limit = min(
+        params.get('limit', Config.SEARCH_PAGE_LIMIT, type=int),
+        Config.SEARCH_MAX_PAGE_LIMIT,
+    )
+    return {
+        'sort': params.get('sort', 'departure'),
+        'cursor': params.get('cursor'),
+        'limit': max(limit, 1),
+        'compact': params.get('view') == 'compact',
+    }
 
 
 def search_airports():
-    airports = (
-        db.session.query(Airport)
-        .join(
-            Route,
-            or_(
-                Airport.id == Route.origin_airport_id,
-                Airport.id == Route.destination_airport_id,
-            ),
-        )
-        .distinct()
-        .order_by(Airport.name.asc())
-        .all()
+    index = get_airport_index()
+    return jsonify([index.entries[airport_id] for airport_id in index.ordered_ids]), 200
+
+
+def suggest_airports():
+    query = request.args.get('q') or ''
+    limit = min(
+        request.args.get('limit', Config.AIRPORT_SUGGEST_LIMIT, type=int),
+        Config.AIRPORT_SUGGEST_LIMIT,
     )
-    return jsonify([airport.to_dict() for airport in airports]), 200
+    return jsonify(get_airport_index().suggest(query, max(limit, 0))), 200
 
 
 def search_flights(is_nearby=False):
@@ -31,7 +65,7 @@ def search_flights(is_nearby=False):
     origin_code = params.get('from')
     dest_code = params.get('to')
     is_exact = params.get('date_mode') == 'exact'
-    seat_class = params.get('class')
+    seat_class = _seat_class_param(params)
     seats_number = get_seats_number(params)
 
     depart_from = params.get('when') if is_exact else params.get('when_from')
@@ -46,37 +80,73 @@ def search_flights(is_nearby=False):
     return_airline_iata_code = params.get('return_airline') if not is_nearby else None
     return_flight_number = params.get('return_flight') if not is_nearby else None
 
-    outbound_flights = query_flights(
-        origin_code=origin_code,
-        dest_code=dest_code,
-        date_from=depart_from,
-        date_to=depart_to,
-        is_exact=is_exact,
-        seat_class=seat_class,
-        seats_number=seats_number,
-        airline_iata_code=outbound_airline_iata_code,
-        flight_number=outbound_flight_number,
-        direction='outbound',
-    )
-
     has_return = return_from is not None
-
-    return_flights = (
-        query_flights(
-            origin_code=dest_code,
-            dest_code=origin_code,
-            date_from=return_from,
-            date_to=return_to,
+    page = _page_params(params)
+
+    if page is not None:
+        if has_return:
+            result = query_round_trip_page(
+                origin_code=origin_code,
+                dest_code=dest_code,
+                depart_from=depart_from,
+                depart_to=depart_to,
+                return_from=return_from,
+                return_to=return_to,
+                outbound_airline_iata_code=outbound_airline_iata_code,
+                outbound_flight_number=outbound_flight_number,
+                return_airline_iata_code=return_airline_iata_code,
+                return_flight_number=return_flight_number,
+                is_exact=is_exact,
+                seat_class=seat_class,
+                seats_number=seats_number,
+                **page,
+            )
+        else:
+            result = query_flights_page(
+                origin_code=origin_code,
+                dest_code=dest_code,
+                date_from=depart_from,
+                date_to=depart_to,
+                is_exact=is_exact,
+                seat_class=seat_class,
+                seats_number=seats_number,
+                airline_iata_code=outbound_airline_iata_code,
+                flight_number=outbound_flight_number,
+                direction='outbound',
+                **page,
+            )
+        return jsonify(result), 200
+
+    if has_return:
+        outbound_flights, return_flights = query_round_trip(
+            origin_code=origin_code,
+            dest_code=dest_code,
+            depart_from=depart_from,
+            depart_to=depart_to,
+            return_from=return_from,
+            return_to=return_to,
+            outbound_airline_iata_code=outbound_airline_iata_code,
+            outbound_flight_number=outbound_flight_number,
+            return_airline_iata_code=return_airline_iata_code,
+            return_flight_number=return_flight_number,
             is_exact=is_exact,
             seat_class=seat_class,
             seats_number=seats_number,
-            airline_iata_code=return_airline_iata_code,
-            flight_number=return_flight_number,
-            direction='return',
         )
-        if has_return
-        else []
-    )
+    else:
+        outbound_flights = query_flights(
+            origin_code=origin_code,
+            dest_code=dest_code,
+            date_from=depart_from,
+            date_to=depart_to,
+            is_exact=is_exact,
+            seat_class=seat_class,
+            seats_number=seats_number,
+            airline_iata_code=outbound_airline_iata_code,
+            flight_number=outbound_flight_number,
+            direction='outbound',
+        )
+        return_flights = []
 
     is_outbound_found = bool(outbound_flights)
     is_return_found = bool(return_flights)
@@ -94,6 +164,36 @@ def search_nearby_flights():
     return search_flights(is_nearby=True)
 
 
+def search_round_trip_flights():
+    params = request.args
+    is_exact = params.get('date_mode') == 'exact'
+    limit = min(
+        params.get('limit', Config.SEARCH_PAGE_LIMIT, type=int),
+        Config.SEARCH_MAX_PAGE_LIMIT,
+    )
+
+    result = search_round_trip_combinations(
+        origin_code=params.get('from'),
+        dest_code=params.get('to'),
+        depart_from=params.get('when') if is_exact else params.get('when_from'),
+        depart_to=None if is_exact else params.get('when_to'),
+        return_from=params.get('return') if is_exact else params.get('return_from'),
+        return_to=None if is_exact else params.get('return_to'),
+        outbound_airline_iata_code=params.get('outbound_airline'),
+        outbound_flight_number=params.get('outbound_flight'),
+        return_airline_iata_code=params.get('return_airline'),
+        return_flight_number=params.get('return_flight'),
+        is_exact=is_exact,
+        seat_class=_seat_class_param(params),
+        passenger_counts=get_passenger_counts(params),
+        sort=params.get('sort', 'price'),
+        page=params.get('page', 1, type=int),
+        limit=max(limit, 1),
+    )
+
+    return jsonify(result), 200
+
+
 def search_flight_tariffs(flight_id):
     tariffs = get_available_tariffs(flight_id)
     return jsonify(tariffs), 200
@@ -105,11 +205,29 @@ def schedule_flights():
     origin_code = params.get('from')
     dest_code = params.get('to')
 
+    page = _page_params(params)
+    if page is not None:
+        return jsonify(build_schedule_page(origin_code, dest_code, **page)), 200
+
     flights = build_schedule(origin_code, dest_code)
 
     return jsonify(flights), 200
 
 
+def fare_calendar():
+    params = request.args
+
+    days = get_fare_calendar(
+        params.get('from'),
+        params.get('to'),
+        params.get('month'),
+        seat_class=_seat_class_param(params),
+        seats_number=get_seats_number(params),
+    )
+
+    return jsonify(days), 200
+
+
 def calculate_price():
     data = request.json or {}
     outbound_id = data.get('outbound_id')
@@ -8,6 +8,7 @@ from app.utils.seo import (
     static_route_cache,
 )
 from app.models._base_model import NotFoundError
+from app.utils.compression import ENCODINGS, ENCODING_SUFFIXES, accepted_encodings
 from app.utils.storage import SEOManager
 
 
@@ -22,15 +23,20 @@ def render_static_schedule_page(origin_code: str, dest_code: str):
     seo_manager = SEOManager()
     filename = prerender_filename(origin_code, dest_code)
 
-    try:
-        prerendered = seo_manager.read_file(
-            filename, 'prerender', as_text=True
-        )
+    # Precompressed siblings first, the plain page is compressed by the middleware if needed
+    for encoding in [*accepted_encodings(request.accept_encodings, list(ENCODINGS)), None]:
+        name = f'{filename}{ENCODING_SUFFIXES[encoding]}' if encoding else filename
+        try:
+            prerendered = seo_manager.read_file(name, 'prerender')
+        except (ValueError, OSError):
+            continue
+
         response = make_response(prerendered)
         response.headers['Content-Type'] = 'text/html; charset=utf-8'
+        response.vary.add('Accept-Encoding')
+        if encoding:
+            response.content_encoding = encoding
         return response
-    except (ValueError, OSError):
-        pass
 
     base_url = _build_base_url()
 
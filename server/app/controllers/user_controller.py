@@ -127,7 +127,7 @@ def get_user_bookings(current_user, user_id):
         flights = flights_map.get(b.id, [])
         flights_sorted = sorted(
             flights,
-            key=lambda f: (f.scheduled_departure, f.scheduled_departure_time or None),
+            key=lambda f: f.scheduled_departure_at,
         )
         data['flights'] = [f.to_dict(return_children=True) for f in flights_sorted]
         data['passengers_count'] = passenger_count_map.get(b.id, 0)
@@ -1,4 +1,22 @@
+import logging
+from typing import Any, Dict
+
+from flask import g, has_request_context
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
+
+from app.config import Config
+
+
+logger = logging.getLogger(__name__)
+
+_pool_metrics: Dict[str, int] = {
+    'checkouts': 0,
+    'saturated_checkouts': 0,
+    'timeouts': 0,
+}
 
 
 def __create_database():
@@ -6,3 +24,151 @@ def __create_database():
 
 
 db = __create_database()
+
+
+def get_engine_profile(process_type: str | None = None) -> Dict[str, Any]:
+    """Return engine profile settings for the given process type"""
+    process_type = process_type or Config.PROCESS_TYPE
+    return Config.DB_ENGINE_PROFILES.get(
+        process_type,
+        Config.DB_ENGINE_PROFILES['web']
+    )
+
+
+def build_engine_options(process_type: str | None = None) -> Dict[str, Any]:
+    """Build SQLALCHEMY_ENGINE_OPTIONS for the given process type"""
+    process_type = process_type or Config.PROCESS_TYPE
+    profile = get_engine_profile(process_type)
+
+    options: Dict[str, Any] = {
+        'connect_args': {'application_name': f'avexmar-hub-{process_type}'},
+    }
+
+    if Config.DB_USE_NULL_POOL:
+        # pgbouncer owns the pooling; every checkout opens a cheap client connection
+        options['poolclass'] = NullPool
+        return options
+
+    options.update(
+        pool_size=profile['pool_size'],
+        max_overflow=profile['max_overflow'],
+        pool_timeout=Config.DB_POOL_TIMEOUT_SECONDS,
+        pool_recycle=Config.DB_POOL_RECYCLE_SECONDS,
+        pool_pre_ping=Config.DB_POOL_PRE_PING,
+    )
+    return options
+
+
+def get_statement_timeout_ms() -> int:
+    """Resolve statement timeout for the current request or process"""
+    if has_request_context():
+        timeout_class = g.get('statement_timeout_class')
+        if timeout_class in Config.DB_STATEMENT_TIMEOUTS_MS:
+            return Config.DB_STATEMENT_TIMEOUTS_MS[timeout_class]
+    return get_engine_profile()['statement_timeout_ms']
+
+
+def apply_statement_timeout(connection, timeout_ms: int) -> None:
+    """Set a transaction-scoped statement timeout (safe behind pgbouncer)"""
+    if not timeout_ms:
+        return
+    connection.execute(
+        text("SELECT set_config('statement_timeout', :value, true)"),
+        {'value': str(int(timeout_ms))},
+    )
+
+
+@event.listens_for(Session, 'after_begin')
+def _set_transaction_statement_timeout(session, transaction, connection):
+    # Session-level SET would leak to other clients in transaction pooling mode,
+    # so the timeout is re-applied to every transaction with is_local=true
+    apply_statement_timeout(connection, get_statement_timeout_ms())
+
+
+class SessionChanges:
+    """Values collected per key over the flushes of a transaction, handed to on_commit once it commits
+
+    collect(session, instances, add) sees the new, dirty and deleted instances of every
+    flush and records values with add(key, *values). A rollback discards the collected values.
+    """
+
+    def __init__(self, name: str, collect, on_commit):
+        self.info_key = f'session_changes:{name}'
+        self.collect = collect
+        self.on_commit = on_commit
+
+    def register(self) -> None:
+        """Listen on every session, calling it again is a no-op"""
+        for identifier, listener in (
+            ('after_flush', self._after_flush),
+            ('after_commit', self._after_commit),
+            ('after_soft_rollback', self._after_soft_rollback),
+        ):
+            if not event.contains(Session, identifier, listener):
+                event.listen(Session, identifier, listener)
+
+    def _after_flush(self, session, flush_context):
+        changes = session.info.setdefault(self.info_key, {})
+
+        def add(key, *values):
+            changes.setdefault(key, set()).update(value for value in values if value is not None)
+
+        self.collect(session, (*session.new, *session.dirty, *session.deleted), add)
+
+    def _after_commit(self, session):
+        changes = session.info.pop(self.info_key, None)
+        if changes and any(changes.values()):
+            self.on_commit(changes)
+
+    def _after_soft_rollback(self, session, previous_transaction):
+        session.info.pop(self.info_key, None)
+
+
+def _on_pool_checkout(pool, dbapi_connection, connection_record, connection_proxy):
+    _pool_metrics['checkouts'] += 1
+    profile = get_engine_profile()
+    limit = profile['pool_size'] + profile['max_overflow']
+    if pool.checkedout() >= limit:
+        _pool_metrics['saturated_checkouts'] += 1
+        logger.warning(
+            'Database pool saturated',
+            extra={'pool_checked_out': pool.checkedout(), 'pool_limit': limit},
+        )
+
+
+def register_engine_events(app, _db) -> None:
+    """Attach pool instrumentation to the application engine"""
+    with app.app_context():
+        engine = _db.engine
+        pool = engine.pool
+        if isinstance(pool, NullPool):
+            return
+        event.listen(
+            pool,
+            'checkout',
+            lambda *args: _on_pool_checkout(pool, *args),
+        )
+
+
+def record_pool_timeout() -> None:
+    _pool_metrics['timeouts'] += 1
+
+
+def get_pool_status() -> Dict[str, Any]:
+    """Return pool occupancy and lifetime counters for this process"""
+    pool = db.engine.pool
+    status: Dict[str, Any] = {
+        'process_type': Config.PROCESS_TYPE,
+        'pool_class': type(pool).__name__,
+        **_pool_metrics,
+    }
+    if isinstance(pool, NullPool):
+        return status
+
+    status.update(
+        size=pool.size(),
+        checked_in=pool.checkedin(),
+        checked_out=pool.checkedout(),
+        overflow=pool.overflow(),
+    )
+    return status
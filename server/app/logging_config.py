@@ -1,13 +1,18 @@
 import os
 import copy
 import json
+import queue
+import time
+import atexit
+import random
 import logging
 import traceback
 
 from logging.config import dictConfig
+from logging.handlers import QueueHandler, QueueListener
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, List, Tuple
 
 from app.config import Config
 
@@ -15,6 +20,19 @@ from app.config import Config
 APP_LOG_DIR = Path(Config.LOG_DIR or 'logs')
 
 _configured = False
+_listeners: List[QueueListener] = []
+
+# LogRecord attributes that are not user supplied extras
+_RESERVED_ATTRS = frozenset({
+    'name', 'msg', 'args', 'levelname', 'levelno', 'pathname',
+    'filename', 'module', 'exc_info', 'exc_text', 'stack_info',
+    'lineno', 'funcName', 'created', 'msecs', 'relativeCreated',
+    'thread', 'threadName', 'processName', 'process', 'message',
+    'asctime', 'taskName',
+})
+
+# One shared encoder avoids rebuilding encoder state for every record
+_json_encoder = json.JSONEncoder(ensure_ascii=True, check_circular=False, separators=(',', ':'))
 
 
 class ISOFormatter(logging.Formatter):
@@ -41,20 +59,16 @@ class JSONFormatter(ISOFormatter):
         if record.exc_info:
             stack = ''.join(traceback.format_exception(*record.exc_info))
             payload['stack'] = stack
+        elif record.exc_text:
+            # Records passed through a queue carry the rendered traceback only
+            payload['stack'] = record.exc_text
 
         if record.stack_info:
             payload['stack'] = payload.get('stack', '') + record.stack_info
 
         extras: Dict[str, Any] = {}
-        for key, value in record.__dict__.items():
-            if key in {
-                'name', 'msg', 'args', 'levelname', 'levelno', 'pathname',
-                'filename', 'module', 'exc_info', 'exc_text', 'stack_info',
-                'lineno', 'funcName', 'created', 'msecs', 'relativeCreated',
-                'thread', 'threadName', 'processName', 'process', 'message',
-                'asctime',
-            }:
-                continue
+        for key in record.__dict__.keys() - _RESERVED_ATTRS:
+            value = record.__dict__[key]
             if value is None:
                 continue
             if isinstance(value, (str, int, float, bool)):
@@ -65,7 +79,58 @@ class JSONFormatter(ISOFormatter):
         if extras:
             payload['extra'] = extras
 
-        return json.dumps(payload, ensure_ascii=True)
+        return _json_encoder.encode(payload)
+
+
+class RequestContextFilter(logging.Filter):
+    """Attach the correlation id and elapsed time of the current request to every record"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if 'request_id' in record.__dict__:
+            return True
+
+        from flask import g, has_request_context
+
+        if not has_request_context():
+            return True
+
+        request_id = g.get('request_id')
+        if request_id:
+            record.request_id = request_id
+        started_at = g.get('request_started_at')
+        if started_at is not None:
+            record.request_elapsed_ms = round((time.perf_counter() - started_at) * 1000, 1)
+        query_count = g.get('query_count')
+        if query_count:
+            record.query_count = query_count
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """Keep a fraction of INFO and lower records, everything above passes"""
+
+    def __init__(self, rate: float | str = 1.0) -> None:
+        super().__init__()
+        self.rate = min(max(float(rate), 0.0), 1.0)
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.INFO or self.rate >= 1.0:
+            return True
+        return random.random() < self.rate
+
+
+class PreparedQueueHandler(QueueHandler):
+    """Queue handler that keeps extras and renders tracebacks into exc_text"""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = ''.join(traceback.format_exception(*record.exc_info))
+            record.exc_info = None
+        return record
 
 
 class MaxLevelFilter(logging.Filter):
@@ -92,6 +157,13 @@ _BASE_LOGGING_CONFIG: Dict[str, Any] = {
             '()': 'app.logging_config.MaxLevelFilter',
             'max_level': 'WARNING',
         },
+        'request_context': {
+            '()': 'app.logging_config.RequestContextFilter',
+        },
+        'sample_info': {
+            '()': 'app.logging_config.SamplingFilter',
+            'rate': Config.LOG_INFO_SAMPLE_RATE,
+        },
     },
     'formatters': {
         'standard': {
@@ -112,18 +184,21 @@ _BASE_LOGGING_CONFIG: Dict[str, Any] = {
             'stream': 'ext://sys.stdout',
             'level': 'INFO',
             'formatter': 'standard',
+            'filters': ['request_context'],
         },
         'stderr': {
             'class': 'logging.StreamHandler',
             'stream': 'ext://sys.stderr',
             'level': 'INFO',
             'formatter': 'standard',
+            'filters': ['request_context'],
         },
         'access': {
             'class': 'logging.StreamHandler',
             'stream': 'ext://sys.stdout',
             'level': 'INFO',
             'formatter': 'access',
+            'filters': ['sample_info'],
         },
         'app_file': {
             'class': 'logging.handlers.RotatingFileHandler',
@@ -134,7 +209,7 @@ _BASE_LOGGING_CONFIG: Dict[str, Any] = {
             'backupCount': 2,
             'encoding': 'utf-8',
             'delay': True,
-            'filters': ['below_error'],
+            'filters': ['below_error', 'request_context'],
         },
         'error_file': {
             'class': 'logging.handlers.RotatingFileHandler',
@@ -145,6 +220,7 @@ _BASE_LOGGING_CONFIG: Dict[str, Any] = {
             'backupCount': 2,
             'encoding': 'utf-8',
             'delay': True,
+            'filters': ['request_context'],
         },
     },
     'loggers': {
@@ -168,6 +244,12 @@ _BASE_LOGGING_CONFIG: Dict[str, Any] = {
             'level': 'INFO',
             'propagate': False,
         },
+        'app.request': {
+            'handlers': ['stdout', 'app_file', 'error_file'],
+            'level': 'INFO',
+            'propagate': False,
+            'filters': ['sample_info'],
+        },
         'fontTools': {
             'handlers': [],
             'level': 'CRITICAL',
@@ -194,6 +276,52 @@ def build_logging_config() -> Dict[str, Any]:
     return config
 
 
+def _stop_queue_listeners() -> None:
+    while _listeners:
+        _listeners.pop().stop()
+
+
+def _install_queue_handlers() -> None:
+    """Move file and stream handlers off the calling threads onto per-process listener threads"""
+
+    _stop_queue_listeners()
+
+    loggers = [logging.getLogger()] + [
+        logging.getLogger(name) for name in _BASE_LOGGING_CONFIG['loggers']
+    ]
+    queues: Dict[Tuple[int, ...], queue.SimpleQueue] = {}
+    for logger in loggers:
+        handlers = [h for h in logger.handlers if not isinstance(h, QueueHandler)]
+        if not handlers:
+            continue
+
+        key = tuple(id(h) for h in handlers)
+        if key not in queues:
+            queues[key] = queue.SimpleQueue()
+            listener = QueueListener(queues[key], *handlers, respect_handler_level=True)
+            listener.start()
+            _listeners.append(listener)
+
+        queue_handler = PreparedQueueHandler(queues[key])
+        # Request context only exists on the emitting thread, capture it before enqueueing
+        queue_handler.addFilter(RequestContextFilter())
+        logger.handlers = [queue_handler]
+
+
+def restart_queue_listeners() -> None:
+    """Rebuild handlers and listener threads in a forked child, the parent's threads do not survive fork"""
+
+    if not Config.LOG_QUEUE_ENABLED or not _configured:
+        return
+
+    _listeners.clear()
+    dictConfig(build_logging_config())
+    _install_queue_handlers()
+
+
+atexit.register(_stop_queue_listeners)
+
+
 def configure_logging(force: bool = False) -> None:
     """Apply the shared logging configuration exactly once per process"""
 
@@ -211,5 +339,7 @@ def configure_logging(force: bool = False) -> None:
     config = build_logging_config()
 
     dictConfig(config)
+    if Config.LOG_QUEUE_ENABLED:
+        _install_queue_handlers()
     logging.captureWarnings(True)
     _configured = True
@@ -0,0 +1,44 @@
+from flask import request
+
+from app.config import Config
+from app.utils.compression import accepted_encodings, compress
+
+
+def _is_compressible(response) -> bool:
+    if request.method == 'HEAD' or response.direct_passthrough or response.is_streamed:
+        return False
+    if not 200 <= response.status_code < 300 or response.status_code in (204, 206):
+        return False
+    if 'Content-Encoding' in response.headers or 'no-transform' in response.cache_control:
+        return False
+    if response.mimetype not in Config.COMPRESSION_MIMETYPES:
+        return False
+    return (response.calculate_content_length() or 0) >= Config.COMPRESSION_MIN_SIZE
+
+
+def register_compression(app):
+    """Compress buffered JSON and HTML responses with the best encoding the client accepts"""
+    if not Config.COMPRESSION_ENABLED:
+        return
+
+    @app.after_request
+    def _compress_response(response):
+        if not _is_compressible(response):
+            return response
+
+        # Shared caches must keep the plain and encoded bodies apart
+        response.vary.add('Accept-Encoding')
+
+        encodings = accepted_encodings(request.accept_encodings)
+        if not encodings:
+            return response
+
+        encoding = encodings[0]
+        response.set_data(compress(response.get_data(), encoding))
+        response.content_encoding = encoding
+
+        etag, is_weak = response.get_etag()
+        if etag and not is_weak:
+            # A strong validator belongs to one representation
+            response.set_etag(f'{etag}-{encoding}')
+        return response
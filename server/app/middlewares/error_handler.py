@@ -1,16 +1,21 @@
 import logging
 
 from flask import current_app, jsonify
+from sqlalchemy.exc import OperationalError, TimeoutError as PoolTimeoutError
 from werkzeug.exceptions import HTTPException, NotFound
 
 from app.constants.messages import ErrorMessages
-from app.database import db
+from app.database import db, record_pool_timeout
 from app.models._base_model import ModelValidationError, NotFoundError
 from app.utils.email import EmailError
 
 
 logger = logging.getLogger(__name__)
 
+# PostgreSQL error code raised when statement_timeout cancels a query
+QUERY_CANCELED_PGCODE = '57014'
+RETRY_AFTER_SECONDS = 5
+
 
 def _get_logger():
     try:
@@ -47,6 +52,30 @@ def register_error_handlers(app):
         _log_exception(f'Email error: {e}')
         return jsonify({'message': ErrorMessages.FAILED_TO_SEND_EMAIL}), 500
 
+    @app.errorhandler(PoolTimeoutError)
+    def _handle_pool_timeout_error(e):
+        db.session.rollback()
+        record_pool_timeout()
+        _log_exception(f'Database pool exhausted: {e}', level='warning')
+        return (
+            jsonify({'message': ErrorMessages.SERVICE_UNAVAILABLE}),
+            503,
+            {'Retry-After': str(RETRY_AFTER_SECONDS)},
+        )
+
+    @app.errorhandler(OperationalError)
+    def _handle_operational_error(e):
+        db.session.rollback()
+        if getattr(e.orig, 'pgcode', None) == QUERY_CANCELED_PGCODE:
+            _log_exception(f'Statement timeout exceeded: {e}', level='warning')
+            return (
+                jsonify({'message': ErrorMessages.SERVICE_UNAVAILABLE}),
+                503,
+                {'Retry-After': str(RETRY_AFTER_SECONDS)},
+            )
+        _log_exception(f'Database error: {e}')
+        return jsonify({'message': ErrorMessages.INTERNAL_SERVER_ERROR}), 500
+
     @app.errorhandler(ValueError)
     def _handle_value_error(e):
         db.session.rollback()
@@ -0,0 +1,176 @@
+import hashlib
+import logging
+import re
+import time
+
+from collections import defaultdict
+
+from flask import g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.config import Config
+from app.utils import cache
+
+
+QUERY_COUNT_HEADER = 'X-Query-Count'
+SERVER_TIMING_HEADER = 'Server-Timing'
+PROFILE_KEY_PREFIX = 'sql_profile'
+PROFILE_TOP_STATEMENTS = 10
+
+logger = logging.getLogger('app.sql_profile')
+
+# Expanded IN lists and literal values would give every call of the same query its own fingerprint
+_PARAM_LIST_PATTERN = re.compile(r'\(\s*%\([^)]+\)s(?:\s*,\s*%\([^)]+\)s)*\s*\)')
+_PARAM_PATTERN = re.compile(r'%\([^)]+\)s|\$\d+|\?')
+_NUMBER_PATTERN = re.compile(r'\b\d+\b')
+_WHITESPACE_PATTERN = re.compile(r'\s+')
+
+
+def _count_query(conn, cursor, statement, parameters, context, executemany):
+    if has_request_context():
+        g.query_count = g.get('query_count', 0) + 1
+
+
+def register_query_counter(app):
+    """Expose the number of SQL statements per request as a response header"""
+    if not Config.QUERY_COUNT_HEADER_ENABLED:
+        return
+
+    if not event.contains(Engine, 'before_cursor_execute', _count_query):
+        event.listen(Engine, 'before_cursor_execute', _count_query)
+
+    @app.after_request
+    def _add_query_count_header(response):
+        response.headers[QUERY_COUNT_HEADER] = str(g.get('query_count', 0))
+        return response
+
+
+def fingerprint(statement: str) -> str:
+    """Normalize a statement so repeated calls with different parameters match"""
+    normalized = _PARAM_LIST_PATTERN.sub('(?)', statement)
+    normalized = _PARAM_PATTERN.sub('?', normalized)
+    normalized = _NUMBER_PATTERN.sub('?', normalized)
+    return _WHITESPACE_PATTERN.sub(' ', normalized).strip()
+
+
+class RequestProfile:
+    """SQL statistics of one request: count, time and repeats per statement fingerprint"""
+
+    def __init__(self):
+        self.query_count = 0
+        self.db_time = 0.0
+        self.statements = defaultdict(lambda: {'count': 0, 'time': 0.0, 'identical': defaultdict(int)})
+
+    def record(self, statement: str, parameters, elapsed: float) -> None:
+        self.query_count += 1
+        self.db_time += elapsed
+
+        entry = self.statements[fingerprint(statement)]
+        entry['count'] += 1
+        entry['time'] += elapsed
+        params_digest = hashlib.blake2b(repr(parameters).encode(), digest_size=8).hexdigest()
+        entry['identical'][params_digest] += 1
+
+    def repeated(self, min_count: int) -> list[dict]:
+        """Fingerprints executed at least min_count times, the usual N+1 signature"""
+        rows = [
+            {
+                'statement': statement,
+                'count': entry['count'],
+                'time_ms': round(entry['time'] * 1000, 2),
+                'identical': max(entry['identical'].values()),
+            }
+            for statement, entry in self.statements.items()
+            if entry['count'] >= min_count
+        ]
+        return sorted(rows, key=lambda row: (-row['count'], -row['time_ms']))
+
+    def to_dict(self) -> dict:
+        slowest = sorted(self.statements.items(), key=lambda item: -item[1]['time'])
+        return {
+            'query_count': self.query_count,
+            'db_time_ms': round(self.db_time * 1000, 2),
+            'repeated': self.repeated(Config.SQL_PROFILER_REPEAT_THRESHOLD),
+            'slowest': [
+                {
+                    'statement': statement,
+                    'count': entry['count'],
+                    'time_ms': round(entry['time'] * 1000, 2),
+                }
+                for statement, entry in slowest[:PROFILE_TOP_STATEMENTS]
+            ],
+        }
+
+
+def _before_profiled_execute(conn, cursor, statement, parameters, context, executemany):
+    # The execution context belongs to one statement, so a statement that raises leaves nothing behind
+    if context is not None and has_request_context():
+        context._profiler_started_at = time.perf_counter()
+
+
+def _after_profiled_execute(conn, cursor, statement, parameters, context, executemany):
+    started_at = getattr(context, '_profiler_started_at', None)
+    if started_at is None or not has_request_context():
+        return
+
+    elapsed = time.perf_counter() - started_at
+    profile = g.get('sql_profile')
+    if profile is None:
+        profile = g.sql_profile = RequestProfile()
+    profile.record(statement, parameters, elapsed)
+
+
+def profile_key(request_id: str) -> str:
+    return f'{PROFILE_KEY_PREFIX}:{request_id}'
+
+
+def register_sql_profiler(app):
+    """Profile SQL per request and surface it as Server-Timing, a log line and a stored profile"""
+    if not Config.SQL_PROFILER_ENABLED:
+        return
+
+    if not event.contains(Engine, 'before_cursor_execute', _before_profiled_execute):
+        event.listen(Engine, 'before_cursor_execute', _before_profiled_execute)
+    if not event.contains(Engine, 'after_cursor_execute', _after_profiled_execute):
+        event.listen(Engine, 'after_cursor_execute', _after_profiled_execute)
+
+    @app.after_request
+    def _report_sql_profile(response):
+        profile = g.get('sql_profile')
+        if profile is None:
+            return response
+
+        summary = profile.to_dict()
+        response.headers.add(
+            SERVER_TIMING_HEADER,
+            f'db;dur={summary["db_time_ms"]};desc="{summary["query_count"]} queries"',
+        )
+
+        over_limit = summary['query_count'] > Config.SQL_PROFILER_QUERY_ALARM
+        extra = {
+            'endpoint': request.endpoint,
+            'method': request.method,
+            'path': request.path,
+            'query_count': summary['query_count'],
+            'db_time_ms': summary['db_time_ms'],
+            'repeated_statements': len(summary['repeated']),
+        }
+        if over_limit:
+            logger.warning('Query count threshold exceeded', extra={
+                **extra,
+                'query_alarm': Config.SQL_PROFILER_QUERY_ALARM,
+                'top_repeated': summary['repeated'][0]['statement'] if summary['repeated'] else None,
+            })
+        else:
+            logger.info('SQL profile', extra=extra)
+
+        request_id = g.get('request_id')
+        if request_id:
+            cache.set_json(
+                profile_key(request_id),
+                {**summary, 'endpoint': request.endpoint, 'method': request.method, 'path': request.path,
+                 'status': response.status_code},
+                Config.SQL_PROFILE_TTL_SECONDS,
+            )
+        return response
@@ -0,0 +1,53 @@
+import logging
+import re
+import time
+import uuid
+
+from flask import g, request
+
+from app.config import Config
+
+
+REQUEST_ID_HEADER = 'X-Request-ID'
+_REQUEST_ID_PATTERN = re.compile(r'^[A-Za-z0-9._-]{8,64}$')
+
+logger = logging.getLogger('app.request')
+
+
+def _incoming_request_id():
+    value = request.headers.get(REQUEST_ID_HEADER, '')
+    return value if _REQUEST_ID_PATTERN.match(value) else None
+
+
+def register_request_context(app):
+    """Assign a correlation id to every request and log one timing line when it finishes"""
+
+    @app.before_request
+    def _start_request_context():
+        g.request_id = _incoming_request_id() or uuid.uuid4().hex
+        g.request_started_at = time.perf_counter()
+
+    @app.after_request
+    def _finish_request_context(response):
+        request_id = g.get('request_id')
+        if request_id:
+            response.headers[REQUEST_ID_HEADER] = request_id
+
+        started_at = g.get('request_started_at')
+        if started_at is None:
+            return response
+
+        duration_ms = round((time.perf_counter() - started_at) * 1000, 1)
+        level = logging.WARNING if duration_ms >= Config.LOG_SLOW_REQUEST_MS else logging.INFO
+        logger.log(
+            level,
+            'Request finished',
+            extra={
+                'method': request.method,
+                'path': request.path,
+                'endpoint': request.endpoint,
+                'status': response.status_code,
+                'duration_ms': duration_ms,
+            },
+        )
+        return response
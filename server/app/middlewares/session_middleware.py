@@ -1,4 +1,29 @@
-from app.database import db
+from functools import wraps
+
+from flask import g
+
+from app.database import apply_statement_timeout, db, get_statement_timeout_ms
+
+
+def statement_timeout(timeout_class):
+    """Run the view under the statement timeout configured for the endpoint class"""
+
+    def decorator(f):
+
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            g.statement_timeout_class = timeout_class
+
+            # The scoped_session proxy does not expose in_transaction, ask the request's session
+            session = db.session()
+            if session.in_transaction():
+                apply_statement_timeout(session.connection(), get_statement_timeout_ms())
+
+            return f(*args, **kwargs)
+
+        return decorated
+
+    return decorator
 
 
 def register_session_handler(app):
@@ -72,6 +72,38 @@ class Airport(BaseModel):
     def get_all(cls):
         return super().get_all(sort_by=['name'], descending=False)
 
+    @classmethod
+    def update(
+        cls,
+        _id,
+        session: Session | None = None,
+        *,
+        commit: bool = False,
+        **kwargs,
+    ):
+        session = session or db.session
+        previous_timezone_id = cls.get_or_404(_id, session).timezone_id
+
+        airport = super().update(_id, session, commit=False, **kwargs)
+
+        if airport.timezone_id != previous_timezone_id:
+            # Stored UTC schedules of flights touching this airport are now stale
+            from app.models.flight import Flight
+            from app.models.route import Route
+
+            route_ids = [
+                row.id for row in session.query(Route.id).filter(
+                    (Route.origin_airport_id == airport.id) | (Route.destination_airport_id == airport.id)
+                ).all()
+            ]
+            Flight.resync_schedule_utc(route_ids, session)
+
+        if commit:
+            session.commit()
+        else:
+            session.flush()
+        return airport
+
     @classmethod
     def get_by_code(cls, code):
         if not code:
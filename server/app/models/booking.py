@@ -59,6 +59,23 @@ class Booking(BaseModel):
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True, index=True)
     details_snapshot = db.Column(JSONB, nullable=True)
 
+    # Lower-cased search documents maintained by the database, trigram indexed
+    search_buyer = db.Column(
+        db.Text,
+        db.Computed(
+            "lower(coalesce(buyer_last_name, '') || ' ' || coalesce(buyer_first_name, '') || ' ' "
+            "|| coalesce(email_address, '') || ' ' || coalesce(phone_number, ''))",
+            persisted=True,
+        ),
+    )
+    search_reference = db.Column(
+        db.Text,
+        db.Computed(
+            "lower(coalesce(booking_number, '') || ' ' || public_id::text)",
+            persisted=True,
+        ),
+    )
+
     # Relationships
     user: Mapped['User'] = db.relationship('User', back_populates='bookings')
     payments: Mapped[List['Payment']] = db.relationship(
@@ -86,6 +103,82 @@ class Booking(BaseModel):
         'ConsentEvent', back_populates='booking', lazy='dynamic', cascade='all, delete-orphan'
     )
 
+    __table_args__ = (
+        # Hold expiry only scans unfinished bookings; seat availability reaches bookings by primary key from booking_flights
+        db.Index(
+            'ix_bookings_active_status',
+            status,
+            postgresql_where=status.notin_([
+                BOOKING_STATUS.completed,
+                BOOKING_STATUS.expired,
+                BOOKING_STATUS.cancelled,
+            ]),
+        ),
+        db.Index(
+            'ix_bookings_expired_created_at',
+            'created_at',
+            postgresql_where=status == BOOKING_STATUS.expired,
+        ),
+        db.Index(
+            'ix_bookings_search_buyer_trgm',
+            search_buyer,
+            postgresql_using='gin',
+            postgresql_ops={'search_buyer': 'gin_trgm_ops'},
+        ),
+        db.Index(
+            'ix_bookings_search_reference_trgm',
+            search_reference,
+            postgresql_using='gin',
+            postgresql_ops={'search_reference': 'gin_trgm_ops'},
+        ),
+    )
+
+    @staticmethod
+    def build_search_pattern(query: str) -> str:
+        """Return a lower-cased LIKE substring pattern with wildcards escaped"""
+        escaped = query.lower().replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        return f'%{escaped}%'
+
+    @classmethod
+    def search_typeahead(
+        cls,
+        query: str,
+        limit: int,
+        session: Session | None = None,
+    ):
+        """Return top bookings matching buyer or reference, ranked by trigram similarity"""
+        session = session or db.session
+        pattern = cls.build_search_pattern(query)
+        term = query.lower()
+        score = db.func.greatest(
+            db.func.word_similarity(term, cls.search_buyer),
+            db.func.word_similarity(term, cls.search_reference),
+        )
+
+        return (
+            session.query(
+                cls.id,
+                cls.public_id,
+                cls.booking_number,
+                cls.status,
+                cls.buyer_last_name,
+                cls.buyer_first_name,
+                cls.email_address,
+                cls.phone_number,
+                cls.created_at,
+                score.label('score'),
+            )
+            .filter(
+                db.or_(
+                    cls.search_buyer.like(pattern, escape='\\'),
+                    cls.search_reference.like(pattern, escape='\\'),
+                )
+            )
+            .order_by(score.desc(), cls.created_at.desc())
+            .limit(limit)
+            .all()
+        )
+
     def to_dict(self, return_children=False):
         return {
             'id': self.id,
@@ -207,66 +300,19 @@ class Booking(BaseModel):
         session: Session | None = None,
         *,
         commit: bool = False,
-    ):
+    ) -> List[int]:
         """Create BookingFlightPassenger rows for every passenger/flight pair"""
         session = session or db.session
         booking = cls.get_or_404(booking_id, session)
 
-        from app.models.booking_passenger import BookingPassenger
-        from app.models.booking_flight import BookingFlight
-        from app.models.flight_tariff import FlightTariff
         from app.models.booking_flight_passenger import BookingFlightPassenger
 
-        booking_passengers = (
-            session.query(BookingPassenger)
-            .filter(BookingPassenger.booking_id == booking.id)
-            .all()
-        )
-        if not booking_passengers:
-            return []
-
-        booking_passenger_ids = [bp.id for bp in booking_passengers]
-
-        flight_rows = (
-            session.query(FlightTariff.flight_id)
-            .join(BookingFlight, BookingFlight.flight_tariff_id == FlightTariff.id)
-            .filter(BookingFlight.booking_id == booking.id)
-            .all()
-        )
-        flight_ids = {
-            row.flight_id for row in flight_rows if row.flight_id is not None
-        }
-        if not flight_ids:
-            return []
-
-        existing_pairs = set(
-            session.query(
-                BookingFlightPassenger.booking_passenger_id,
-                BookingFlightPassenger.flight_id,
-            )
-            .filter(BookingFlightPassenger.booking_passenger_id.in_(booking_passenger_ids))
-            .filter(BookingFlightPassenger.flight_id.in_(flight_ids))
-            .all()
-        )
-
-        created = []
-        for bp_id in booking_passenger_ids:
-            for flight_id in flight_ids:
-                if (bp_id, flight_id) in existing_pairs:
-                    continue
-                instance = BookingFlightPassenger.create(
-                    session=session,
-                    commit=False,
-                    booking_passenger_id=bp_id,
-                    flight_id=flight_id,
-                )
-                created.append(instance)
-                existing_pairs.add((bp_id, flight_id))
+        created_ids = BookingFlightPassenger.bulk_create_for_booking(booking.id, session)
 
         if commit:
             session.commit()
 
-        return created
+        return created_ids
 
     @classmethod
     def create(
@@ -27,6 +27,12 @@ class BookingFlight(BaseModel):
             'booking_id', 'flight_tariff_id',
             name='uix_booking_flight_unique'
         ),
+        db.Index(
+            'ix_booking_flights_flight_tariff_booking',
+            'flight_tariff_id',
+            'booking_id',
+            postgresql_include=['seats_number'],
+        ),
     )
 
     def to_dict(self, return_children=False):
@@ -1,6 +1,8 @@
-from typing import TYPE_CHECKING
+from typing import List, TYPE_CHECKING
 
-from sqlalchemy.orm import Mapped
+from sqlalchemy import select
+from sqlalchemy.orm import Session, Mapped
+from sqlalchemy.dialects.postgresql import insert
 
 from app.database import db
 from app.models._base_model import BaseModel
@@ -87,3 +89,36 @@ class BookingFlightPassenger(BaseModel):
                 else None
             ),
         }
+
+    @classmethod
+    def bulk_create_for_booking(
+        cls,
+        booking_id: int,
+        session: Session | None = None,
+    ) -> List[int]:
+        """Insert missing passenger/flight pairs of a booking, return the created ids"""
+        session = session or db.session
+
+        from app.models.booking_passenger import BookingPassenger
+        from app.models.booking_flight import BookingFlight
+        from app.models.flight_tariff import FlightTariff
+
+        pairs = (
+            select(BookingPassenger.id, FlightTariff.flight_id)
+            .select_from(BookingPassenger)
+            .join(BookingFlight, BookingFlight.booking_id == BookingPassenger.booking_id)
+            .join(FlightTariff, FlightTariff.id == BookingFlight.flight_tariff_id)
+            .where(BookingPassenger.booking_id == booking_id)
+            .distinct()
+        )
+        table = cls.__table__
+        stmt = (
+            insert(table)
+            .from_select(['booking_passenger_id', 'flight_id'], pairs)
+            .on_conflict_do_nothing(constraint='uix_booking_flight_passenger_unique')
+            .returning(table.c.id)
+        )
+
+        # Pending passenger and status changes must be visible to the INSERT ... SELECT
+        session.flush()
+        return list(session.execute(stmt).scalars())
@@ -14,7 +14,7 @@ class BookingHold(BaseModel):
     __verbose_name__ = ModelVerboseNames.BookingHold
 
     booking_id = db.Column(db.Integer, db.ForeignKey('bookings.id', ondelete='CASCADE'), nullable=False, index=True, unique=True)
-    expires_at = db.Column(db.DateTime, nullable=False)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
 
     booking: Mapped['Booking'] = db.relationship(
         'Booking', back_populates='booking_hold', uselist=False
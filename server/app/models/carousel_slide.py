@@ -1,17 +1,15 @@
-from typing import List, TYPE_CHECKING
-from sqlalchemy.orm import Mapped, Session
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, Session, joinedload
 
 from app.database import db
 from app.models._base_model import BaseModel
 from app.constants.models import ModelVerboseNames
-from app.models.flight import Flight
-from app.models.flight_tariff import FlightTariff
-from app.models.tariff import Tariff
+from app.models.airport import Airport
+from app.models.route import Route
+from app.models.route_metric import RouteMetric
+from app.utils.image import build_srcset
 from app.utils.storage import ImageManager
 
-if TYPE_CHECKING:
-    from app.models.route import Route
-
 
 class CarouselSlide(BaseModel):
     __tablename__ = 'carousel_slides'
@@ -21,6 +19,8 @@ class CarouselSlide(BaseModel):
     route_id = db.Column(db.Integer, db.ForeignKey('routes.id', ondelete='RESTRICT'), nullable=True)
     image_filename = db.Column(db.String, nullable=True)
     image_path = db.Column(db.String, nullable=True)
+    # Responsive renditions of the image, filled by the image variants task
+    image_variants = db.Column(JSONB(none_as_null=True), nullable=True)
     alt = db.Column(db.String, nullable=False)
     display_order = db.Column(db.Integer, nullable=False, default=0)
     badge = db.Column(db.String, nullable=True)
@@ -30,32 +30,12 @@ class CarouselSlide(BaseModel):
     route: Mapped['Route'] = db.relationship(
         'Route', back_populates='carousel_slides'
     )
-
-    def _compute_route_metrics(self) -> dict:
-        if not self.route_id:
-            return {}
-
-        cheapest = (
-            db.session.query(Tariff.price, Tariff.currency)
-            .join(FlightTariff, FlightTariff.tariff_id == Tariff.id)
-            .join(Flight, FlightTariff.flight_id == Flight.id)
-            .filter(Flight.route_id == self.route_id, Tariff.price.isnot(None))
-            .order_by(Tariff.price.asc())
-            .first()
-        )
-
-        flights = db.session.query(Flight).filter(
-            Flight.route_id == self.route_id
-        ).all()
-        durations = [
-            flight.flight_duration for flight in flights if flight.flight_duration
-        ]
-
-        return {
-            'price_from': cheapest.price if cheapest else None,
-            'currency': cheapest.currency.value if cheapest else None,
-            'duration_minutes': min(durations) if durations else None,
-        }
+    route_metric: Mapped['RouteMetric'] = db.relationship(
+        'RouteMetric',
+        primaryjoin='CarouselSlide.route_id == foreign(RouteMetric.route_id)',
+        uselist=False,
+        viewonly=True,
+    )
 
     def to_dict(self, return_children=False) -> dict:
 
@@ -67,16 +47,35 @@ class CarouselSlide(BaseModel):
             'badge': self.badge,
             'description': self.description,
             'image_url': image_manager.get_file_url(self.image_filename, 'carousel') if self.image_filename else None,
+            'srcset': build_srcset(
+                self.image_variants or [],
+                lambda filename: image_manager.get_file_url(filename, 'carousel'),
+            ),
             'alt': self.alt,
             'route': self.route.to_dict(return_children=True) if self.route_id and return_children else {},
             'route_id': self.route_id,
-            'route_metrics': self._compute_route_metrics(),
+            'route_metrics': self.route_metric.to_dict() if self.route_metric else {},
             'is_active': self.is_active,
             'display_order': self.display_order,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
+            'created_at': self.created_at,
+            'updated_at': self.updated_at,
         }
 
+    @classmethod
+    def get_all(cls):
+        """Load slides with their routes and precomputed metrics in one query"""
+        return (
+            cls.query
+            .options(
+                joinedload(cls.route_metric),
+                joinedload(cls.route).joinedload(Route.origin_airport).joinedload(Airport.country),
+                joinedload(cls.route).joinedload(Route.origin_airport).joinedload(Airport.timezone),
+                joinedload(cls.route).joinedload(Route.destination_airport).joinedload(Airport.country),
+                joinedload(cls.route).joinedload(Route.destination_airport).joinedload(Airport.timezone),
+            )
+            .all()
+        )
+
     @classmethod
     def update(
         cls,
@@ -91,16 +90,14 @@ class CarouselSlide(BaseModel):
         slide = cls.get_or_404(_id, session)
 
         if 'image_path' in kwargs and kwargs['image_path'] is not None:
-            # Delete old image file if a new one is uploaded
+            # Delete old image files if a new one is uploaded
             old_image_path = slide.image_path
             if old_image_path and old_image_path != kwargs['image_path']:
-                ImageManager().delete_file(
-                    slide.image_filename,
-                    subfolder_name='carousel'
-                )
+                cls._delete_image_files(slide, session)
+                kwargs['image_variants'] = None
 
         return super().update(_id, session, commit=commit, **kwargs)
-    
+
     @classmethod
     def delete(
         cls,
@@ -113,9 +110,23 @@ class CarouselSlide(BaseModel):
 
         slide = cls.get_or_404(_id, session)
 
-        ImageManager().delete_file(
-            slide.image_filename,
-            subfolder_name='carousel'
-        )
+        cls._delete_image_files(slide, session)
 
         return super().delete(_id, session, commit=commit)
+
+    @classmethod
+    def _delete_image_files(cls, slide: 'CarouselSlide', session: Session) -> None:
+        """Remove the image and its variants unless another slide shares the same content"""
+        if not slide.image_filename:
+            return
+
+        is_shared = session.query(cls.id).filter(
+            cls.image_filename == slide.image_filename,
+            cls.id != slide.id,
+        ).first() is not None
+        if is_shared:
+            return
+
+        image_manager = ImageManager()
+        for filename in [slide.image_filename, *(variant['filename'] for variant in slide.image_variants or [])]:
+            image_manager.delete_file(filename, subfolder_name='carousel')
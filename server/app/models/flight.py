@@ -1,4 +1,6 @@
-from typing import List, TYPE_CHECKING
+import logging
+
+from typing import Dict, Iterable, List, Optional, Tuple, TYPE_CHECKING
 from sqlalchemy.orm import Mapped, Session
 from sqlalchemy.ext.hybrid import hybrid_property
 
@@ -12,7 +14,7 @@ from app.models._base_model import BaseModel, ModelValidationError
 from app.models.flight_tariff import FlightTariff
 from app.models.tariff import Tariff
 from app.utils.xlsx import parse_upload_xlsx_template, get_upload_xlsx_template, get_upload_xlsx_report
-from app.utils.datetime import combine_date_time, parse_date_formats, parse_time_formats
+from app.utils.datetime import combine_date_time, get_zoneinfo, parse_date_formats, parse_time_formats, to_utc
 from app.constants.messages import (
     AirlineMessages,
     AirportMessages,
@@ -23,11 +25,15 @@ from app.constants.messages import (
 from app.constants.models import ModelVerboseNames
 
 if TYPE_CHECKING:
+    from zoneinfo import ZoneInfo
     from app.models.ticket import Ticket
     from app.models.booking_flight import BookingFlight
     from app.models.booking_flight_passenger import BookingFlightPassenger
 
 
+logger = logging.getLogger(__name__)
+
+
 class Flight(BaseModel):
     __tablename__ = 'flights'
     __verbose_name__ = ModelVerboseNames.Flight
@@ -40,10 +46,22 @@ class Flight(BaseModel):
 
     scheduled_departure = db.Column(db.Date, nullable=False)
     scheduled_departure_time = db.Column(db.Time, nullable=True)
+    scheduled_departure_at = db.Column(
+        db.DateTime,
+        db.Computed(
+            "scheduled_departure + coalesce(scheduled_departure_time, '00:00:00'::time)",
+            persisted=True,
+        ),
+        index=True,
+    )
 
     scheduled_arrival = db.Column(db.Date, nullable=False)
     scheduled_arrival_time = db.Column(db.Time, nullable=True)
 
+    # Naive UTC instants derived from the local schedule and airport timezones
+    scheduled_departure_at_utc = db.Column(db.DateTime, nullable=True, index=True)
+    scheduled_arrival_at_utc = db.Column(db.DateTime, nullable=True)
+
     tariffs: Mapped[List[FlightTariff]] = db.relationship(
         'FlightTariff', back_populates='flight', lazy='dynamic', cascade='all, delete-orphan'
     )
@@ -78,6 +96,17 @@ class Flight(BaseModel):
             'flight_number', 'airline_id', 'route_id', 'scheduled_departure',
             name='uix_flight_number_airline_route_departure'
         ),
+        db.Index(
+            'ix_flights_route_departure',
+            'route_id',
+            'scheduled_departure',
+            'scheduled_departure_time',
+        ),
+        # Upcoming flight filters fall back to the local schedule when the timezone is unknown
+        db.Index(
+            'ix_flights_departure_at_effective',
+            db.func.coalesce(scheduled_departure_at_utc, scheduled_departure_at),
+        ),
     )
 
     @hybrid_property
@@ -88,39 +117,130 @@ class Flight(BaseModel):
         return f'{airline_code} {self.flight_number}'
 
     @hybrid_property
-    def flight_duration(self):
-        """Return flight duration in minutes"""
-        if not (self.scheduled_departure and self.scheduled_arrival):
-            return None
+    def departure_at_utc(self):
+        """Return UTC departure, the local one when the route timezones are unknown"""
+        return self.scheduled_departure_at_utc or self.scheduled_departure_at
 
-        depart_dt = combine_date_time(
-            self.scheduled_departure, 
-            self.scheduled_departure_time
-        )
-        arrive_dt = combine_date_time(
-            self.scheduled_arrival, 
-            self.scheduled_arrival_time
+    @departure_at_utc.expression
+    def departure_at_utc(cls):
+        return db.func.coalesce(cls.scheduled_departure_at_utc, cls.scheduled_departure_at)
+
+    @hybrid_property
+    def flight_duration(self):
+        """Return flight duration in minutes, None when the route timezones are unknown"""
+        if self.scheduled_departure_at_utc and self.scheduled_arrival_at_utc:
+            delta = self.scheduled_arrival_at_utc - self.scheduled_departure_at_utc
+            return int(delta.total_seconds() // 60)
+        return None
+
+    @staticmethod
+    def get_route_zones(
+        route_ids: Iterable[int],
+        session: Session | None = None,
+    ) -> Dict[int, Tuple[Optional['ZoneInfo'], Optional['ZoneInfo']]]:
+        """Return (origin, destination) timezones per route with one query"""
+        session = session or db.session
+        route_ids = {route_id for route_id in route_ids if route_id is not None}
+        if not route_ids:
+            return {}
+
+        from app.models.timezone import Timezone
+
+        origin = db.aliased(Airport)
+        dest = db.aliased(Airport)
+        origin_tz = db.aliased(Timezone)
+        dest_tz = db.aliased(Timezone)
+
+        rows = (
+            session.query(Route.id, origin_tz.name.label('origin_tz'), dest_tz.name.label('dest_tz'))
+            .join(origin, Route.origin_airport_id == origin.id)
+            .join(dest, Route.destination_airport_id == dest.id)
+            .outerjoin(origin_tz, origin.timezone_id == origin_tz.id)
+            .outerjoin(dest_tz, dest.timezone_id == dest_tz.id)
+            .filter(Route.id.in_(route_ids))
+            .all()
         )
+        return {
+            row.id: (get_zoneinfo(row.origin_tz), get_zoneinfo(row.dest_tz))
+            for row in rows
+        }
 
-        if depart_dt is None or arrive_dt is None:
-            return None
+    @classmethod
+    def sync_schedule_utc(
+        cls,
+        flights: Iterable['Flight'],
+        session: Session | None = None,
+    ) -> None:
+        """Recompute stored UTC departure/arrival for the given flights"""
+        flights = list(flights)
+        zones = cls.get_route_zones((flight.route_id for flight in flights), session)
 
-        route = self.route
-        origin = route.origin_airport
-        dest = route.destination_airport
+        unknown_zone_routes = set()
+        for flight in flights:
+            origin_tz, dest_tz = zones.get(flight.route_id, (None, None))
+            if (origin_tz is None or dest_tz is None) and flight.route_id not in unknown_zone_routes:
+                # Searches fall back to the local schedule until the airports get a timezone
+                unknown_zone_routes.add(flight.route_id)
+                logger.warning('Route airport timezone is unknown, UTC schedule left empty', extra={'route_id': flight.route_id})
+            flight.scheduled_departure_at_utc = to_utc(
+                combine_date_time(flight.scheduled_departure, flight.scheduled_departure_time),
+                origin_tz,
+            )
+            flight.scheduled_arrival_at_utc = to_utc(
+                combine_date_time(flight.scheduled_arrival, flight.scheduled_arrival_time),
+                dest_tz,
+            )
 
-        origin_tz = origin.timezone.get_tz() if origin.timezone else None
-        dest_tz = dest.timezone.get_tz() if dest.timezone else None
+    @classmethod
+    def resync_schedule_utc(
+        cls,
+        route_ids: Iterable[int],
+        session: Session | None = None,
+    ) -> int:
+        """Recompute stored UTC schedule for every flight of the given routes"""
+        session = session or db.session
+        flights = session.query(cls).filter(cls.route_id.in_(list(route_ids))).all()
+        cls.sync_schedule_utc(flights, session)
+        return len(flights)
 
-        if origin_tz:
-            depart_dt = depart_dt.replace(tzinfo=origin_tz)
-        if dest_tz:
-            arrive_dt = arrive_dt.replace(tzinfo=dest_tz)
+    @classmethod
+    def get_durations(
+        cls,
+        flights: Iterable['Flight'],
+        session: Session | None = None,
+    ) -> Dict[int, Optional[int]]:
+        """Return duration in minutes per flight id for a whole result list"""
+        flights = list(flights)
+        durations: Dict[int, Optional[int]] = {}
+        missing = []
 
-        delta = arrive_dt - depart_dt
-        return int(delta.total_seconds() // 60)
+        for flight in flights:
+            if flight.scheduled_departure_at_utc and flight.scheduled_arrival_at_utc:
+                delta = flight.scheduled_arrival_at_utc - flight.scheduled_departure_at_utc
+                durations[flight.id] = int(delta.total_seconds() // 60)
+            else:
+                missing.append(flight)
+
+        zones = cls.get_route_zones((flight.route_id for flight in missing), session)
+        for flight in missing:
+            origin_tz, dest_tz = zones.get(flight.route_id, (None, None))
+            depart_dt = to_utc(
+                combine_date_time(flight.scheduled_departure, flight.scheduled_departure_time),
+                origin_tz,
+            )
+            arrive_dt = to_utc(
+                combine_date_time(flight.scheduled_arrival, flight.scheduled_arrival_time),
+                dest_tz,
+            )
+            if depart_dt is None or arrive_dt is None:
+                durations[flight.id] = None
+                continue
+            durations[flight.id] = int((arrive_dt - depart_dt).total_seconds() // 60)
+
+        return durations
 
-    def to_dict(self, return_children=False):
+    def to_dict(self, return_children=False, durations: Optional[Dict[int, Optional[int]]] = None):
+        """durations comes from get_durations when a whole result list is serialized"""
         return {
             'id': self.id,
             'flight_number': self.flight_number,
@@ -136,7 +256,7 @@ class Flight(BaseModel):
             'scheduled_departure_time': self.scheduled_departure_time.isoformat() if self.scheduled_departure_time else None,
             'scheduled_arrival': self.scheduled_arrival.isoformat() if self.scheduled_arrival else None,
             'scheduled_arrival_time': self.scheduled_arrival_time.isoformat() if self.scheduled_arrival_time else None,
-            'duration': self.flight_duration,
+            'duration': durations.get(self.id) if durations is not None else self.flight_duration,
         }
 
     EXTERNAL_UPLOAD_FIELDS = [
@@ -472,7 +592,14 @@ class Flight(BaseModel):
         cls._check_flight_uniqueness(
             session, flight_number, airline_id, route_id, scheduled_departure
         )
-        return super().create(session, commit=commit, **kwargs)
+        flight = super().create(session, commit=False, **kwargs)
+        cls.sync_schedule_utc([flight], session)
+
+        if commit:
+            session.commit()
+        else:
+            session.flush()
+        return flight
 
     @classmethod
     def update(
@@ -491,4 +618,11 @@ class Flight(BaseModel):
         cls._check_flight_uniqueness(
             session, flight_number, airline_id, route_id, scheduled_departure, exclude_id=_id
         )
-        return super().update(_id, session, commit=commit, **kwargs)
+        flight = super().update(_id, session, commit=False, **kwargs)
+        cls.sync_schedule_utc([flight], session)
+
+        if commit:
+            session.commit()
+        else:
+            session.flush()
+        return flight
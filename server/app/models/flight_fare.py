@@ -0,0 +1,188 @@
+import logging
+
+from typing import Iterable, Optional, Set
+
+from sqlalchemy import delete, func, or_, select, true
+from sqlalchemy.orm import Session, attributes
+from sqlalchemy.dialects.postgresql import insert
+
+from app.database import SessionChanges, db
+from app.models._base_model import BaseModel
+from app.constants.models import ModelVerboseNames
+from app.utils.enum import CURRENCY, SEAT_CLASS
+
+logger = logging.getLogger(__name__)
+
+
+class FlightFare(BaseModel):
+    """Lowest available fare of a flight, refreshed after tariff, seat and booking changes commit"""
+
+    __tablename__ = 'flight_fares'
+    __verbose_name__ = ModelVerboseNames.FlightFare
+
+    flight_id = db.Column(db.Integer, db.ForeignKey('flights.id', ondelete='CASCADE'), nullable=False, unique=True)
+    flight_tariff_id = db.Column(
+        db.Integer, db.ForeignKey('flight_tariffs.id', ondelete='CASCADE'), nullable=False
+    )
+    tariff_id = db.Column(db.Integer, db.ForeignKey('tariffs.id', ondelete='CASCADE'), nullable=False)
+    price = db.Column(db.Float, nullable=False)
+    currency = db.Column(db.Enum(CURRENCY), nullable=False)
+    seat_class = db.Column(db.Enum(SEAT_CLASS), nullable=False)
+    seats_left = db.Column(db.Integer, nullable=False)
+
+    def to_dict(self, return_children=False):
+        return {
+            'flight_id': self.flight_id,
+            'flight_tariff_id': self.flight_tariff_id,
+            'tariff_id': self.tariff_id,
+            'price': self.price,
+            'currency': self.currency.value,
+            'seat_class': self.seat_class.value,
+            'seats_left': self.seats_left,
+        }
+
+    @classmethod
+    def resolve_flight_ids(
+        cls,
+        session: Session | None = None,
+        *,
+        flight_ids: Iterable[int] = (),
+        flight_tariff_ids: Iterable[int] = (),
+        tariff_ids: Iterable[int] = (),
+        booking_ids: Iterable[int] = (),
+    ) -> Set[int]:
+        """Flights whose lowest fare may be affected by the given rows"""
+        session = session or db.session
+
+        from app.models.flight_tariff import FlightTariff
+        from app.models.booking_flight import BookingFlight
+
+        flight_ids = set(flight_ids)
+        flight_tariff_ids, tariff_ids, booking_ids = set(flight_tariff_ids), set(tariff_ids), set(booking_ids)
+
+        criteria = []
+        if flight_tariff_ids:
+            criteria.append(FlightTariff.id.in_(flight_tariff_ids))
+        if tariff_ids:
+            criteria.append(FlightTariff.tariff_id.in_(tariff_ids))
+        if booking_ids:
+            criteria.append(
+                FlightTariff.id.in_(
+                    select(BookingFlight.flight_tariff_id).where(BookingFlight.booking_id.in_(booking_ids))
+                )
+            )
+        if criteria:
+            rows = session.execute(select(FlightTariff.flight_id).where(or_(*criteria)).distinct())
+            flight_ids.update(rows.scalars())
+        return flight_ids
+
+    @classmethod
+    def refresh(
+        cls,
+        flight_ids: Optional[Iterable[int]] = None,
+        session: Session | None = None,
+        *,
+        commit: bool = False,
+    ) -> int:
+        """Rebuild the fare rows of the given flights, or of all flights"""
+        session = session or db.session
+
+        from app.models.flight_tariff import FlightTariff
+        from app.models.tariff import Tariff
+        from app.utils.search import taken_seats_query
+
+        if flight_ids is not None:
+            flight_ids = sorted(set(flight_ids))
+            if not flight_ids:
+                return 0
+        in_scope = FlightTariff.flight_id.in_(flight_ids) if flight_ids is not None else true()
+
+        # Same occupancy rule as get_flight_seat_availability
+        taken = taken_seats_query(session, in_scope).subquery()
+        seats_left = FlightTariff.seats_number - func.coalesce(taken.c.taken, 0)
+        cheapest = (
+            select(
+                FlightTariff.flight_id,
+                FlightTariff.id,
+                FlightTariff.tariff_id,
+                Tariff.price,
+                Tariff.currency,
+                Tariff.seat_class,
+                seats_left,
+            )
+            .join(Tariff, FlightTariff.tariff_id == Tariff.id)
+            .outerjoin(taken, taken.c.flight_tariff_id == FlightTariff.id)
+            .where(in_scope, Tariff.price.isnot(None), seats_left > 0)
+            .distinct(FlightTariff.flight_id)
+            .order_by(FlightTariff.flight_id, Tariff.price.asc(), FlightTariff.id.asc())
+        )
+
+        table = cls.__table__
+        upsert = insert(table).from_select(
+            ['flight_id', 'flight_tariff_id', 'tariff_id', 'price', 'currency', 'seat_class', 'seats_left'],
+            cheapest,
+        )
+        # Upsert rather than delete and reinsert so concurrent refreshes of a flight serialize on its row
+        upsert = upsert.on_conflict_do_update(
+            index_elements=['flight_id'],
+            set_={
+                'flight_tariff_id': upsert.excluded.flight_tariff_id,
+                'tariff_id': upsert.excluded.tariff_id,
+                'price': upsert.excluded.price,
+                'currency': upsert.excluded.currency,
+                'seat_class': upsert.excluded.seat_class,
+                'seats_left': upsert.excluded.seats_left,
+                'updated_at': func.now(),
+            },
+        ).returning(table.c.flight_id)
+        fared_ids = list(session.execute(upsert).scalars())
+
+        # Flights without any available fare drop out of the index
+        stale = delete(table).where(table.c.flight_id.notin_(fared_ids))
+        if flight_ids is not None:
+            stale = stale.where(table.c.flight_id.in_(flight_ids))
+        session.execute(stale)
+
+        if commit:
+            session.commit()
+        return len(fared_ids)
+
+
+def _collect_flight_fare_changes(session, instances, add):
+    from app.models.booking import Booking
+    from app.models.booking_flight import BookingFlight
+    from app.models.booking_hold import BookingHold
+    from app.models.flight import Flight
+    from app.models.flight_tariff import FlightTariff
+    from app.models.tariff import Tariff
+
+    for instance in instances:
+        if isinstance(instance, FlightTariff):
+            add('flight_ids', instance.flight_id, *attributes.get_history(instance, 'flight_id').deleted)
+        elif isinstance(instance, BookingFlight):
+            add('flight_tariff_ids', instance.flight_tariff_id,
+                *attributes.get_history(instance, 'flight_tariff_id').deleted)
+        elif isinstance(instance, BookingHold):
+            add('booking_ids', instance.booking_id)
+        elif isinstance(instance, Booking):
+            if instance in session.deleted or attributes.get_history(instance, 'status').has_changes():
+                add('booking_ids', instance.id)
+        elif isinstance(instance, Tariff) and instance not in session.new:
+            add('tariff_ids', instance.id)
+        elif isinstance(instance, Flight):
+            # Schedule and route changes only move the route level fare
+            add('route_ids', instance.route_id, *attributes.get_history(instance, 'route_id').deleted)
+
+
+def _schedule_flight_fares_refresh(changes) -> None:
+    """Refresh the index after commit, bookings never wait on fare and route metric row locks"""
+    from app.tasks.route import refresh_flight_fares
+
+    try:
+        refresh_flight_fares.delay(**{key: sorted(values) for key, values in changes.items() if values})
+    except Exception:
+        # The periodic route metrics refresh rebuilds the whole index
+        logger.warning('Failed to enqueue flight fares refresh', exc_info=True)
+
+
+flight_fare_changes = SessionChanges('flight_fares', _collect_flight_fare_changes, _schedule_flight_fares_refresh)
@@ -46,6 +46,19 @@ class Payment(BaseModel):
 
     booking: Mapped['Booking'] = db.relationship('Booking', back_populates='payments')
 
+    # Provider notifications only move a payment forward, succeeded and canceled are final
+    STATUS_ORDER = {
+        PAYMENT_STATUS.pending: 0,
+        PAYMENT_STATUS.waiting_for_capture: 1,
+        PAYMENT_STATUS.succeeded: 2,
+        PAYMENT_STATUS.canceled: 2,
+    }
+
+    @classmethod
+    def is_forward_status(cls, from_status, to_status) -> bool:
+        """Whether a notification moving the payment to to_status is newer than its current state"""
+        return cls.STATUS_ORDER[to_status] > cls.STATUS_ORDER[from_status]
+
     def to_dict(self, return_children=False):
         return {
             'id': self.id,
@@ -0,0 +1,240 @@
+from typing import List, Optional, TYPE_CHECKING
+from datetime import datetime, timedelta
+
+from sqlalchemy.orm import Session, Mapped
+from sqlalchemy.dialects.postgresql import JSONB, insert
+
+from app.config import Config
+from app.database import db
+from app.models._base_model import BaseModel
+from app.constants.models import ModelVerboseNames
+from app.utils.enum import (
+    PAYMENT_METHOD,
+    WEBHOOK_EVENT_STATUS,
+    DEFAULT_WEBHOOK_EVENT_STATUS,
+)
+
+if TYPE_CHECKING:
+    from app.models.booking import Booking
+
+
+class PaymentWebhookEvent(BaseModel):
+    __tablename__ = 'payment_webhook_events'
+    __verbose_name__ = ModelVerboseNames.PaymentWebhookEvent
+
+    provider = db.Column(db.Enum(PAYMENT_METHOD), nullable=False, default=PAYMENT_METHOD.yookassa)
+    provider_payment_id = db.Column(db.String, nullable=False, index=True)
+    event = db.Column(db.String, nullable=False)
+    dedupe_key = db.Column(db.String, nullable=False, unique=True)
+    booking_id = db.Column(db.Integer, db.ForeignKey('bookings.id', ondelete='CASCADE'), nullable=True, index=True)
+    payload = db.Column(JSONB, nullable=False)
+    status = db.Column(db.Enum(WEBHOOK_EVENT_STATUS), nullable=False, default=DEFAULT_WEBHOOK_EVENT_STATUS)
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    last_error = db.Column(db.Text, nullable=True)
+    processed_at = db.Column(db.DateTime, nullable=True)
+
+    booking: Mapped['Booking'] = db.relationship('Booking')
+
+    def to_dict(self, return_children=False):
+        return {
+            'id': self.id,
+            'provider': self.provider.value if self.provider else None,
+            'provider_payment_id': self.provider_payment_id,
+            'event': self.event,
+            'dedupe_key': self.dedupe_key,
+            'booking_id': self.booking_id,
+            'payload': self.payload if return_children else {},
+            'status': self.status.value if self.status else None,
+            'attempts': self.attempts,
+            'last_error': self.last_error,
+            'processed_at': self.processed_at,
+            'created_at': self.created_at,
+            'updated_at': self.updated_at,
+        }
+
+    @staticmethod
+    def build_dedupe_key(provider_payment_id: str, event: str) -> str:
+        return f'{provider_payment_id}:{event}'
+
+    @classmethod
+    def get_all(cls, status: Optional[WEBHOOK_EVENT_STATUS] = None):
+        query = cls.query
+        if status is not None:
+            query = query.filter(cls.status == status)
+        return query.order_by(cls.id.desc()).all()
+
+    @classmethod
+    def record(
+        cls,
+        provider: PAYMENT_METHOD,
+        provider_payment_id: str,
+        event: str,
+        payload: dict,
+        session: Session | None = None,
+        *,
+        commit: bool = False,
+    ) -> Optional[int]:
+        """Persist an incoming event once and return its id, or None for duplicates"""
+        session = session or db.session
+
+        from app.models.payment import Payment
+
+        payment = (
+            session.query(Payment.booking_id)
+            .filter(Payment.provider_payment_id == provider_payment_id)
+            .first()
+        )
+
+        stmt = (
+            insert(cls)
+            .values(
+                provider=provider,
+                provider_payment_id=provider_payment_id,
+                event=event,
+                dedupe_key=cls.build_dedupe_key(provider_payment_id, event),
+                booking_id=payment.booking_id if payment else None,
+                payload=payload,
+            )
+            .on_conflict_do_nothing(index_elements=['dedupe_key'])
+            .returning(cls.id)
+        )
+        event_id = session.execute(stmt).scalar()
+
+        if commit:
+            session.commit()
+        else:
+            session.flush()
+        return event_id
+
+    @classmethod
+    def claim_for_processing(
+        cls,
+        event_id: int,
+        session: Session | None = None,
+    ) -> Optional[List[int]]:
+        """Claim unprocessed events of the event's booking in arrival order.
+
+        Returns None when another worker is still applying events for the
+        same booking, so the caller can retry later without reordering.
+        """
+        session = session or db.session
+
+        from app.models.booking import Booking
+        from app.models.payment import Payment
+
+        event = session.get(cls, event_id)
+        if event is None:
+            return []
+
+        if event.booking_id is None:
+            # The payment may have been committed after the notification arrived
+            payment = (
+                session.query(Payment.booking_id)
+                .filter(Payment.provider_payment_id == event.provider_payment_id)
+                .first()
+            )
+            event.booking_id = payment.booking_id if payment else None
+
+        if event.booking_id is not None:
+            # Serializes claims for the booking; released on commit below
+            session.query(Booking.id).filter(Booking.id == event.booking_id).with_for_update().first()
+            scope = cls.booking_id == event.booking_id
+        else:
+            scope = cls.id == event.id
+
+        stale_before = datetime.now() - timedelta(minutes=Config.WEBHOOK_EVENT_STALE_MINUTES)
+        in_flight = (
+            session.query(cls.id)
+            .filter(
+                scope,
+                cls.status == WEBHOOK_EVENT_STATUS.processing,
+                cls.updated_at > stale_before,
+            )
+            .first()
+        )
+        if in_flight is not None:
+            session.rollback()
+            return None
+
+        events = (
+            session.query(cls)
+            .filter(
+                scope,
+                cls.status.in_([
+                    WEBHOOK_EVENT_STATUS.pending,
+                    WEBHOOK_EVENT_STATUS.failed,
+                    WEBHOOK_EVENT_STATUS.processing,
+                ]),
+            )
+            .order_by(cls.id.asc())
+            .all()
+        )
+        for claimed in events:
+            claimed.status = WEBHOOK_EVENT_STATUS.processing
+            claimed.attempts = (claimed.attempts or 0) + 1
+
+        session.commit()
+        return [claimed.id for claimed in events]
+
+    @classmethod
+    def mark_processed(
+        cls,
+        event_id: int,
+        session: Session | None = None,
+        *,
+        commit: bool = False,
+    ):
+        return cls.update(
+            event_id,
+            session=session,
+            commit=commit,
+            status=WEBHOOK_EVENT_STATUS.processed,
+            last_error=None,
+            processed_at=datetime.now(),
+        )
+
+    @classmethod
+    def mark_failed(
+        cls,
+        event_id: int,
+        error: str,
+        pending_ids: List[int] | None = None,
+        session: Session | None = None,
+        *,
+        commit: bool = False,
+    ):
+        """Mark the event failed and release the claim on events queued after it"""
+        session = session or db.session
+        if pending_ids:
+            (
+                session.query(cls)
+                .filter(cls.id.in_(pending_ids))
+                .update(
+                    {cls.status: WEBHOOK_EVENT_STATUS.pending},
+                    synchronize_session=False,
+                )
+            )
+        return cls.update(
+            event_id,
+            session=session,
+            commit=commit,
+            status=WEBHOOK_EVENT_STATUS.failed,
+            last_error=error,
+        )
+
+    @classmethod
+    def reset_for_replay(
+        cls,
+        event_id: int,
+        session: Session | None = None,
+        *,
+        commit: bool = False,
+    ):
+        return cls.update(
+            event_id,
+            session=session,
+            commit=commit,
+            status=WEBHOOK_EVENT_STATUS.pending,
+            last_error=None,
+            processed_at=None,
+        )
@@ -1,5 +1,5 @@
 from typing import List, TYPE_CHECKING
-from sqlalchemy.orm import Mapped
+from sqlalchemy.orm import Mapped, Session
 
 from app.database import db
 from app.models._base_model import BaseModel
@@ -42,3 +42,30 @@ class Route(BaseModel):
             'destination_airport': self.destination_airport.to_dict(return_children) if return_children else {},
             'destination_airport_id': self.destination_airport_id,
         }
+
+    @classmethod
+    def update(
+        cls,
+        _id,
+        session: Session | None = None,
+        *,
+        commit: bool = False,
+        **kwargs,
+    ):
+        session = session or db.session
+        previous = cls.get_or_404(_id, session)
+        previous_airports = (previous.origin_airport_id, previous.destination_airport_id)
+
+        route = super().update(_id, session, commit=False, **kwargs)
+
+        if (route.origin_airport_id, route.destination_airport_id) != previous_airports:
+            # Stored UTC schedules of the route flights follow the new airport timezones
+            from app.models.flight import Flight
+
+            Flight.resync_schedule_utc([route.id], session)
+
+        if commit:
+            session.commit()
+        else:
+            session.flush()
+        return route
@@ -0,0 +1,266 @@
+import logging
+
+from typing import Iterable, List, Optional
+from datetime import date, timedelta
+
+from sqlalchemy.orm import Session, attributes
+from sqlalchemy.dialects.postgresql import insert
+
+from app.database import SessionChanges, db
+from app.models._base_model import BaseModel
+from app.constants.models import ModelVerboseNames
+from app.models.flight_fare import FlightFare
+from app.utils.datetime import utc_now
+from app.utils.enum import CURRENCY, SEAT_CLASS
+
+logger = logging.getLogger(__name__)
+
+
+class RouteMetric(BaseModel):
+    __tablename__ = 'route_metrics'
+    __verbose_name__ = ModelVerboseNames.RouteMetric
+
+    route_id = db.Column(db.Integer, db.ForeignKey('routes.id', ondelete='CASCADE'), nullable=False, unique=True)
+    price_from = db.Column(db.Float, nullable=True)
+    currency = db.Column(db.Enum(CURRENCY), nullable=True)
+    seat_class = db.Column(db.Enum(SEAT_CLASS), nullable=True)
+    seats_left = db.Column(db.Integer, nullable=True)
+    duration_minutes = db.Column(db.Integer, nullable=True)
+    next_departure = db.Column(db.Date, nullable=True)
+    next_departure_time = db.Column(db.Time, nullable=True)
+
+    def to_dict(self, return_children=False):
+        return {
+            'price_from': self.price_from,
+            'currency': self.currency.value if self.currency else None,
+            'seat_class': self.seat_class.value if self.seat_class else None,
+            'seats_left': self.seats_left,
+            'duration_minutes': self.duration_minutes,
+            'next_departure': self.next_departure,
+            'next_departure_time': self.next_departure_time,
+        }
+
+    @staticmethod
+    def _lowest_fares(route_ids: List[int], session: Session) -> dict:
+        """Cheapest indexed flight fare per route among still bookable flights"""
+        from app.models.flight import Flight
+
+        # Search hides flights departing within 24 hours, so their fares are not offered
+        min_departure_utc = utc_now() + timedelta(hours=24)
+        rows = (
+            session.query(
+                Flight.route_id,
+                FlightFare.price,
+                FlightFare.currency,
+                FlightFare.seat_class,
+                FlightFare.seats_left,
+            )
+            .join(FlightFare, FlightFare.flight_id == Flight.id)
+            .filter(
+                Flight.route_id.in_(route_ids),
+                Flight.departure_at_utc >= min_departure_utc,
+            )
+            .distinct(Flight.route_id)
+            .order_by(Flight.route_id, FlightFare.price.asc(), Flight.departure_at_utc.asc())
+            .all()
+        )
+        return {
+            row.route_id: {
+                'price_from': row.price,
+                'currency': row.currency,
+                'seat_class': row.seat_class,
+                'seats_left': row.seats_left,
+            }
+            for row in rows
+        }
+
+    @staticmethod
+    def _compute(route_ids: List[int], session: Session) -> dict:
+        """Compute metrics for the given routes with one query per metric"""
+        from app.models.flight import Flight
+
+        metrics = {route_id: {} for route_id in route_ids}
+        today = date.today()
+
+        for route_id, values in RouteMetric._lowest_fares(route_ids, session).items():
+            metrics[route_id].update(values)
+
+        upcoming = (
+            session.query(Flight.route_id, Flight.scheduled_departure, Flight.scheduled_departure_time)
+            .filter(Flight.route_id.in_(route_ids), Flight.scheduled_departure >= today)
+            .distinct(Flight.route_id)
+            .order_by(
+                Flight.route_id,
+                Flight.scheduled_departure.asc(),
+                Flight.scheduled_departure_time.asc().nulls_first(),
+            )
+            .all()
+        )
+        for row in upcoming:
+            metrics[row.route_id].update(
+                next_departure=row.scheduled_departure,
+                next_departure_time=row.scheduled_departure_time,
+            )
+
+        durations = (
+            session.query(
+                Flight.route_id,
+                db.func.min(
+                    db.func.extract(
+                        'epoch',
+                        Flight.scheduled_arrival_at_utc - Flight.scheduled_departure_at_utc,
+                    ) / 60
+                ).label('duration_minutes'),
+            )
+            .filter(
+                Flight.route_id.in_(route_ids),
+                Flight.scheduled_arrival_at_utc > Flight.scheduled_departure_at_utc,
+            )
+            .group_by(Flight.route_id)
+            .all()
+        )
+        for row in durations:
+            metrics[row.route_id]['duration_minutes'] = int(row.duration_minutes)
+
+        return metrics
+
+    @classmethod
+    def refresh(
+        cls,
+        route_ids: Optional[Iterable[int]] = None,
+        session: Session | None = None,
+        *,
+        commit: bool = False,
+    ) -> int:
+        """Recompute and upsert metrics for the given routes, or all routes"""
+        session = session or db.session
+
+        from app.models.route import Route
+
+        if route_ids is None:
+            route_ids = [row.id for row in session.query(Route.id).all()]
+        route_ids = sorted(set(route_ids))
+        if not route_ids:
+            return 0
+
+        metrics = cls._compute(route_ids, session)
+        existing_ids = {row.id for row in session.query(Route.id).filter(Route.id.in_(route_ids)).all()}
+        rows = [
+            {
+                'route_id': route_id,
+                'price_from': values.get('price_from'),
+                'currency': values.get('currency'),
+                'seat_class': values.get('seat_class'),
+                'seats_left': values.get('seats_left'),
+                'duration_minutes': values.get('duration_minutes'),
+                'next_departure': values.get('next_departure'),
+                'next_departure_time': values.get('next_departure_time'),
+            }
+            for route_id, values in metrics.items()
+            if route_id in existing_ids
+        ]
+
+        if rows:
+            stmt = insert(cls.__table__).values(rows)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=['route_id'],
+                set_={
+                    'price_from': stmt.excluded.price_from,
+                    'currency': stmt.excluded.currency,
+                    'seat_class': stmt.excluded.seat_class,
+                    'seats_left': stmt.excluded.seats_left,
+                    'duration_minutes': stmt.excluded.duration_minutes,
+                    'next_departure': stmt.excluded.next_departure,
+                    'next_departure_time': stmt.excluded.next_departure_time,
+                    'updated_at': db.func.now(),
+                },
+            )
+            session.execute(stmt)
+
+        if commit:
+            session.commit()
+        else:
+            session.flush()
+        return len(rows)
+
+    @classmethod
+    def get_lowest_fare(cls, origin_airport_id: int, destination_airport_id: int) -> Optional[dict]:
+        """Route level lowest fare, read from the metrics row or the flight fare index"""
+        from app.models.route import Route
+
+        route = Route.query.filter_by(
+            origin_airport_id=origin_airport_id,
+            destination_airport_id=destination_airport_id,
+        ).first()
+        if route is None:
+            return None
+
+        metric = cls.query.filter_by(route_id=route.id).first()
+        if metric is not None:
+            if metric.price_from is None:
+                return None
+            return {
+                'price_from': metric.price_from,
+                'currency': metric.currency,
+                'seat_class': metric.seat_class,
+                'seats_left': metric.seats_left,
+            }
+        return cls._lowest_fares([route.id], db.session).get(route.id)
+
+    @classmethod
+    def refresh_fares(cls, route_ids: Iterable[int], session: Session | None = None) -> int:
+        """Update only the fare columns of existing route metrics from the fare index"""
+        session = session or db.session
+
+        route_ids = sorted(set(route_ids))
+        if not route_ids:
+            return 0
+
+        fares = cls._lowest_fares(route_ids, session)
+        updated = 0
+        for route_id in route_ids:
+            values = fares.get(route_id, {})
+            updated += session.execute(
+                db.update(cls.__table__)
+                .where(cls.__table__.c.route_id == route_id)
+                .values(
+                    price_from=values.get('price_from'),
+                    currency=values.get('currency'),
+                    seat_class=values.get('seat_class'),
+                    seats_left=values.get('seats_left'),
+                    updated_at=db.func.now(),
+                )
+            ).rowcount
+        return updated
+
+
+def _collect_route_metric_changes(session, instances, add):
+    from app.models.flight import Flight
+    from app.models.flight_tariff import FlightTariff
+    from app.models.tariff import Tariff
+
+    for instance in instances:
+        if isinstance(instance, Flight):
+            # Moving a flight to another route changes the metrics of both
+            add('route_ids', instance.route_id, *attributes.get_history(instance, 'route_id').deleted)
+        elif isinstance(instance, FlightTariff):
+            add('flight_ids', instance.flight_id)
+        elif isinstance(instance, Tariff) and instance not in session.new:
+            add('refresh_all', True)
+
+
+def _schedule_route_metrics_refresh(changes) -> None:
+    """Enqueue one refresh for everything collected during the transaction"""
+    from app.tasks.route import refresh_route_metrics
+
+    try:
+        if changes.get('refresh_all'):
+            refresh_route_metrics.delay()
+        else:
+            refresh_route_metrics.delay(sorted(changes.get('route_ids', ())), sorted(changes.get('flight_ids', ())))
+    except Exception:
+        # The periodic refresh catches up if the broker is unavailable
+        logger.warning('Failed to enqueue route metrics refresh', exc_info=True)
+
+
+route_metric_changes = SessionChanges('route_metrics', _collect_route_metric_changes, _schedule_route_metrics_refresh)
@@ -1,10 +1,10 @@
-from zoneinfo import ZoneInfo
 from typing import List, TYPE_CHECKING
 from sqlalchemy.orm import Session, Mapped
 
 from app.database import db
 from app.models._base_model import BaseModel
 from app.constants.models import ModelVerboseNames
+from app.utils.datetime import get_zoneinfo
 from app.utils.xlsx import parse_upload_xlsx_template, get_upload_xlsx_template, get_upload_xlsx_report
 
 if TYPE_CHECKING:
@@ -32,7 +32,7 @@ class Timezone(BaseModel):
     upload_required_fields = ['name']
 
     def get_tz(self):
-        return ZoneInfo(self.name)
+        return get_zoneinfo(self.name)
 
     @classmethod
     def get_all(cls):
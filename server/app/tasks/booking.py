@@ -6,69 +6,89 @@ from app.database import db
 from app.models.booking import Booking
 from app.models.booking_hold import BookingHold
 from app.utils.enum import BOOKING_STATUS
+from app.utils.task_lock import singleton_task
 
 
-@celery.task
-def set_expired_bookings():
-    now = datetime.now()
-    session = db.session
-
+def _expire_batch(session, now: datetime, limit: int) -> int:
+    """Expire one batch of held bookings past their deadline, skipping rows locked by checkout"""
     expired = (
         Booking.query.join(BookingHold)
         .filter(
             BookingHold.expires_at < now,
             Booking.status.notin_(Booking.FINAL_STATUSES),
         )
-        .with_for_update()
+        .order_by(BookingHold.expires_at)
+        .limit(limit)
+        .with_for_update(of=Booking, skip_locked=True)
         .all()
     )
 
-    # Delete BookingHold for bookings in terminal statuses (completed, cancelled),
-    # excluding expired to preserve expires_at for deletion tracking
+    # Transition bookings to expired status without deleting BookingHold
+    for booking in expired:
+        Booking.transition_status(
+            booking.id,
+            BOOKING_STATUS.expired,
+            session=session,
+            commit=False
+        )
+    return len(expired)
+
+
+def _release_terminal_holds_batch(session, limit: int) -> int:
+    """Delete one batch of BookingHold rows of completed and cancelled bookings"""
+    # Expired bookings keep their hold to preserve expires_at for deletion tracking
     terminal_bookings = (
         Booking.query
-        .outerjoin(BookingHold)
+        .join(BookingHold)
         .filter(
             Booking.status.in_(
                 Booking.FINAL_STATUSES - {BOOKING_STATUS.expired}
             ),
-            BookingHold.id.isnot(None)
         )
-        .with_for_update()
+        .limit(limit)
+        .with_for_update(of=Booking, skip_locked=True)
         .all()
     )
 
-    if not expired and not terminal_bookings:
-        return 0
+    for booking in terminal_bookings:
+        BookingHold.delete_by_booking_id(
+            booking.id,
+            session=session,
+            commit=False
+        )
+    return len(terminal_bookings)
 
-    expired_count = len(expired)
-    try:
-        # Transition bookings to expired status without deleting BookingHold
-        for booking in expired:
-            Booking.transition_status(
-                booking.id,
-                BOOKING_STATUS.expired,
-                session=session,
-                commit=False
-            )
 
-        # Delete BookingHold for terminal status bookings
-        for booking in terminal_bookings:
-            BookingHold.delete_by_booking_id(
-                booking.id,
-                session=session,
-                commit=False
-            )
+def _run_in_batches(session, process_batch, limit: int) -> int:
+    """Commit after every batch until a batch comes back short"""
+    total = 0
+    while True:
+        try:
+            count = process_batch(limit)
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        total += count
+        if count < limit:
+            return total
 
-        session.commit()
-    except Exception:
-        session.rollback()
-        raise
+
+@celery.task(acks_late=True, soft_time_limit=45, time_limit=55)
+@singleton_task(dedupe_seconds=30)
+def set_expired_bookings():
+    now = datetime.now()
+    session = db.session
+    limit = Config.BOOKING_EXPIRY_BATCH_SIZE
+
+    expired_count = _run_in_batches(session, lambda size: _expire_batch(session, now, size), limit)
+    _run_in_batches(session, lambda size: _release_terminal_holds_batch(session, size), limit)
 
     return expired_count
 
 
-@celery.task
+@celery.task(acks_late=True, soft_time_limit=600, time_limit=660)
+@singleton_task(dedupe_seconds=3600)
 def delete_expired_bookings():
     expiration_threshold = datetime.now() - timedelta(days=Config.BOOKING_EXP_DELETION_DAYS)
     expired_bookings = (
@@ -0,0 +1,56 @@
+import logging
+from pathlib import Path
+from typing import Optional
+
+from app.celery_app import celery
+from app.database import db
+from app.models.carousel_slide import CarouselSlide
+from app.utils.image import render_variants
+from app.utils.storage import ImageManager
+from app.utils.task_lock import singleton_task
+
+logger = logging.getLogger(__name__)
+
+
+@celery.task(acks_late=True, soft_time_limit=600, time_limit=660)
+@singleton_task(dedupe_seconds=1800)
+def generate_carousel_image_variants(slide_id: Optional[int] = None) -> int:
+    """Render responsive variants for one slide, or for every slide still missing them"""
+    session = db.session
+    image_manager = ImageManager()
+
+    query = session.query(CarouselSlide).filter(CarouselSlide.image_filename.isnot(None))
+    if slide_id is not None:
+        query = query.filter(CarouselSlide.id == slide_id)
+    else:
+        query = query.filter(CarouselSlide.image_variants.is_(None))
+
+    processed = 0
+    for slide in query.all():
+        filename = slide.image_filename
+        digest = Path(filename).stem
+
+        try:
+            with image_manager.open_file(filename, subfolder_name='carousel') as source:
+                variants = render_variants(source, digest)
+        except (ValueError, OSError):
+            logger.warning('Failed to render carousel image variants', extra={'slide_id': slide.id}, exc_info=True)
+            continue
+
+        for variant in variants:
+            # Names derive from the original content, an existing variant is already correct
+            if not image_manager.file_exists(variant['filename'], subfolder_name='carousel'):
+                image_manager.save_file(variant['content'], variant['filename'], subfolder_name='carousel')
+
+        # Another upload may have replaced the image while it was being rendered
+        session.query(CarouselSlide).filter(
+            CarouselSlide.id == slide.id,
+            CarouselSlide.image_filename == filename,
+        ).update(
+            {'image_variants': [{key: value for key, value in variant.items() if key != 'content'} for variant in variants]},
+            synchronize_session=False,
+        )
+        processed += 1
+
+    session.commit()
+    return processed
@@ -0,0 +1,48 @@
+from datetime import datetime, timedelta
+
+from app.celery_app import celery
+from app.config import Config
+from app.models.payment_webhook_event import PaymentWebhookEvent
+from app.utils.enum import WEBHOOK_EVENT_STATUS
+from app.utils.task_lock import singleton_task
+from app.utils.yookassa import process_yookassa_webhook_events
+
+
+# Acked on receipt, a redelivered event could send its notification emails twice
+@celery.task(bind=True, max_retries=Config.WEBHOOK_EVENT_MAX_RETRIES, soft_time_limit=60, time_limit=90)
+def process_yookassa_webhook_event(self, event_id: int):
+    try:
+        processed = process_yookassa_webhook_events(event_id)
+    except Exception as exc:
+        countdown = Config.WEBHOOK_EVENT_RETRY_BACKOFF_SECONDS * 2 ** self.request.retries
+        raise self.retry(exc=exc, countdown=countdown)
+
+    if processed is None:
+        # Another worker is applying earlier events of the same booking
+        raise self.retry(countdown=Config.WEBHOOK_EVENT_RETRY_BACKOFF_SECONDS)
+
+    return processed
+
+
+@celery.task(acks_late=True, soft_time_limit=60, time_limit=90)
+@singleton_task(dedupe_seconds=150)
+def requeue_pending_webhook_events():
+    """Re-enqueue notifications that were stored but never picked up"""
+    stale_before = datetime.now() - timedelta(minutes=Config.WEBHOOK_EVENT_STALE_MINUTES)
+    events = (
+        PaymentWebhookEvent.query
+        .filter(
+            PaymentWebhookEvent.status.in_([
+                WEBHOOK_EVENT_STATUS.pending,
+                WEBHOOK_EVENT_STATUS.processing,
+            ]),
+            PaymentWebhookEvent.updated_at < stale_before,
+        )
+        .order_by(PaymentWebhookEvent.id.asc())
+        .all()
+    )
+
+    for event in events:
+        process_yookassa_webhook_event.delay(event.id)
+
+    return len(events)
@@ -0,0 +1,67 @@
+from typing import List, Optional
+
+from sqlalchemy import select
+
+from app.celery_app import celery
+from app.database import db
+from app.models.flight import Flight
+from app.models.flight_fare import FlightFare
+from app.models.route_metric import RouteMetric
+from app.utils.task_lock import singleton_task
+
+
+@celery.task(acks_late=True)
+@singleton_task(dedupe_seconds=450)
+def refresh_route_metrics(route_ids: Optional[List[int]] = None, flight_ids: Optional[List[int]] = None) -> int:
+    """Recompute carousel route metrics for changed routes, or for all routes"""
+    session = db.session
+
+    if route_ids is not None or flight_ids is not None:
+        route_ids = set(route_ids or [])
+        if flight_ids:
+            rows = session.query(Flight.route_id).filter(Flight.id.in_(flight_ids)).distinct().all()
+            route_ids.update(row.route_id for row in rows)
+        if not route_ids:
+            return 0
+
+    try:
+        if route_ids is None:
+            # Full runs also release seats of holds that lapsed since the last booking change
+            FlightFare.refresh(session=session)
+        return RouteMetric.refresh(route_ids, session=session, commit=True)
+    except Exception:
+        session.rollback()
+        raise
+
+
+@celery.task(acks_late=True)
+def refresh_flight_fares(
+    flight_ids: Optional[List[int]] = None,
+    flight_tariff_ids: Optional[List[int]] = None,
+    tariff_ids: Optional[List[int]] = None,
+    booking_ids: Optional[List[int]] = None,
+    route_ids: Optional[List[int]] = None,
+) -> int:
+    """Rebuild the fare index of flights touched by a commit and the fare columns of their routes"""
+    session = db.session
+
+    try:
+        flight_ids = FlightFare.resolve_flight_ids(
+            session,
+            flight_ids=flight_ids or (),
+            flight_tariff_ids=flight_tariff_ids or (),
+            tariff_ids=tariff_ids or (),
+            booking_ids=booking_ids or (),
+        )
+        route_ids = set(route_ids or ())
+        refreshed = 0
+        if flight_ids:
+            refreshed = FlightFare.refresh(flight_ids, session)
+            rows = session.execute(select(Flight.route_id).where(Flight.id.in_(flight_ids)).distinct())
+            route_ids.update(rows.scalars())
+        RouteMetric.refresh_fares(route_ids, session)
+        session.commit()
+        return refreshed
+    except Exception:
+        session.rollback()
+        raise
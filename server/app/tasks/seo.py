@@ -5,9 +5,11 @@ from typing import Iterable, Mapping
 from app.celery_app import celery
 from app.config import Config
 from app.models._base_model import NotFoundError
+from app.utils.compression import ENCODINGS, ENCODING_SUFFIXES, compress, supported_encodings
 from app.utils.seo import prerender_filename, render_schedule
 from app.utils.search import upcoming_routes
 from app.utils.storage import SEOManager
+from app.utils.task_lock import singleton_task
 
 
 def _write_index(seo_manager: SEOManager, payload: Iterable[Mapping[str, object]]) -> None:
@@ -16,7 +18,23 @@ def _write_index(seo_manager: SEOManager, payload: Iterable[Mapping[str, object]
     seo_manager.save_file(index_content, 'index.json', 'prerender')
 
 
-@celery.task
+def _write_precompressed(seo_manager: SEOManager, html: str, filename: str) -> list[str]:
+    """Write .br and .gz siblings so the page is served without runtime compression"""
+    data = html.encode('utf-8')
+    encodings = supported_encodings()
+    for encoding in ENCODINGS:
+        sibling = f'{filename}{ENCODING_SUFFIXES[encoding]}'
+        if encoding not in encodings:
+            # A sibling left by an older run would be served instead of the new page
+            seo_manager.delete_file(sibling, 'prerender')
+            continue
+        level = Config.SEO_PRERENDER_COMPRESSION_LEVELS[encoding]
+        seo_manager.save_file(compress(data, encoding, level), sibling, 'prerender')
+    return encodings
+
+
+@celery.task(acks_late=True, soft_time_limit=1800, time_limit=1860)
+@singleton_task(dedupe_seconds=3600)
 def generate_seo_prerender() -> int:
     """Generate prerendered schedule pages for popular routes"""
 
@@ -43,6 +61,7 @@ def generate_seo_prerender() -> int:
             filename,
             'prerender'
         )
+        encodings = _write_precompressed(seo_manager, rendered['html'], filename)
 
         generated_records.append(
             {
@@ -52,6 +71,7 @@ def generate_seo_prerender() -> int:
                 'generated_at': generated_at,
                 'filename': filename,
                 'path': relative_path,
+                'encodings': encodings,
             }
         )
         total += 1
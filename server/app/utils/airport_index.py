@@ -0,0 +1,208 @@
+import logging
+import threading
+import time
+
+from collections import defaultdict
+from typing import Any, Iterable, Optional
+
+from sqlalchemy import or_
+from sqlalchemy.orm import Session, joinedload
+
+from app.config import Config
+from app.database import SessionChanges, db
+from app.utils import cache
+
+logger = logging.getLogger(__name__)
+
+VERSION_KEY = 'airports:suggest'
+MAX_PREFIX_LENGTH = 12
+
+# Lower rank wins: exact codes first, then code, city and name prefixes, then fuzzy matches
+RANK_EXACT_CODE = 0
+RANK_CODE_PREFIX = 1
+RANK_CITY_PREFIX = 2
+RANK_NAME_PREFIX = 3
+RANK_COUNTRY_PREFIX = 4
+RANK_TRIGRAM = 5
+
+
+def _normalize(value: Optional[str]) -> str:
+    return (value or '').strip().lower().replace('ё', 'е')
+
+
+def _tokens(value: Optional[str]) -> list[str]:
+    return [token for token in _normalize(value).replace('-', ' ').split() if token]
+
+
+def _trigrams(value: str) -> set[str]:
+    padded = f'  {value} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class AirportSuggestIndex:
+    """Immutable in-memory prefix and trigram index over airports that have routes"""
+
+    def __init__(self, entries: Iterable[dict[str, Any]], version: int = 0):
+        self.version = version
+        self.entries: dict[int, dict[str, Any]] = {}
+        self.codes: dict[str, int] = {}
+        self.prefixes: dict[str, dict[int, int]] = defaultdict(dict)
+        self.trigrams: dict[str, set[int]] = defaultdict(set)
+        self.sort_keys: dict[int, str] = {}
+
+        for entry in entries:
+            self._add(entry)
+
+        self.ordered_ids = sorted(self.entries, key=self.sort_keys.__getitem__)
+
+    def _add_prefixes(self, airport_id: int, values: Iterable[Optional[str]], rank: int) -> None:
+        for value in values:
+            for token in _tokens(value):
+                for length in range(1, min(len(token), MAX_PREFIX_LENGTH) + 1):
+                    ranks = self.prefixes[token[:length]]
+                    if rank < ranks.get(airport_id, RANK_TRIGRAM):
+                        ranks[airport_id] = rank
+
+    def _add(self, entry: dict[str, Any]) -> None:
+        airport_id = entry['id']
+        country = entry.get('country') or {}
+        self.entries[airport_id] = entry
+        self.sort_keys[airport_id] = _normalize(entry.get('name'))
+
+        for code in (entry.get('iata_code'), entry.get('icao_code'), entry.get('city_code')):
+            if code:
+                self.codes.setdefault(_normalize(code), airport_id)
+
+        self._add_prefixes(airport_id, (entry.get('iata_code'), entry.get('icao_code'), entry.get('city_code')), RANK_CODE_PREFIX)
+        self._add_prefixes(airport_id, (entry.get('city_name'), entry.get('city_name_en')), RANK_CITY_PREFIX)
+        self._add_prefixes(airport_id, (entry.get('name'),), RANK_NAME_PREFIX)
+        self._add_prefixes(airport_id, (country.get('name'), country.get('name_en')), RANK_COUNTRY_PREFIX)
+
+        for value in (entry.get('name'), entry.get('city_name'), entry.get('city_name_en'), country.get('name')):
+            normalized = _normalize(value)
+            if normalized:
+                for trigram in _trigrams(normalized):
+                    self.trigrams[trigram].add(airport_id)
+
+    def suggest(self, query: str, limit: int) -> list[dict[str, Any]]:
+        normalized = _normalize(query)
+        if not normalized:
+            return [self.entries[airport_id] for airport_id in self.ordered_ids[:limit]]
+
+        scores: dict[int, tuple[int, float]] = {}
+
+        exact = self.codes.get(normalized)
+        if exact is not None:
+            scores[exact] = (RANK_EXACT_CODE, 0.0)
+
+        # Every query token must prefix-match some field of the airport
+        matched: Optional[dict[int, int]] = None
+        for token in _tokens(normalized):
+            ranks = self.prefixes.get(token[:MAX_PREFIX_LENGTH], {})
+            if matched is None:
+                matched = dict(ranks)
+            else:
+                matched = {
+                    airport_id: max(rank, ranks[airport_id])
+                    for airport_id, rank in matched.items()
+                    if airport_id in ranks
+                }
+        for airport_id, rank in (matched or {}).items():
+            scores.setdefault(airport_id, (rank, 0.0))
+
+        if len(scores) < limit and len(normalized) >= 3:
+            query_trigrams = _trigrams(normalized)
+            counts: dict[int, int] = defaultdict(int)
+            for trigram in query_trigrams:
+                for airport_id in self.trigrams.get(trigram, ()):
+                    counts[airport_id] += 1
+            for airport_id, count in counts.items():
+                similarity = count / len(query_trigrams)
+                if similarity >= 0.5 and airport_id not in scores:
+                    scores[airport_id] = (RANK_TRIGRAM, -similarity)
+
+        ranked = sorted(scores, key=lambda airport_id: (*scores[airport_id], self.sort_keys[airport_id]))
+        return [self.entries[airport_id] for airport_id in ranked[:limit]]
+
+
+def load_airport_entries(session: Session | None = None) -> list[dict[str, Any]]:
+    """Load serialized airports that appear in at least one route"""
+    session = session or db.session
+
+    from app.models.airport import Airport
+    from app.models.route import Route
+
+    airports = (
+        session.query(Airport)
+        .options(joinedload(Airport.country))
+        .join(
+            Route,
+            or_(
+                Airport.id == Route.origin_airport_id,
+                Airport.id == Route.destination_airport_id,
+            ),
+        )
+        .distinct()
+        .all()
+    )
+    return [
+        {
+            **airport.to_dict(),
+            'country': airport.country.to_dict() if airport.country else {},
+        }
+        for airport in airports
+    ]
+
+
+_index: Optional[AirportSuggestIndex] = None
+_checked_at = 0.0
+# Set by local writes, the shared version does not move when Redis is unavailable
+_stale = False
+_lock = threading.Lock()
+
+
+def get_airport_index() -> AirportSuggestIndex:
+    """Return the process-local index, rebuilding it when the shared version moves"""
+    global _index, _checked_at, _stale
+
+    # Readers only ever see a complete index, the old one until the new one is assigned
+    index = _index
+    now = time.monotonic()
+    if index is not None and now - _checked_at < Config.AIRPORT_INDEX_VERSION_CHECK_SECONDS:
+        return index
+
+    with _lock:
+        index = _index
+        if index is not None and now - _checked_at < Config.AIRPORT_INDEX_VERSION_CHECK_SECONDS:
+            return index
+
+        version = cache.get_version(VERSION_KEY)
+        if index is None or _stale or index.version != version:
+            _stale = False
+            index = AirportSuggestIndex(load_airport_entries(), version)
+            logger.info('Airport suggest index rebuilt: %s airports, version %s', len(index.entries), version)
+            _index = index
+        _checked_at = now
+
+    return index
+
+
+def invalidate_airport_index() -> None:
+    """Force every process to rebuild its index on the next version check"""
+    global _checked_at, _stale
+
+    cache.bump_version(VERSION_KEY)
+    _stale = True
+    _checked_at = 0.0
+
+
+def _collect_airport_changes(session, instances, add):
+    from app.models.airport import Airport
+    from app.models.country import Country
+    from app.models.route import Route
+
+    if any(isinstance(instance, (Airport, Route, Country)) for instance in instances):
+        add('dirty', True)
+
+
+airport_index_changes = SessionChanges('airport_index', _collect_airport_changes, lambda changes: invalidate_airport_index())
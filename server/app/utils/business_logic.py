@@ -2,6 +2,7 @@ from datetime import datetime
 from sqlalchemy.orm import joinedload
 
 from app.utils.enum import (
+    PASSENGER_CATEGORY,
     PASSENGER_PLURAL_CATEGORY,
     FEE_APPLICATION,
     CONSENT_ACTION,
@@ -11,7 +12,7 @@ from app.utils.passenger_categories import (
     PASSENGER_WITH_SEAT_CATEGORIES,
     get_category_discount_multiplier,
 )
-from app.utils.datetime import combine_date_time
+from app.utils.datetime import combine_date_time, local_to_utc, utc_now
 from app.models.flight_tariff import FlightTariff
 from app.models.fee import Fee
 from app.models.airline import Airline
@@ -31,6 +32,16 @@ def get_seats_number(params):
     )
 
 
+def get_passenger_counts(params):
+    counts = {
+        cat: int(params.get(BookingPassenger.get_plural_category(cat).value, 0))
+        for cat in PASSENGER_CATEGORY
+    }
+    if not any(counts.values()):
+        counts[PASSENGER_CATEGORY.adult] = 1
+    return {cat: count for cat, count in counts.items() if count > 0}
+
+
 def __get_passenger_full_name(last_name, first_name, patronymic_name) -> str:
     return ' '.join(
         filter(
@@ -677,12 +688,16 @@ def calculate_refund_details(booking, ticket):
     route = flight.route
     is_round_trip = booking.booking_flights.count() > 1
 
-    departure_dt = combine_date_time(
-        flight.scheduled_departure,
-        flight.scheduled_departure_time,
-    )
+    # Compared in UTC so the window follows the origin airport's timezone
+    departure_dt = flight.scheduled_departure_at_utc
+    timestamp = local_to_utc(bfp.refund_request_at) if bfp.refund_request_at else utc_now()
 
-    timestamp = bfp.refund_request_at or datetime.now()
+    if departure_dt is None:
+        departure_dt = combine_date_time(
+            flight.scheduled_departure,
+            flight.scheduled_departure_time,
+        )
+        timestamp = bfp.refund_request_at or datetime.now()
 
     hours_before_departure = (
         (departure_dt - timestamp).total_seconds() / 3600.0
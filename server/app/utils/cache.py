@@ -0,0 +1,78 @@
+import logging
+import threading
+
+from typing import Any, Optional
+
+from redis import Redis
+from redis.exceptions import RedisError
+
+from app.config import Config
+from app.utils.json_provider import dumps_bytes, loads
+
+logger = logging.getLogger(__name__)
+
+_client: Optional[Redis] = None
+_client_lock = threading.Lock()
+
+
+def get_redis() -> Optional[Redis]:
+    """Return a shared Redis client for application caches, or None if not configured"""
+    global _client
+
+    if _client is None:
+        redis_url = Config.CACHE_REDIS_URL or Config.LIMITER_STORAGE_URI
+        if not redis_url:
+            return None
+        with _client_lock:
+            if _client is None:
+                _client = Redis.from_url(
+                    redis_url,
+                    socket_timeout=0.5,
+                    socket_connect_timeout=0.5,
+                )
+    return _client
+
+
+def get_version(key: str) -> int:
+    """Return the current version of a cache namespace, 0 when unknown"""
+    client = get_redis()
+    if client is None:
+        return 0
+    try:
+        return int(client.get(f'version:{key}') or 0)
+    except RedisError:
+        logger.warning('Failed to read cache version %s', key, exc_info=True)
+        return 0
+
+
+def bump_version(key: str) -> None:
+    """Invalidate every cache entry built for an older version of the namespace"""
+    client = get_redis()
+    if client is None:
+        return
+    try:
+        client.incr(f'version:{key}')
+    except RedisError:
+        logger.warning('Failed to bump cache version %s', key, exc_info=True)
+
+
+def get_json(key: str) -> Optional[Any]:
+    client = get_redis()
+    if client is None:
+        return None
+    try:
+        raw = client.get(key)
+    except RedisError:
+        logger.warning('Failed to read cache key %s', key, exc_info=True)
+        return None
+    return loads(raw) if raw is not None else None
+
+
+def set_json(key: str, value: Any, ttl_seconds: int) -> None:
+    client = get_redis()
+    if client is None:
+        return
+    try:
+        client.set(key, dumps_bytes(value), ex=ttl_seconds)
+    except RedisError:
+        logger.warning('Failed to write cache key %s', key, exc_info=True)
@@ -0,0 +1,49 @@
+import gzip
+
+from functools import lru_cache
+from typing import List, Optional
+
+from app.config import Config
+
+
+# Server preference when the client accepts several encodings with the same quality
+ENCODINGS = ('br', 'gzip')
+ENCODING_SUFFIXES = {'br': '.br', 'gzip': '.gz'}
+
+
+@lru_cache(maxsize=None)
+def _brotli():
+    """Brotli bindings, None when the extension is not installed"""
+    try:
+        import brotli
+    except ImportError:
+        return None
+    return brotli
+
+
+def supported_encodings() -> List[str]:
+    """Encodings this process can produce"""
+    return [encoding for encoding in ENCODINGS if encoding != 'br' or _brotli() is not None]
+
+
+def accepted_encodings(accept, available: Optional[List[str]] = None) -> List[str]:
+    """Available encodings allowed by an Accept-Encoding header, best first"""
+    available = supported_encodings() if available is None else available
+    ranked = [
+        (accept.quality(encoding), -index, encoding)
+        for index, encoding in enumerate(available)
+    ]
+    return [encoding for quality, _, encoding in sorted(ranked, reverse=True) if quality > 0]
+
+
+def compress(data: bytes, encoding: str, level: Optional[int] = None) -> bytes:
+    """Encode data with gzip or brotli at the configured or given level"""
+    if encoding == 'br':
+        brotli = _brotli()
+        if brotli is None:
+            raise ValueError(f'Unsupported content encoding: {encoding}')
+        return brotli.compress(data, quality=Config.COMPRESSION_LEVELS['br'] if level is None else level)
+    if encoding == 'gzip':
+        # A fixed mtime keeps the output identical for identical input
+        return gzip.compress(data, compresslevel=Config.COMPRESSION_LEVELS['gzip'] if level is None else level, mtime=0)
+    raise ValueError(f'Unsupported content encoding: {encoding}')
@@ -1,5 +1,7 @@
-from datetime import datetime, date, time
+from datetime import datetime, date, time, timezone
+from functools import lru_cache
 from numbers import Number
+from zoneinfo import ZoneInfo
 
 from app.constants.messages import DateTimeMessages
 
@@ -105,6 +107,31 @@ def combine_date_time(date_value, time_value=None) -> datetime | None:
     return datetime.combine(date_value, time_value or time())
 
 
+@lru_cache(maxsize=None)
+def get_zoneinfo(name: str | None) -> ZoneInfo | None:
+    """Return a process-wide cached ZoneInfo for an IANA timezone name"""
+    return ZoneInfo(name) if name else None
+
+
+def to_utc(value: datetime | None, tz: ZoneInfo | None = None) -> datetime | None:
+    """Convert a naive local datetime to naive UTC, None when the timezone is unknown"""
+    if value is None or tz is None:
+        return None
+    return value.replace(tzinfo=tz).astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def utc_now() -> datetime:
+    """Return the current time as naive UTC, matching the stored *_utc columns"""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def local_to_utc(value: datetime | None) -> datetime | None:
+    """Convert a naive datetime in the server's local time to naive UTC"""
+    if value is None:
+        return None
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
 def format_date(value, fmt: str = WRITE_DATE_FORMAT) -> str:
     d = parse_date_formats(value)
     return d.strftime(fmt) if d else ''
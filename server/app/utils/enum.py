@@ -87,6 +87,13 @@ class PAYMENT_TYPE(enum.Enum):
     refund = 'refund'
 
 
+class WEBHOOK_EVENT_STATUS(enum.Enum):
+    pending = 'pending'
+    processing = 'processing'
+    processed = 'processed'
+    failed = 'failed'
+
+
 class FEE_APPLICATION(enum.Enum):
     service_fee = 'service_fee'
     ticket_refund = 'ticket_refund'
@@ -123,6 +130,7 @@ DEFAULT_BOOKING_FLIGHT_PASSENGER_STATUS = BOOKING_FLIGHT_PASSENGER_STATUS.create
 DEFAULT_CURRENCY = CURRENCY.rub
 DEFAULT_PAYMENT_STATUS = PAYMENT_STATUS.pending
 DEFAULT_PAYMENT_TYPE = PAYMENT_TYPE.payment
+DEFAULT_WEBHOOK_EVENT_STATUS = WEBHOOK_EVENT_STATUS.pending
 DEFAULT_FEE_APPLICATION = FEE_APPLICATION.service_fee
 DEFAULT_FEE_TERM = FEE_TERM.none
 
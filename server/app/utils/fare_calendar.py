@@ -0,0 +1,136 @@
+from datetime import date, datetime, timedelta
+from typing import Any
+
+from sqlalchemy import and_
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import func
+
+from app.config import Config
+from app.constants.messages import SearchMessages
+from app.database import SessionChanges, db
+from app.models.flight import Flight
+from app.models.flight_tariff import FlightTariff
+from app.models.route import Route
+from app.models.tariff import Tariff
+from app.utils import cache
+from app.utils.datetime import utc_now
+from app.utils.search import get_route_airports, taken_seats_query
+
+VERSION_KEY = 'fare_calendar'
+
+
+def parse_month(value: str | None) -> date:
+    """Return the first day of a YYYY-MM month"""
+    try:
+        return datetime.strptime(value or '', '%Y-%m').date()
+    except ValueError:
+        raise ValueError(SearchMessages.INVALID_MONTH)
+
+
+def compute_fare_calendar(
+    route_id: int,
+    month_start: date,
+    seat_class: str | None = None,
+    seats_number: int = 0,
+    session: Session | None = None,
+) -> list[dict[str, Any]]:
+    """Min price and seats left per departure date with one grouped query"""
+    session = session or db.session
+    month_end = (month_start + timedelta(days=32)).replace(day=1)
+    in_month = and_(
+        Flight.route_id == route_id,
+        Flight.scheduled_departure >= month_start,
+        Flight.scheduled_departure < month_end,
+    )
+
+    # Same occupancy rule as get_flight_seat_availability, for the whole month at once
+    taken = (
+        taken_seats_query(session, in_month)
+        .join(Flight, Flight.id == FlightTariff.flight_id)
+        .subquery()
+    )
+
+    available = func.greatest(FlightTariff.seats_number - func.coalesce(taken.c.taken, 0), 0)
+    tariffs = (
+        session.query(
+            Flight.scheduled_departure.label('departure'),
+            Tariff.price.label('price'),
+            Tariff.currency.label('currency'),
+            available.label('available'),
+        )
+        .join(FlightTariff, FlightTariff.flight_id == Flight.id)
+        .join(Tariff, Tariff.id == FlightTariff.tariff_id)
+        .outerjoin(taken, taken.c.flight_tariff_id == FlightTariff.id)
+        .filter(
+            in_month,
+            # Exclude flights departing within 24 hours
+            Flight.departure_at_utc >= utc_now() + timedelta(hours=24),
+            Tariff.price.isnot(None),
+        )
+    )
+    if seat_class:
+        tariffs = tariffs.filter(Tariff.seat_class == seat_class)
+    tariffs = tariffs.subquery()
+
+    bookable = tariffs.c.available >= max(seats_number, 1)
+    rows = (
+        session.query(
+            tariffs.c.departure,
+            func.min(tariffs.c.price).filter(bookable).label('min_price'),
+            func.min(tariffs.c.currency).label('currency'),
+            func.sum(tariffs.c.available).label('seats_left'),
+        )
+        .group_by(tariffs.c.departure)
+        .order_by(tariffs.c.departure)
+        .all()
+    )
+
+    return [
+        {
+            'date': row.departure.isoformat(),
+            'min_price': row.min_price,
+            'currency': row.currency.value if row.currency else None,
+            'seats_left': int(row.seats_left or 0),
+            'available': row.min_price is not None,
+        }
+        for row in rows
+    ]
+
+
+def get_fare_calendar(
+    origin_code: str | None,
+    dest_code: str | None,
+    month: str | None,
+    seat_class: str | None = None,
+    seats_number: int = 0,
+) -> list[dict[str, Any]]:
+    """Return the fare calendar for a route and month, cached per route/month"""
+    month_start = parse_month(month)
+    origin, dest = get_route_airports(origin_code, dest_code)
+
+    route = Route.query.filter(
+        Route.origin_airport_id == origin.id,
+        Route.destination_airport_id == dest.id,
+    ).one_or_none()
+    if route is None:
+        return []
+
+    version = cache.get_version(VERSION_KEY)
+    key = (
+        f'{VERSION_KEY}:{version}:{route.id}:{month_start:%Y-%m}:'
+        f'{seat_class or "any"}:{seats_number}'
+    )
+    days = cache.get_json(key)
+    if days is None:
+        days = compute_fare_calendar(route.id, month_start, seat_class, seats_number)
+        cache.set_json(key, days, Config.FARE_CALENDAR_CACHE_SECONDS)
+    return days
+
+
+def _collect_fare_changes(session, instances, add):
+    # Schedule and fare edits are rare, bookings only age out with the TTL
+    if any(isinstance(instance, (Flight, FlightTariff, Tariff)) for instance in instances):
+        add('dirty', True)
+
+
+fare_calendar_changes = SessionChanges('fare_calendar', _collect_fare_changes, lambda changes: cache.bump_version(VERSION_KEY))
@@ -0,0 +1,68 @@
+import hashlib
+
+from io import BytesIO
+from typing import BinaryIO, Callable, Dict, Iterable, List
+
+from app.config import Config
+
+
+DIGEST_CHUNK_SIZE = 64 * 1024
+
+
+def content_digest(stream: BinaryIO) -> str:
+    """Hash of the stream content used as its storage name, the stream is rewound afterwards"""
+    digest = hashlib.sha256()
+    for chunk in iter(lambda: stream.read(DIGEST_CHUNK_SIZE), b''):
+        digest.update(chunk)
+    stream.seek(0)
+    return digest.hexdigest()[:32]
+
+
+def variant_filename(digest: str, width: int, image_format: str) -> str:
+    return f'{digest}-{width}w.{image_format}'
+
+
+def supported_formats(formats: Iterable[str]) -> List[str]:
+    """Requested formats the installed Pillow can encode"""
+    from PIL import Image
+
+    Image.init()
+    return [image_format for image_format in formats if image_format.upper() in Image.SAVE]
+
+
+def render_variants(source: BinaryIO, digest: str) -> List[Dict]:
+    """Resize the source to the configured widths and encode every width in every supported format"""
+    from PIL import Image, ImageOps
+
+    with Image.open(source) as original:
+        image = ImageOps.exif_transpose(original)
+        image = image.convert('RGBA' if image.mode in ('RGBA', 'LA', 'P') else 'RGB')
+
+    widths = sorted({min(width, image.width) for width in Config.IMAGE_VARIANT_WIDTHS})
+    formats = supported_formats(Config.IMAGE_VARIANT_FORMATS)
+
+    variants = []
+    for width in widths:
+        height = max(round(image.height * width / image.width), 1)
+        resized = image if width == image.width else image.resize((width, height), Image.LANCZOS)
+        for image_format in formats:
+            buffer = BytesIO()
+            resized.save(buffer, format=image_format.upper(), quality=Config.IMAGE_VARIANT_QUALITY)
+            buffer.seek(0)
+            variants.append({
+                'filename': variant_filename(digest, width, image_format),
+                'width': width,
+                'height': height,
+                'format': image_format,
+                'content': buffer,
+            })
+    return variants
+
+
+def build_srcset(variants: Iterable[Dict], url_for: Callable[[str], str]) -> Dict[str, str]:
+    """srcset attribute per format, ready for the sources of a picture element"""
+    srcset = {}
+    for variant in sorted(variants, key=lambda item: item['width']):
+        entry = f"{url_for(variant['filename'])} {variant['width']}w"
+        srcset[variant['format']] = f"{srcset[variant['format']]}, {entry}" if variant['format'] in srcset else entry
+    return srcset
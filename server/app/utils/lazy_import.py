@@ -0,0 +1,60 @@
+import importlib
+import threading
+
+
+class LazyView:
+    """View function stand-in that imports its controller module on the first call"""
+
+    def __init__(self, module_name: str, function_name: str):
+        self.__module__ = module_name
+        self.__name__ = function_name
+        self.__qualname__ = function_name
+        self._function = None
+        self._lock = threading.Lock()
+
+    def resolve(self):
+        if self._function is None:
+            with self._lock:
+                if self._function is None:
+                    module = importlib.import_module(self.__module__)
+                    self._function = getattr(module, self.__name__)
+        return self._function
+
+    def __call__(self, *args, **kwargs):
+        return self.resolve()(*args, **kwargs)
+
+    def __repr__(self):
+        return f'<LazyView {self.__module__}.{self.__name__}>'
+
+
+class LazyModule:
+    """Attribute access yields LazyView objects, so route tables read like plain imports"""
+
+    def __init__(self, module_name: str):
+        self._module_name = module_name
+        self._views = {}
+
+    def __getattr__(self, function_name: str) -> LazyView:
+        if function_name.startswith('_'):
+            raise AttributeError(function_name)
+        view = self._views.get(function_name)
+        if view is None:
+            view = self._views[function_name] = LazyView(self._module_name, function_name)
+        return view
+
+
+def resolve_lazy_views(app) -> None:
+    """Import every lazily registered view, so a misspelled controller fails at startup"""
+    errors = []
+    for endpoint, view in app.view_functions.items():
+        while not isinstance(view, LazyView) and hasattr(view, '__wrapped__'):
+            view = view.__wrapped__
+        if not isinstance(view, LazyView):
+            continue
+        try:
+            view.resolve()
+        except (ImportError, AttributeError) as e:
+            errors.append(f'{endpoint}: {view!r} ({e})')
+
+    if errors:
+        raise ImportError('Unresolvable views:\n' + '\n'.join(errors))
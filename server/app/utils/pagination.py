@@ -0,0 +1,42 @@
+import base64
+import json
+
+from datetime import datetime
+from decimal import Decimal
+from typing import Any
+
+from app.constants.messages import SearchMessages
+
+
+def _json_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
+
+
+def encode_cursor(values: list[Any]) -> str:
+    """Opaque URL-safe token for the keyset values of the last row on a page"""
+    payload = json.dumps([_json_value(value) for value in values], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str, size: int) -> list[Any]:
+    """Decode a token produced by encode_cursor, checking it holds size values"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        raise ValueError(SearchMessages.INVALID_CURSOR)
+
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError(SearchMessages.INVALID_CURSOR)
+    return values
+
+
+def parse_cursor_datetime(value: Any) -> datetime:
+    try:
+        return datetime.fromisoformat(value)
+    except (ValueError, TypeError):
+        raise ValueError(SearchMessages.INVALID_CURSOR)
@@ -1,5 +1,3 @@
-from weasyprint import HTML
-
 from flask import current_app, render_template
 
 from app.constants.branding import (
@@ -70,6 +68,9 @@ def generate_booking_pdf(booking) -> bytes:
         'ogrn': OGRN,
     }
 
+    # WeasyPrint pulls in cairo and pango, only processes that render PDFs should load it
+    from weasyprint import HTML
+
     html = render_template('pdf/booking.html', **context)
     pdf = HTML(string=html, base_url=current_app.root_path).write_pdf()
     return pdf
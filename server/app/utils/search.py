@@ -2,8 +2,8 @@ from collections.abc import Iterable
 from datetime import date, datetime, timedelta
 from typing import Any
 
-from sqlalchemy import and_, or_, false, true
-from sqlalchemy.orm import aliased, Session
+from sqlalchemy import and_, case, or_, false, select, true, tuple_
+from sqlalchemy.orm import aliased, joinedload, Session
 from sqlalchemy.sql import func
 
 from app.database import db
@@ -15,53 +15,107 @@ from app.models.route import Route
 from app.models.tariff import Tariff
 from app.models._base_model import NotFoundError
 from app.constants.messages import SearchMessages
+from app.utils.datetime import utc_now
+from app.utils.enum import PASSENGER_CATEGORY, SEAT_CLASS
+from app.utils.pagination import decode_cursor, encode_cursor, parse_cursor_datetime
+from app.utils.passenger_categories import PASSENGER_WITH_SEAT_CATEGORIES, get_category_discount_multiplier
 
+SEARCH_SORT_KEYS = ('price', 'departure', 'duration')
+MAX_DURATION_SECONDS = 10 ** 9
 
-def get_flight_seat_availability(
-    flight_id: int,
-    flight_tariff_id: int | None = None,
-    session: Session | None = None,
-    *,
-    flight_tariffs: Iterable['FlightTariff'] | None = None,
-) -> dict[int, dict[str, int]]:
-    """Calculate seat availability for a flight's tariffs or a specific tariff"""
+
+def _live_booking_condition():
+    """Bookings whose seats count as taken: completed, or unfinished with an active hold"""
     from app.models.booking import Booking
     from app.models.booking_hold import BookingHold
-    from app.models.booking_flight import BookingFlight
     from app.utils.enum import BOOKING_STATUS
 
-    session = session or db.session
-
-    active_hold_exists = session.query(BookingHold.id).filter(
+    active_hold_exists = select(BookingHold.id).where(
         BookingHold.booking_id == Booking.id,
         BookingHold.expires_at != None,
         BookingHold.expires_at > func.now(),
     ).exists()
 
-    taken_rows = (
+    return or_(
+        Booking.status == BOOKING_STATUS.completed,
+        and_(
+            ~Booking.status.in_(
+                [BOOKING_STATUS.expired, BOOKING_STATUS.cancelled]
+            ),
+            active_hold_exists,
+        ),
+    )
+
+
+def taken_seats_query(session: Session | None = None, *criteria):
+    """Seats held by live bookings grouped by flight tariff, narrowed by criteria"""
+    from app.models.booking import Booking
+    from app.models.booking_flight import BookingFlight
+
+    session = session or db.session
+
+    return (
         session.query(
             BookingFlight.flight_tariff_id.label('flight_tariff_id'),
             func.coalesce(func.sum(BookingFlight.seats_number), 0).label('taken'),
         )
         .join(Booking, BookingFlight.booking_id == Booking.id)
         .join(FlightTariff, FlightTariff.id == BookingFlight.flight_tariff_id)
-        .filter(
-            FlightTariff.flight_id == flight_id,
-            (BookingFlight.flight_tariff_id == flight_tariff_id if flight_tariff_id is not None else true()),
-            or_(
-                Booking.status == BOOKING_STATUS.completed,
-                and_(
-                    ~Booking.status.in_(
-                        [BOOKING_STATUS.expired, BOOKING_STATUS.cancelled]
-                    ),
-                    active_hold_exists,
-                ),
-            ),
-        )
+        .filter(*criteria, _live_booking_condition())
         .group_by(BookingFlight.flight_tariff_id)
-        .all()
     )
 
+
+def _bookable_fare(seat_class: str | None = None, seats_number: int = 0):
+    """Live cheapest price per flight among tariffs with seats left, as a lateral subquery
+
+    With a class and a party size only tariffs of that class count, and tariffs seating
+    the whole party win over cheaper ones that do not, as in _serialize_flights.
+    """
+    from app.models.booking import Booking
+    from app.models.booking_flight import BookingFlight
+
+    taken = (
+        select(func.coalesce(func.sum(BookingFlight.seats_number), 0))
+        .join(Booking, BookingFlight.booking_id == Booking.id)
+        .where(BookingFlight.flight_tariff_id == FlightTariff.id, _live_booking_condition())
+        .scalar_subquery()
+    )
+    seats_left = FlightTariff.seats_number - taken
+
+    criteria = [FlightTariff.flight_id == Flight.id, Tariff.price.isnot(None), seats_left > 0]
+    price = func.min(Tariff.price)
+    if seat_class and seats_number > 0:
+        criteria.append(Tariff.seat_class == seat_class)
+        price = func.coalesce(func.min(Tariff.price).filter(seats_left >= seats_number), price)
+
+    return (
+        select(price.label('price'))
+        .select_from(FlightTariff)
+        .join(Tariff, FlightTariff.tariff_id == Tariff.id)
+        .where(*criteria)
+        .lateral('bookable_fare')
+    )
+
+
+def get_flight_seat_availability(
+    flight_id: int,
+    flight_tariff_id: int | None = None,
+    session: Session | None = None,
+    *,
+    flight_tariffs: Iterable['FlightTariff'] | None = None,
+) -> dict[int, dict[str, int]]:
+    """Calculate seat availability for a flight's tariffs or a specific tariff"""
+    from app.models.booking_flight import BookingFlight
+
+    session = session or db.session
+
+    taken_rows = taken_seats_query(
+        session,
+        FlightTariff.flight_id == flight_id,
+        (BookingFlight.flight_tariff_id == flight_tariff_id if flight_tariff_id is not None else true()),
+    ).all()
+
     taken_map = {
         row.flight_tariff_id: int(
             row.taken or 0
@@ -102,31 +156,35 @@ def get_route_airports(origin_code: str | None, dest_code: str | None) -> tuple[
     return origin, dest
 
 
-def get_available_tariffs(flight_id: int) -> list[dict[str, Any]]:
-    """Return list of available tariffs for a flight ordered by price"""
+def get_available_tariffs_for_flights(
+    flight_ids: Iterable[int],
+    session: Session | None = None,
+) -> dict[int, list[dict[str, Any]]]:
+    """Return available tariffs ordered by price for many flights with one query"""
+    session = session or db.session
 
-    tariff_query = (
-        db.session.query(FlightTariff, Tariff)
-        .join(Tariff, FlightTariff.tariff_id == Tariff.id)
-        .filter(FlightTariff.flight_id == flight_id)
-    )
+    flight_ids = list(flight_ids)
+    if not flight_ids:
+        return {}
 
-    flight_tariffs = [ft for ft, _ in tariff_query.all()]
-    availability_map = get_flight_seat_availability(
-        flight_id,
-        session=db.session,
-        flight_tariffs=flight_tariffs,
+    taken = taken_seats_query(session, FlightTariff.flight_id.in_(flight_ids)).subquery()
+    rows = (
+        session.query(FlightTariff, Tariff, func.coalesce(taken.c.taken, 0).label('taken'))
+        .join(Tariff, FlightTariff.tariff_id == Tariff.id)
+        .outerjoin(taken, taken.c.flight_tariff_id == FlightTariff.id)
+        .filter(FlightTariff.flight_id.in_(flight_ids))
+        .order_by(FlightTariff.flight_id, Tariff.price.asc(), FlightTariff.id.asc())
+        .all()
     )
 
-    result: list[dict[str, Any]] = []
-    for flight_tariff, tariff in tariff_query:
-        availability = availability_map.get(flight_tariff.id, {})
-        seats_left = availability.get('available', 0)
+    result: dict[int, list[dict[str, Any]]] = {}
+    for flight_tariff, tariff, taken_seats in rows:
+        seats_left = max(int(flight_tariff.seats_number or 0) - int(taken_seats or 0), 0)
 
         if seats_left <= 0 or tariff.price is None:
             continue
 
-        result.append(
+        result.setdefault(flight_tariff.flight_id, []).append(
             {
                 'id': tariff.id,
                 'flight_tariff_id': flight_tariff.id,
@@ -141,91 +199,150 @@ def get_available_tariffs(flight_id: int) -> list[dict[str, Any]]:
             }
         )
 
-    return sorted(result, key=lambda x: x['price'])
+    return result
 
 
-def query_flights(
+def get_available_tariffs(flight_id: int) -> list[dict[str, Any]]:
+    """Return list of available tariffs for a flight ordered by price"""
+    return get_available_tariffs_for_flights([flight_id]).get(flight_id, [])
+
+
+def _flight_load_options():
+    """Eager loads for the nested objects serialized by Flight.to_dict(return_children=True)"""
+    return (
+        joinedload(Flight.airline).joinedload(Airline.country),
+        joinedload(Flight.aircraft),
+        joinedload(Flight.route).joinedload(Route.origin_airport).joinedload(Airport.country),
+        joinedload(Flight.route).joinedload(Route.origin_airport).joinedload(Airport.timezone),
+        joinedload(Flight.route).joinedload(Route.destination_airport).joinedload(Airport.country),
+        joinedload(Flight.route).joinedload(Route.destination_airport).joinedload(Airport.timezone),
+    )
+
+
+def _flight_criteria(
+    origin: Any,
+    dest: Any,
     *,
     origin_code: str | None,
     dest_code: str | None,
-    date_from: date | str | None = None,
-    date_to: date | str | None = None,
-    airline_iata_code: str | None = None,
-    flight_number: str | None = None,
-    is_exact: bool = True,
-    seat_class: str | None = None,
-    seats_number: int = 0,
-    direction: str | None = None,
-) -> list[dict[str, Any]]:
-    """Query flights with applied filters returning serialized dictionaries"""
-
-    origin = aliased(Airport)
-    dest = aliased(Airport)
-
-    query = (
-        db.session.query(Flight)
-        .join(Route, Flight.route_id == Route.id)
-        .join(origin, Route.origin_airport_id == origin.id)
-        .join(dest, Route.destination_airport_id == dest.id)
-    )
+    date_from: date | str | None,
+    date_to: date | str | None,
+    airline_iata_code: str | None,
+    flight_number: str | None,
+    is_exact: bool,
+):
+    """Filter for one search direction, excluding flights departing within 24 hours"""
+    criteria = []
 
     if origin_code:
-        query = query.filter(origin.iata_code == origin_code)
+        criteria.append(origin.iata_code == origin_code)
     if dest_code:
-        query = query.filter(dest.iata_code == dest_code)
+        criteria.append(dest.iata_code == dest_code)
     if airline_iata_code and flight_number:
-        query = query.join(Airline, Flight.airline_id == Airline.id)
-        query = query.filter(
-            Airline.iata_code == airline_iata_code,
-            Flight.flight_number == flight_number,
-        )
+        airline_id = select(Airline.id).where(Airline.iata_code == airline_iata_code).scalar_subquery()
+        criteria.extend([Flight.airline_id == airline_id, Flight.flight_number == flight_number])
 
-    # Exclude flights departing within 24 hours
-    min_departure_datetime = datetime.now() + timedelta(hours=24)
+    min_departure_utc = utc_now() + timedelta(hours=24)
 
     if is_exact:
-        if date_from:
-            query = query.filter(
-                Flight.scheduled_departure == date_from,
-                (
-                    Flight.scheduled_departure + func.coalesce(
-                        Flight.scheduled_departure_time, '00:00:00'
-                    )
-                ) >= min_departure_datetime,
-            )
-        else:
-            query = query.filter(false())
+        if not date_from:
+            return false()
+        criteria.append(Flight.scheduled_departure == date_from)
     else:
         if date_from and date_to:
-            query = query.filter(
-                Flight.scheduled_departure.between(date_from, date_to),
-                (
-                    Flight.scheduled_departure + func.coalesce(
-                        Flight.scheduled_departure_time, '00:00:00'
-                    )
-                ) >= min_departure_datetime,
-            )
+            criteria.append(Flight.scheduled_departure.between(date_from, date_to))
         elif date_from:
-            query = query.filter(
-                Flight.scheduled_departure >= date_from,
-                (
-                    Flight.scheduled_departure + func.coalesce(
-                        Flight.scheduled_departure_time, '00:00:00'
-                    )
-                ) >= min_departure_datetime,
-            )
+            criteria.append(Flight.scheduled_departure >= date_from)
         else:
-            query = query.filter(false())
+            return false()
+    criteria.append(Flight.departure_at_utc >= min_departure_utc)
+
+    return and_(*criteria)
+
+
+def _sort_expression(sort: str, fare):
+    if sort == 'price':
+        return fare.c.price
+    if sort == 'departure':
+        return Flight.departure_at_utc
+    # Flights without a known arrival sort last
+    return func.coalesce(
+        func.extract('epoch', Flight.scheduled_arrival_at_utc - Flight.scheduled_departure_at_utc),
+        MAX_DURATION_SECONDS,
+    )
+
+
+def _paginate(
+    query,
+    sort: str,
+    cursor: str | None,
+    limit: int,
+    *,
+    seat_class: str | None = None,
+    seats_number: int = 0,
+    leading: Any = None,
+) -> tuple[list[tuple], str | None]:
+    """Keyset page over (leading, sort key, flight id), returning rows and the next cursor"""
+    if sort not in SEARCH_SORT_KEYS:
+        raise ValueError(SearchMessages.INVALID_SORT)
+
+    # Availability is computed live with the same rule as _serialize_flights, so every row is kept
+    fare = _bookable_fare(seat_class, seats_number)
+    query = query.join(fare, true()).filter(fare.c.price.isnot(None))
+
+    sort_expr = _sort_expression(sort, fare)
+    keys = [expr for expr in (leading, sort_expr, Flight.id) if expr is not None]
+
+    if cursor:
+        values = decode_cursor(cursor, len(keys))
+        if sort == 'departure':
+            values[-2] = parse_cursor_datetime(values[-2])
+        query = query.filter(tuple_(*keys) > tuple_(*values))
+
+    rows = (
+        query.add_columns(sort_expr.label('sort_value'))
+        .order_by(*keys)
+        .limit(limit + 1)
+        .all()
+    )
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        values = [last.sort_value, last[0].id]
+        if leading is not None:
+            values.insert(0, last[1])
+        next_cursor = encode_cursor(values)
 
-    flights = query.all()
+    return rows, next_cursor
+
+
+def _serialize_flights(
+    flights: Iterable[Flight],
+    *,
+    seat_class: str | None = None,
+    seats_number: int = 0,
+    direction: str | None = None,
+    tariffs_map: dict[int, list[dict[str, Any]]] | None = None,
+    compact: bool = False,
+) -> list[dict[str, Any]]:
+    flights = list(flights)
+    flight_ids = [flight.id for flight in flights]
+    if tariffs_map is None:
+        tariffs_map = get_available_tariffs_for_flights(flight_ids)
+
+    durations = Flight.get_durations(flight for flight in flights if flight.id in tariffs_map)
 
     results: list[dict[str, Any]] = []
     for flight in flights:
-        flight_dict = flight.to_dict(return_children=True)
-        all_tariffs = get_available_tariffs(flight.id)
+        all_tariffs = tariffs_map.get(flight.id)
         if not all_tariffs:
             continue
 
+        # Compact rows carry ids only, the client already knows airlines, routes and aircraft
+        flight_dict = flight.to_dict(return_children=not compact, durations=durations)
+
         tariff = None
         min_tariff = None
 
@@ -260,42 +377,437 @@ def query_flights(
         if direction:
             flight_dict['direction'] = direction
 
-        flight_dict['tariffs'] = all_tariffs
+        if not compact:
+            flight_dict['tariffs'] = all_tariffs
         results.append(flight_dict)
 
     return results
 
 
+def _one_way_query(
+    *,
+    origin_code: str | None,
+    dest_code: str | None,
+    date_from: date | str | None = None,
+    date_to: date | str | None = None,
+    airline_iata_code: str | None = None,
+    flight_number: str | None = None,
+    is_exact: bool = True,
+):
+    origin = aliased(Airport)
+    dest = aliased(Airport)
+
+    return (
+        db.session.query(Flight)
+        .join(Route, Flight.route_id == Route.id)
+        .join(origin, Route.origin_airport_id == origin.id)
+        .join(dest, Route.destination_airport_id == dest.id)
+        .filter(
+            _flight_criteria(
+                origin,
+                dest,
+                origin_code=origin_code,
+                dest_code=dest_code,
+                date_from=date_from,
+                date_to=date_to,
+                airline_iata_code=airline_iata_code,
+                flight_number=flight_number,
+                is_exact=is_exact,
+            )
+        )
+    )
+
+
+def query_flights(
+    *,
+    seat_class: str | None = None,
+    seats_number: int = 0,
+    direction: str | None = None,
+    **filters: Any,
+) -> list[dict[str, Any]]:
+    """Query flights with applied filters returning serialized dictionaries"""
+    flights = _one_way_query(**filters).options(*_flight_load_options()).all()
+
+    return _serialize_flights(
+        flights,
+        seat_class=seat_class,
+        seats_number=seats_number,
+        direction=direction,
+    )
+
+
+def query_flights_page(
+    *,
+    seat_class: str | None = None,
+    seats_number: int = 0,
+    direction: str | None = None,
+    sort: str = 'departure',
+    cursor: str | None = None,
+    limit: int = 20,
+    compact: bool = False,
+    **filters: Any,
+) -> dict[str, Any]:
+    """One page of query_flights sorted and cut in SQL, with a cursor to the next page"""
+    query = _one_way_query(**filters)
+    if not compact:
+        query = query.options(*_flight_load_options())
+    rows, next_cursor = _paginate(query, sort, cursor, limit, seat_class=seat_class, seats_number=seats_number)
+
+    return {
+        'items': _serialize_flights(
+            [row[0] for row in rows],
+            seat_class=seat_class,
+            seats_number=seats_number,
+            direction=direction,
+            compact=compact,
+        ),
+        'next_cursor': next_cursor,
+    }
+
+
+def _round_trip_query(
+    *,
+    origin_code: str | None,
+    dest_code: str | None,
+    depart_from: date | str | None = None,
+    depart_to: date | str | None = None,
+    return_from: date | str | None = None,
+    return_to: date | str | None = None,
+    outbound_airline_iata_code: str | None = None,
+    outbound_flight_number: str | None = None,
+    return_airline_iata_code: str | None = None,
+    return_flight_number: str | None = None,
+    is_exact: bool = True,
+):
+    """Flights of both directions in one query, labelled outbound or return"""
+
+    origin = aliased(Airport)
+    dest = aliased(Airport)
+
+    outbound = _flight_criteria(
+        origin,
+        dest,
+        origin_code=origin_code,
+        dest_code=dest_code,
+        date_from=depart_from,
+        date_to=depart_to,
+        airline_iata_code=outbound_airline_iata_code,
+        flight_number=outbound_flight_number,
+        is_exact=is_exact,
+    )
+    inbound = _flight_criteria(
+        origin,
+        dest,
+        origin_code=dest_code,
+        dest_code=origin_code,
+        date_from=return_from,
+        date_to=return_to,
+        airline_iata_code=return_airline_iata_code,
+        flight_number=return_flight_number,
+        is_exact=is_exact,
+    )
+    direction = case((outbound, 'outbound'), else_='return')
+
+    return (
+        db.session.query(Flight, direction.label('direction'))
+        .join(Route, Flight.route_id == Route.id)
+        .join(origin, Route.origin_airport_id == origin.id)
+        .join(dest, Route.destination_airport_id == dest.id)
+        .filter(or_(outbound, inbound))
+    ), direction
+
+
+def _serialize_round_trip(
+    rows: list[tuple[Flight, str]],
+    *,
+    seat_class: str | None = None,
+    seats_number: int = 0,
+    compact: bool = False,
+) -> dict[str, list[dict[str, Any]]]:
+    """Serialize round trip rows partitioned by direction, sharing the tariff lookup"""
+    flight_ids = [row[0].id for row in rows]
+    tariffs_map = get_available_tariffs_for_flights(flight_ids)
+
+    return {
+        leg: _serialize_flights(
+            [row[0] for row in rows if row[1] == leg],
+            seat_class=seat_class,
+            seats_number=seats_number,
+            direction=leg,
+            tariffs_map=tariffs_map,
+            compact=compact,
+        )
+        for leg in ('outbound', 'return')
+    }
+
+
+def query_round_trip(
+    *,
+    seat_class: str | None = None,
+    seats_number: int = 0,
+    **filters: Any,
+) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+    """Query both directions of a round trip with one flight query and one tariff query"""
+    query, _ = _round_trip_query(**filters)
+    partitions = _serialize_round_trip(
+        query.options(*_flight_load_options()).all(),
+        seat_class=seat_class,
+        seats_number=seats_number,
+    )
+    return partitions['outbound'], partitions['return']
+
+
+def query_round_trip_page(
+    *,
+    seat_class: str | None = None,
+    seats_number: int = 0,
+    sort: str = 'departure',
+    cursor: str | None = None,
+    limit: int = 20,
+    compact: bool = False,
+    **filters: Any,
+) -> dict[str, Any]:
+    """One page of a round trip search, outbound flights first, then return flights"""
+    query, direction = _round_trip_query(**filters)
+    if not compact:
+        query = query.options(*_flight_load_options())
+    rows, next_cursor = _paginate(
+        query, sort, cursor, limit, seat_class=seat_class, seats_number=seats_number, leading=direction,
+    )
+    partitions = _serialize_round_trip(rows, seat_class=seat_class, seats_number=seats_number, compact=compact)
+
+    return {
+        'items': partitions['outbound'] + partitions['return'],
+        'next_cursor': next_cursor,
+    }
+
+
+def search_round_trip_combinations(
+    *,
+    passenger_counts: dict[PASSENGER_CATEGORY, int],
+    seat_class: str | None = None,
+    sort: str = 'price',
+    page: int = 1,
+    limit: int = 20,
+    **filters: Any,
+) -> dict[str, Any]:
+    """Priced outbound/return pairs for a round trip search"""
+    query, direction = _round_trip_query(**filters)
+    # Pairing only needs ids, UTC times and tariffs, full flights are loaded for the page alone
+    rows = query.with_entities(
+        Flight.id,
+        Flight.scheduled_departure_at_utc,
+        Flight.scheduled_arrival_at_utc,
+        direction,
+    ).all()
+    seats_number = sum(
+        count for category, count in passenger_counts.items()
+        if category in PASSENGER_WITH_SEAT_CATEGORIES
+    )
+    tariffs_map = get_available_tariffs_for_flights(row.id for row in rows)
+
+    legs: dict[str, list[dict[str, Any]]] = {'outbound': [], 'return': []}
+    directions: dict[int, str] = {}
+    for flight_id, departure, arrival, leg in rows:
+        if flight_id not in tariffs_map:
+            continue
+        directions[flight_id] = leg
+        legs[leg].append(
+            {
+                'id': flight_id,
+                'departure': departure,
+                'arrival': arrival,
+                'tariffs': tariffs_map[flight_id],
+            }
+        )
+
+    result = pair_round_trips(
+        legs['outbound'],
+        legs['return'],
+        passenger_counts=passenger_counts,
+        seat_class=seat_class,
+        sort=sort,
+        page=page,
+        limit=limit,
+    )
+
+    page_flight_ids = {item['outbound_id'] for item in result['items']} | {item['return_id'] for item in result['items']}
+    flights = (
+        db.session.query(Flight)
+        .options(*_flight_load_options())
+        .filter(Flight.id.in_(page_flight_ids))
+        .all()
+    ) if page_flight_ids else []
+    serialized = [
+        flight
+        for leg in ('outbound', 'return')
+        for flight in _serialize_flights(
+            [flight for flight in flights if directions[flight.id] == leg],
+            seat_class=seat_class,
+            seats_number=seats_number,
+            direction=leg,
+            tariffs_map=tariffs_map,
+        )
+    ]
+    result['flights'] = sorted(serialized, key=lambda flight: flight['id'])
+    return result
+
+
+def _pick_combination_tariff(
+    tariffs: list[dict[str, Any]],
+    seat_class: str | None,
+    seats_number: int,
+) -> dict[str, Any] | None:
+    """Cheapest tariff of a flight that seats the whole party in the requested class"""
+    for tariff in tariffs:
+        if seat_class and tariff['seat_class'] != seat_class:
+            continue
+        if tariff['seats_left'] >= max(seats_number, 1):
+            return tariff
+    return None
+
+
+def _leg_duration(leg: dict[str, Any]) -> int:
+    if leg['departure'] is None or leg['arrival'] is None:
+        return 0
+    return int((leg['arrival'] - leg['departure']).total_seconds() // 60)
+
+
+def pair_round_trips(
+    outbound_legs: list[dict[str, Any]],
+    return_legs: list[dict[str, Any]],
+    *,
+    passenger_counts: dict[PASSENGER_CATEGORY, int],
+    seat_class: str | None = None,
+    sort: str = 'price',
+    page: int = 1,
+    limit: int = 20,
+) -> dict[str, Any]:
+    """Pair outbound and return legs into priced combinations, sorted and paginated
+
+    A leg is a flight id with its UTC departure and arrival and its available tariffs
+    ordered by price.
+    """
+    from app.utils.business_logic import get_all_discounts
+
+    if sort not in SEARCH_SORT_KEYS:
+        raise ValueError(SearchMessages.INVALID_SORT)
+
+    discount_pct, discount_names_map = get_all_discounts()
+    seats_number = sum(
+        count for category, count in passenger_counts.items()
+        if category in PASSENGER_WITH_SEAT_CATEGORIES
+    )
+
+    def leg_price(tariff: dict[str, Any]) -> tuple[float, float]:
+        fare_price = total_price = 0.0
+        for category, count in passenger_counts.items():
+            multiplier, _ = get_category_discount_multiplier(
+                category,
+                SEAT_CLASS(tariff['seat_class']),
+                True,
+                discount_pct,
+                discount_names_map,
+            )
+            fare_price += tariff['price'] * count
+            total_price += tariff['price'] * multiplier * count
+        return fare_price, total_price
+
+    def priced(legs: list[dict[str, Any]]) -> list[tuple[dict[str, Any], dict[str, Any], tuple[float, float]]]:
+        result = []
+        for leg in legs:
+            tariff = _pick_combination_tariff(leg['tariffs'], seat_class, seats_number)
+            if tariff is not None:
+                result.append((leg, tariff, leg_price(tariff)))
+        return result
+
+    priced_return_legs = priced(return_legs)
+    combinations: list[dict[str, Any]] = []
+    for outbound, outbound_tariff, (outbound_fare, outbound_total) in priced(outbound_legs):
+        for inbound, return_tariff, (return_fare, return_total) in priced_return_legs:
+            if outbound_tariff['currency'] != return_tariff['currency']:
+                continue
+            # The return leg has to leave after the outbound leg lands
+            if outbound['arrival'] is None or inbound['departure'] is None or inbound['departure'] <= outbound['arrival']:
+                continue
+
+            fare_price = outbound_fare + return_fare
+            price = outbound_total + return_total
+            combinations.append(
+                {
+                    'outbound_id': outbound['id'],
+                    'outbound_tariff_id': outbound_tariff['id'],
+                    'return_id': inbound['id'],
+                    'return_tariff_id': return_tariff['id'],
+                    'fare_price': fare_price,
+                    'price': price,
+                    'discount': fare_price - price,
+                    'currency': outbound_tariff['currency'],
+                    'duration': _leg_duration(outbound) + _leg_duration(inbound),
+                    '_departure': outbound['departure'],
+                }
+            )
+
+    sort_keys = {
+        'price': lambda item: (item['price'], item['_departure']),
+        'departure': lambda item: (item['_departure'], item['price']),
+        'duration': lambda item: (item['duration'], item['price']),
+    }
+    combinations.sort(key=sort_keys[sort])
+
+    page = max(page, 1)
+    offset = (page - 1) * limit
+    items = combinations[offset:offset + limit]
+    for item in items:
+        item.pop('_departure')
+
+    return {
+        'items': items,
+        'total': len(combinations),
+        'page': page,
+        'limit': limit,
+    }
+
+
 def build_schedule(origin_code: str, dest_code: str, include_return: bool = True) -> list[dict[str, Any]]:
     """Return schedule flights for both directions for a date"""
 
     # Exclude flights departing within 24 hours
     min_departure_date = (datetime.now() + timedelta(hours=24)).date()
 
-    flights: list[dict[str, Any]] = []
-
-    flights.extend(
-        query_flights(
+    if include_return:
+        outbound_flights, return_flights = query_round_trip(
             origin_code=origin_code,
             dest_code=dest_code,
-            date_from=min_departure_date,
+            depart_from=min_departure_date,
+            return_from=min_departure_date,
             is_exact=False,
-            direction='outbound',
         )
+        return outbound_flights + return_flights
+
+    return query_flights(
+        origin_code=origin_code,
+        dest_code=dest_code,
+        date_from=min_departure_date,
+        is_exact=False,
+        direction='outbound',
     )
 
-    if include_return:
-        flights.extend(
-            query_flights(
-                origin_code=dest_code,
-                dest_code=origin_code,
-                date_from=min_departure_date,
-                is_exact=False,
-                direction='return',
-            )
-        )
 
-    return flights
+def build_schedule_page(origin_code: str, dest_code: str, **page: Any) -> dict[str, Any]:
+    """One page of build_schedule, outbound flights first"""
+
+    # Exclude flights departing within 24 hours
+    min_departure_date = (datetime.now() + timedelta(hours=24)).date()
+
+    return query_round_trip_page(
+        origin_code=origin_code,
+        dest_code=dest_code,
+        depart_from=min_departure_date,
+        return_from=min_departure_date,
+        is_exact=False,
+        **page,
+    )
 
 
 def upcoming_routes(limit: int | None = None) -> Iterable[tuple[str, str]]:
@@ -305,7 +817,7 @@ def upcoming_routes(limit: int | None = None) -> Iterable[tuple[str, str]]:
     dest = aliased(Airport)
 
     # Exclude flights departing within 24 hours
-    min_departure_datetime = datetime.now() + timedelta(hours=24)
+    min_departure_utc = utc_now() + timedelta(hours=24)
 
     query = (
         db.session.query(origin.iata_code, dest.iata_code)
@@ -313,13 +825,7 @@ def upcoming_routes(limit: int | None = None) -> Iterable[tuple[str, str]]:
         .join(Route, Flight.route_id == Route.id)
         .join(origin, Route.origin_airport_id == origin.id)
         .join(dest, Route.destination_airport_id == dest.id)
-        .filter(
-            (
-                Flight.scheduled_departure + func.coalesce(
-                    Flight.scheduled_departure_time, '00:00:00'
-                )
-            ) >= min_departure_datetime,
-        )
+        .filter(Flight.departure_at_utc >= min_departure_utc)
         .group_by(origin.iata_code, dest.iata_code)
         .order_by(func.min(Flight.scheduled_departure))
     )
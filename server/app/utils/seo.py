@@ -10,6 +10,7 @@ from app.database import db
 from app.models.airport import Airport
 from app.models.flight import Flight
 from app.models.route import Route
+from app.models.route_metric import RouteMetric
 from app.utils.search import (
     build_schedule,
     get_route_airports,
@@ -236,13 +237,8 @@ def build_seo_schedule_context(
     schedule = build_schedule(origin_code, dest_code, include_return=False)
 
     route_title = _route_name(origin, dest)
-    lowest_price = None
-    for flight in schedule:
-        candidate = flight.get('min_price') or flight.get('price')
-        if candidate is None:
-            continue
-        if lowest_price is None or candidate < lowest_price:
-            lowest_price = candidate
+    route_fare = RouteMetric.get_lowest_fare(origin.id, dest.id)
+    lowest_price = route_fare['price_from'] if route_fare else None
 
     description_parts = [
         SEOText.SCHEDULE_FLIGHTS.format(route_title=route_title),
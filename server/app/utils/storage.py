@@ -1,17 +1,212 @@
+import base64
+import hashlib
+import shutil
+import time
 import uuid
 
+from io import BytesIO
 from pathlib import Path
 from typing import BinaryIO, Optional, Tuple, Union
+from urllib.parse import quote, urlencode
 
+from flask import Response, redirect, send_file
 from werkzeug.datastructures import FileStorage
 
 from app.config import Config
 from app.constants.messages import FileMessages
 
 
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+class LocalStorageBackend:
+    """Files on the shared storage volume, also served by storage-cdn"""
+
+    def __init__(self, root: str):
+        self.root = Path(root).resolve()
+
+    def path(self, key: str) -> Path:
+        """Resolve a key inside the storage root, rejecting escapes and missing files"""
+        full_path = (self.root / key).resolve()
+        if not full_path.is_relative_to(self.root):
+            raise ValueError(FileMessages.INVALID_PATH)
+        if not full_path.exists():
+            raise ValueError(FileMessages.FILE_NOT_FOUND)
+        return full_path
+
+    def save(self, key: str, stream: BinaryIO, content_type: Optional[str] = None) -> None:
+        target_path = self.root / key
+        target_path.parent.mkdir(parents=True, exist_ok=True)
+        # Write to a sibling and rename so readers never see a partial file
+        partial_path = target_path.with_name(f'.{target_path.name}.{uuid.uuid4().hex}.part')
+        try:
+            with open(partial_path, 'wb') as f:
+                shutil.copyfileobj(stream, f, STREAM_CHUNK_SIZE)
+            partial_path.replace(target_path)
+        finally:
+            partial_path.unlink(missing_ok=True)
+
+    def open(self, key: str) -> BinaryIO:
+        return open(self.path(key), 'rb')
+
+    def exists(self, key: str) -> bool:
+        try:
+            return self.path(key).is_file()
+        except (ValueError, OSError):
+            return False
+
+    def delete(self, key: str) -> bool:
+        file_path = self.path(key)
+        if file_path.is_file():
+            file_path.unlink()
+            return True
+        return False
+
+    def url(self, key: str) -> str:
+        """Public storage-cdn URL of a file"""
+        return f"{Config.STORAGE_URL.rstrip('/')}/{quote(key)}"
+
+    def download_response(self, key: str, mimetype: str, download_name: str) -> Response:
+        delivery = Config.STORAGE_DELIVERY
+
+        if delivery == 'accel':
+            # nginx in front of the app serves the file from an internal location
+            self.path(key)
+            response = Response(status=200, mimetype=mimetype)
+            response.headers['X-Accel-Redirect'] = f"{Config.STORAGE_ACCEL_REDIRECT_PREFIX.rstrip('/')}/{quote(key)}"
+            response.headers['Content-Disposition'] = _content_disposition(download_name)
+            return response
+
+        if delivery == 'signed':
+            self.path(key)
+            return redirect(signed_storage_url(key, download_name), code=302)
+
+        return send_file(
+            self.path(key),
+            mimetype=mimetype,
+            as_attachment=True,
+            download_name=download_name,
+            conditional=True,
+        )
+
+
+class S3StorageBackend:
+    """Objects in an S3 compatible bucket such as MinIO, downloads go through presigned URLs"""
+
+    def __init__(self):
+        import boto3
+        from botocore.config import Config as BotoConfig
+
+        options = {
+            'region_name': Config.STORAGE_S3_REGION,
+            'aws_access_key_id': Config.STORAGE_S3_ACCESS_KEY,
+            'aws_secret_access_key': Config.STORAGE_S3_SECRET_KEY,
+            'config': BotoConfig(signature_version='s3v4', s3={'addressing_style': 'path'}),
+        }
+        self.bucket = Config.STORAGE_S3_BUCKET
+        self.client = boto3.client('s3', endpoint_url=Config.STORAGE_S3_ENDPOINT_URL, **options)
+        # Presigned URLs have to carry the host browsers reach, which differs from the internal one in compose
+        public_endpoint = Config.STORAGE_S3_PUBLIC_ENDPOINT_URL or Config.STORAGE_S3_ENDPOINT_URL
+        self.signing_client = boto3.client('s3', endpoint_url=public_endpoint, **options)
+        # Public objects such as images are linked directly, through a CDN when one fronts the bucket
+        if Config.STORAGE_S3_PUBLIC_URL:
+            self.public_url = Config.STORAGE_S3_PUBLIC_URL
+        elif public_endpoint:
+            self.public_url = f"{public_endpoint.rstrip('/')}/{self.bucket}"
+        else:
+            self.public_url = f'https://{self.bucket}.s3.{Config.STORAGE_S3_REGION}.amazonaws.com'
+
+    def _is_missing(self, error) -> bool:
+        return error.response.get('Error', {}).get('Code') in ('404', 'NoSuchKey', 'NotFound')
+
+    def save(self, key: str, stream: BinaryIO, content_type: Optional[str] = None) -> None:
+        extra = {'ContentType': content_type} if content_type else None
+        # Multipart upload in chunks, the payload is never held in memory as a whole
+        self.client.upload_fileobj(stream, self.bucket, key, ExtraArgs=extra)
+
+    def open(self, key: str) -> BinaryIO:
+        from botocore.exceptions import ClientError
+
+        try:
+            return self.client.get_object(Bucket=self.bucket, Key=key)['Body']
+        except ClientError as e:
+            if self._is_missing(e):
+                raise ValueError(FileMessages.FILE_NOT_FOUND)
+            raise
+
+    def exists(self, key: str) -> bool:
+        from botocore.exceptions import ClientError
+
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=key)
+            return True
+        except ClientError as e:
+            if self._is_missing(e):
+                return False
+            raise
+
+    def delete(self, key: str) -> bool:
+        if not self.exists(key):
+            return False
+        self.client.delete_object(Bucket=self.bucket, Key=key)
+        return True
+
+    def url(self, key: str) -> str:
+        """Public bucket or CDN URL of an object"""
+        return f"{self.public_url.rstrip('/')}/{quote(key)}"
+
+    def download_response(self, key: str, mimetype: str, download_name: str) -> Response:
+        if not self.exists(key):
+            raise ValueError(FileMessages.FILE_NOT_FOUND)
+
+        url = self.signing_client.generate_presigned_url(
+            'get_object',
+            Params={
+                'Bucket': self.bucket,
+                'Key': key,
+                'ResponseContentType': mimetype,
+                'ResponseContentDisposition': _content_disposition(download_name),
+            },
+            ExpiresIn=Config.STORAGE_LINK_TTL_SECONDS,
+        )
+        return redirect(url, code=302)
+
+
+def _content_disposition(download_name: str) -> str:
+    return f"attachment; filename*=UTF-8''{quote(download_name)}"
+
+
+def signed_storage_url(key: str, download_name: Optional[str] = None) -> str:
+    """Expiring storage-cdn link checked by the nginx secure_link module"""
+    expires = int(time.time()) + Config.STORAGE_LINK_TTL_SECONDS
+    uri = f'/signed/{quote(key)}'
+    digest = hashlib.md5(f'{expires}{uri} {Config.STORAGE_LINK_SECRET}'.encode()).digest()
+    params = {
+        'md5': base64.urlsafe_b64encode(digest).decode().rstrip('='),
+        'expires': expires,
+    }
+    if download_name:
+        params['filename'] = download_name
+    return f"{Config.STORAGE_URL.rstrip('/')}{uri}?{urlencode(params, quote_via=quote)}"
+
+
+_backend = None
+
+
+def get_storage_backend():
+    """Process wide backend selected by STORAGE_BACKEND"""
+    global _backend
+    if _backend is None:
+        if Config.STORAGE_BACKEND == 's3':
+            _backend = S3StorageBackend()
+        else:
+            _backend = LocalStorageBackend(Config.STORAGE_DIR)
+    return _backend
+
+
 class StorageManager:
     def __init__(self):
-        self.storage_root = Path(Config.STORAGE_DIR).resolve()
+        self.backend = get_storage_backend()
         self.folder_name = ''
         self.allowed_extensions = []
 
@@ -36,23 +231,16 @@ class StorageManager:
             return str(Path(self.folder_name) / normalized_subfolder / filename)
         return str(Path(self.folder_name) / filename)
 
-    def _get_target_directory(self, subfolder_name: Optional[str] = None) -> Path:
-        """Build and create target directory path"""
-        if subfolder_name:
-            normalized_subfolder = self._normalize_relative_dir(subfolder_name)
-            target_dir = self.storage_root / self.folder_name / normalized_subfolder
-        else:
-            target_dir = self.storage_root / self.folder_name
-
-        target_dir.mkdir(parents=True, exist_ok=True)
-        return target_dir
-
     def _generate_filename(self, extension: str, filename: Optional[str] = None) -> str:
         """Generate a unique filename or use provided filename"""
         if filename:
             return filename
         return f'{uuid.uuid4().hex}.{extension}'
 
+    def _key(self, filename: str, subfolder_name: Optional[str] = None) -> str:
+        """Backend key of a file, normalized so it cannot leave the manager folder"""
+        return self._normalize_relative_dir(self._build_relative_path(filename, subfolder_name)).as_posix()
+
     def save_file(
         self,
         content: Union[FileStorage, bytes, str, BinaryIO],
@@ -72,30 +260,33 @@ class StorageManager:
 
         extension = self._validate_extension(source_filename)
 
-        target_dir = self._get_target_directory(subfolder_name)
         final_filename = self._generate_filename(
             extension,
             Path(source_filename).name if filename else None
         )
-        target_path = target_dir / final_filename
+        relative_path = self._key(final_filename, subfolder_name)
 
+        content_type = None
         if isinstance(content, FileStorage):
-            content.save(str(target_path))
+            stream, content_type = content.stream, content.mimetype
         elif isinstance(content, str):
-            target_path.write_text(content, encoding=encoding)
+            stream = BytesIO(content.encode(encoding))
         elif isinstance(content, bytes):
-            target_path.write_bytes(content)
+            stream = BytesIO(content)
         elif hasattr(content, 'read'):
-            with open(target_path, 'wb') as f:
-                f.write(content.read())
+            stream = content
         else:
             raise ValueError(
                 FileMessages.unsupported_content_type(type(content))
             )
 
-        relative_path = str(target_path.relative_to(self.storage_root))
+        self.backend.save(relative_path, stream, content_type)
         return relative_path, final_filename
 
+    def open_file(self, filename: str, subfolder_name: Optional[str] = None) -> BinaryIO:
+        """Open a stored file for streamed reading, the caller closes it"""
+        return self.backend.open(self._key(filename, subfolder_name))
+
     def read_file(
         self,
         filename: str,
@@ -104,45 +295,42 @@ class StorageManager:
         encoding: str = 'utf-8'
     ) -> Union[bytes, str]:
         """Read file content from storage"""
-        relative_path = self._build_relative_path(filename, subfolder_name)
-        file_path = self.resolve_path(relative_path)
+        with self.open_file(filename, subfolder_name) as f:
+            data = f.read()
 
         if as_text:
-            return file_path.read_text(encoding=encoding)
-        return file_path.read_bytes()
+            return data.decode(encoding)
+        return data
 
     def resolve_path(self, relative_path: str) -> Path:
-        """Resolve and validate a relative path within storage root"""
-        normalized = self._normalize_relative_dir(relative_path)
-        full_path = (self.storage_root / normalized).resolve()
-
-        if not str(full_path).startswith(str(self.storage_root)):
+        """Resolve and validate a relative path within the local storage root"""
+        if not isinstance(self.backend, LocalStorageBackend):
             raise ValueError(FileMessages.INVALID_PATH)
-
-        if not full_path.exists():
-            raise ValueError(FileMessages.FILE_NOT_FOUND)
-
-        return full_path
+        return self.backend.path(self._normalize_relative_dir(relative_path).as_posix())
 
     def get_file_url(self, filename: str, subfolder_name: Optional[str] = None) -> str:
-        """Build a full URL for a file given its folder, subfolder, and filename"""
+        """Build a full public URL for a file given its folder, subfolder, and filename"""
         if not filename:
             return ''
 
-        relative_path = self._build_relative_path(filename, subfolder_name)
-        return f"{Config.STORAGE_URL.rstrip('/')}/{relative_path}"
+        return self.backend.url(self._key(filename, subfolder_name))
+
+    def download_response(
+        self,
+        filename: str,
+        subfolder_name: Optional[str] = None,
+        *,
+        mimetype: str,
+        download_name: str,
+    ) -> Response:
+        """Attachment response that leaves the file transfer to nginx or object storage when configured"""
+        return self.backend.download_response(self._key(filename, subfolder_name), mimetype, download_name)
 
     def delete_file(self, filename: str, subfolder_name: Optional[str] = None) -> bool:
         """Delete a file from storage and return success status"""
         try:
             if filename:
-                relative_path = self._build_relative_path(
-                    filename, subfolder_name
-                )
-                file_path = self.resolve_path(relative_path)
-                if file_path.is_file():
-                    file_path.unlink()
-                    return True
+                return self.backend.delete(self._key(filename, subfolder_name))
             return False
         except (ValueError, OSError):
             return False
@@ -150,9 +338,7 @@ class StorageManager:
     def file_exists(self, filename: str, subfolder_name: Optional[str] = None) -> bool:
         """Check if a file exists in storage"""
         try:
-            relative_path = self._build_relative_path(filename, subfolder_name)
-            file_path = self.resolve_path(relative_path)
-            return file_path.is_file()
+            return self.backend.exists(self._key(filename, subfolder_name))
         except (ValueError, OSError):
             return False
 
@@ -162,7 +348,7 @@ class ImageManager(StorageManager):
 
     def __init__(self):
         super().__init__()
-        self.allowed_extensions = {'.jpg', '.jpeg', '.png'}
+        self.allowed_extensions = {'.jpg', '.jpeg', '.png', '.webp', '.avif'}
         self.folder_name = 'images'
 
 
@@ -171,7 +357,8 @@ class SEOManager(StorageManager):
 
     def __init__(self):
         super().__init__()
-        self.allowed_extensions = {'.html', '.htm', '.json'}
+        # .br and .gz are precompressed siblings of the prerendered pages
+        self.allowed_extensions = {'.html', '.htm', '.json', '.br', '.gz'}
         self.folder_name = 'seo'
 
 
@@ -0,0 +1,149 @@
+import functools
+import logging
+import threading
+import time
+import uuid
+
+from typing import Optional
+
+from redis.exceptions import RedisError
+
+from app.config import Config
+from app.utils.cache import get_redis
+
+
+LOCK_KEY_PREFIX = 'task_lock'
+DEDUPE_KEY_PREFIX = 'task_run'
+
+logger = logging.getLogger('app.task')
+
+# Only the holder may extend or delete the lock, a run that lost it must not release its successor
+_EXTEND_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('pexpire', KEYS[1], ARGV[2])
+end
+return 0
+"""
+_RELEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+class TaskLock:
+    """Redis lock held by one run of a task, renewed by a heartbeat until it is released"""
+
+    def __init__(self, name: str, ttl_seconds: Optional[int] = None, heartbeat_seconds: Optional[int] = None):
+        self.name = name
+        self.key = f'{LOCK_KEY_PREFIX}:{name}'
+        self.ttl_ms = (ttl_seconds or Config.TASK_LOCK_TTL_SECONDS) * 1000
+        self.heartbeat_seconds = heartbeat_seconds or Config.TASK_LOCK_HEARTBEAT_SECONDS
+        self.token = uuid.uuid4().hex
+        self.client = get_redis()
+        self.lost = False
+        self._stopped = threading.Event()
+        self._heartbeat = None
+
+    def acquire(self) -> bool:
+        """Take the lock, False when another run holds it. Without Redis the run is not guarded"""
+        if self.client is None:
+            return True
+        try:
+            acquired = bool(self.client.set(self.key, self.token, nx=True, px=self.ttl_ms))
+        except RedisError:
+            logger.warning('Failed to acquire task lock, running unguarded', extra={'task': self.name}, exc_info=True)
+            self.client = None
+            return True
+
+        if acquired:
+            self._heartbeat = threading.Thread(target=self._renew, name=f'{self.key}:heartbeat', daemon=True)
+            self._heartbeat.start()
+        return acquired
+
+    def _renew(self) -> None:
+        while not self._stopped.wait(self.heartbeat_seconds):
+            try:
+                extended = self.client.eval(_EXTEND_SCRIPT, 1, self.key, self.token, self.ttl_ms)
+            except RedisError:
+                logger.warning('Failed to renew task lock', extra={'task': self.name}, exc_info=True)
+                continue
+            if not extended:
+                self.lost = True
+                logger.warning('Task lock expired while the run was still going', extra={'task': self.name})
+                return
+
+    def release(self) -> None:
+        self._stopped.set()
+        if self._heartbeat is not None:
+            self._heartbeat.join()
+            self._heartbeat = None
+        if self.client is None:
+            return
+        try:
+            self.client.eval(_RELEASE_SCRIPT, 1, self.key, self.token)
+        except RedisError:
+            logger.warning('Failed to release task lock, it expires on its own', extra={'task': self.name}, exc_info=True)
+
+
+def _claim_run(client, name: str, token: str, dedupe_seconds: int) -> bool:
+    """Mark a run as started, False when another scheduler already started one in the window"""
+    try:
+        return bool(client.set(f'{DEDUPE_KEY_PREFIX}:{name}', token, nx=True, ex=dedupe_seconds))
+    except RedisError:
+        logger.warning('Failed to record task run', extra={'task': name}, exc_info=True)
+        return True
+
+
+def _forget_run(client, name: str) -> None:
+    """Let the next schedule retry a run that failed"""
+    try:
+        client.delete(f'{DEDUPE_KEY_PREFIX}:{name}')
+    except RedisError:
+        logger.warning('Failed to clear task run', extra={'task': name}, exc_info=True)
+
+
+def singleton_task(ttl_seconds: Optional[int] = None, dedupe_seconds: Optional[int] = None):
+    """Skip a run while another one holds the lock and log the duration of every run
+
+    dedupe_seconds also skips runs started within that window of the last one, which
+    covers several beat instances firing the same schedule. Calls with arguments are
+    targeted runs and are never skipped.
+    """
+    def decorator(func):
+        name = f'{func.__module__}.{func.__name__}'
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if args or kwargs:
+                return func(*args, **kwargs)
+
+            lock = TaskLock(name, ttl_seconds)
+            if not lock.acquire():
+                logger.info('Task skipped, previous run still holds the lock', extra={'task': name, 'status': 'locked'})
+                return None
+
+            started_at = time.perf_counter()
+            status = 'failed'
+            try:
+                if dedupe_seconds and lock.client is not None and not _claim_run(lock.client, name, lock.token, dedupe_seconds):
+                    status = 'duplicate'
+                    return None
+
+                result = func()
+                status = 'lost' if lock.lost else 'succeeded'
+                return result
+            except Exception:
+                if dedupe_seconds and lock.client is not None:
+                    _forget_run(lock.client, name)
+                raise
+            finally:
+                lock.release()
+                duration_ms = round((time.perf_counter() - started_at) * 1000, 1)
+                level = logging.WARNING if status in ('failed', 'lost') else logging.INFO
+                logger.log(level, 'Task run finished', extra={'task': name, 'status': status, 'duration_ms': duration_ms})
+
+        return wrapper
+
+    return decorator
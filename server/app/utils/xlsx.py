@@ -1,17 +1,17 @@
 import enum
 import re
 from io import BytesIO
-from typing import Dict, List, Type, Tuple
+from typing import Dict, List, Type, Tuple, TYPE_CHECKING
 from pathlib import Path
 
-from openpyxl import Workbook, load_workbook
-from openpyxl.styles import Font, Border, Side, Alignment
-from openpyxl.utils import get_column_letter
 from sqlalchemy import inspect, Enum as SAEnum, Integer, Float, Numeric, Date, Time, String, Text
 
 from app.constants.messages import XlsxMessages
 from app.utils.datetime import WRITE_DATE_FORMAT, WRITE_TIME_FORMAT, format_date, format_time, parse_date_formats, parse_time_formats
 
+if TYPE_CHECKING:
+    from openpyxl import Workbook
+
 
 def is_xlsx_file(file) -> bool:
     if not file or not getattr(file, 'filename', ''):
@@ -21,6 +21,8 @@ def is_xlsx_file(file) -> bool:
 
 
 def get_xlsx_styles():
+    from openpyxl.styles import Font, Border, Side
+
     font = Font(bold=True, size=12)
     thin = Side(border_style='thin', color='000000')
     border = Border(left=thin, right=thin, top=thin, bottom=thin)
@@ -96,7 +98,12 @@ def _get_upload_xlsx_template_wb(
     data: list | None = None,
     *,
     include_errors: bool = False,
-) -> Workbook:
+) -> 'Workbook':
+    # openpyxl is only needed by admin uploads and downloads, not by every process importing models
+    from openpyxl import Workbook
+    from openpyxl.styles import Alignment
+    from openpyxl.utils import get_column_letter
+
     wb = Workbook()
 
     data = data or []
@@ -342,6 +349,8 @@ def parse_upload_xlsx_template(
     time_fields = field_analysis['time_fields']
 
     # Parse first sheet
+    from openpyxl import load_workbook
+
     wb = load_workbook(file, read_only=True)
     ws = wb.worksheets[0]
     headers = [c.value for c in next(ws.iter_rows(min_row=1, max_row=1))]
@@ -1,9 +1,8 @@
 import uuid
-from typing import Any, Dict
+from functools import lru_cache
+from typing import Any, Dict, Optional, TYPE_CHECKING
 from datetime import datetime, timedelta
 
-from yookassa import Configuration, Payment as YooPayment, Invoice as YooInvoice, Refund as YooRefund
-
 from app.config import Config
 from app.constants.branding import SEAT_CLASS_LABELS, CURRENCY_LABELS
 from app.utils.passenger_categories import PASSENGER_CATEGORY_LABELS
@@ -12,6 +11,7 @@ from app.constants.yookassa import YooKassaMessages, YOOKASSA_RECEIPT_DESCRIPTIO
 from app.database import db
 from app.models.booking import Booking
 from app.models.payment import Payment
+from app.models.payment_webhook_event import PaymentWebhookEvent
 from app.models.ticket import Ticket
 from app.utils.business_logic import calculate_receipt_details, calculate_refund_details, get_booking_details
 from app.utils.datetime import format_date, format_time, parse_datetime
@@ -24,9 +24,21 @@ from app.utils.enum import (
 from app.utils.pdf import generate_booking_pdf
 from app.utils.email import EMAIL_TYPE, send_email
 
-# Configure YooKassa SDK
-Configuration.account_id = Config.YOOKASSA_SHOP_ID
-Configuration.secret_key = Config.YOOKASSA_SECRET_KEY
+if TYPE_CHECKING:
+    from yookassa import Payment as YooPayment
+
+
+@lru_cache(maxsize=None)
+def _yookassa():
+    """Import and configure the YooKassa SDK on first use"""
+    import yookassa
+
+    yookassa.Configuration.account_id = Config.YOOKASSA_SHOP_ID
+    yookassa.Configuration.secret_key = Config.YOOKASSA_SECRET_KEY
+    if Config.YOOKASSA_API_URL:
+        # Points the SDK at a local stub for load testing
+        yookassa.Configuration.api_url = Config.YOOKASSA_API_URL
+    return yookassa
 
 
 def __generate_receipt(booking: Booking) -> Dict[str, Any]:
@@ -134,7 +146,7 @@ def __generate_cart(booking: Booking) -> Dict[str, Any]:
     return receipt, cart
 
 
-def __capture_payment(payment: Payment, session) -> YooPayment:
+def __capture_payment(payment: Payment, session) -> 'YooPayment':
     """Capture authorized payment with receipt and booking number"""
     booking = payment.booking
 
@@ -147,11 +159,11 @@ def __capture_payment(payment: Payment, session) -> YooPayment:
         },
     }
 
-    yoo_payment = YooPayment.capture(payment.provider_payment_id, body)
+    yoo_payment = _yookassa().Payment.capture(payment.provider_payment_id, body)
     return yoo_payment
 
 
-def __capture_invoice(payment: Payment, session) -> YooPayment:
+def __capture_invoice(payment: Payment, session) -> 'YooPayment':
     return __capture_payment(payment, session)
 
 
@@ -289,7 +301,7 @@ def create_payment(booking: Booking) -> Payment:
     }
 
     try:
-        yoo_payment = YooPayment.create(body, uuid.uuid4())
+        yoo_payment = _yookassa().Payment.create(body, uuid.uuid4())
         yookassa_payment_id = getattr(yoo_payment, 'id', None)
         confirmation_token = getattr(
             getattr(yoo_payment, 'confirmation', None),
@@ -363,7 +375,7 @@ def create_invoice(booking: Booking) -> Payment:
     }
 
     try:
-        yoo_invoice = YooInvoice.create(body, uuid.uuid4())
+        yoo_invoice = _yookassa().Invoice.create(body, uuid.uuid4())
         invoice_id = getattr(yoo_invoice, 'id', None)
         payment_url = getattr(yoo_invoice, 'payment_url', None)
 
@@ -430,7 +442,7 @@ def refund_payment(booking: Booking, ticket: Ticket):
     }
 
     try:
-        yoo_refund = YooRefund.create(body, uuid.uuid4())
+        yoo_refund = _yookassa().Refund.create(body, uuid.uuid4())
         yookassa_refund_id = getattr(yoo_refund, 'id', None)
         is_paid = getattr(yoo_refund, 'status', '') == 'succeeded'
         created_at = getattr(yoo_refund, 'created_at', None)
@@ -482,7 +494,11 @@ def handle_yookassa_webhook(payload: Dict[str, Any]) -> None:
         'issued': PAYMENT_STATUS.pending,
         'paid': PAYMENT_STATUS.succeeded
     }
-    mapped_status = status_map.get(status, status)
+    mapped_status = PAYMENT_STATUS(status_map.get(status, status))
+
+    # Replayed and out of order notifications neither move the status back nor repeat side effects
+    if not Payment.is_forward_status(payment.payment_status, mapped_status):
+        return
 
     updates = {'payment_status': mapped_status, 'last_webhook': payload}
     if is_paid:
@@ -498,7 +514,7 @@ def handle_yookassa_webhook(payload: Dict[str, Any]) -> None:
     payment_succeeded = False
 
     if event in ('payment.waiting_for_capture', 'invoice.waiting_for_capture'):
-        yoo_payment = YooPayment.find_one(provider_id)
+        yoo_payment = _yookassa().Payment.find_one(provider_id)
         if yoo_payment.status == PAYMENT_STATUS.waiting_for_capture.value:
             if payment.payment_type == PAYMENT_TYPE.invoice:
                 __capture_invoice(payment, session)
@@ -514,28 +530,30 @@ def handle_yookassa_webhook(payload: Dict[str, Any]) -> None:
         )
 
     elif event in ('payment.succeeded', 'invoice.paid'):
-        Booking.transition_status(
-            id=booking.id,
-            session=session,
-            commit=False,
-            to_status=BOOKING_STATUS.payment_confirmed,
-        )
-        Booking.transition_status(
-            id=booking.id,
-            session=session,
-            commit=False,
-            to_status=BOOKING_STATUS.completed,
-        )
-        Booking.create_booking_flight_passengers(
-            booking_id=booking.id,
-            session=session,
-            commit=False,
-        )
-        Booking.save_snapshot(
-            id=booking.id,
-            session=session,
-            commit=True,
-        )
+        # Replayed notifications must not re-run the completion transitions
+        if booking.status != BOOKING_STATUS.completed:
+            Booking.transition_status(
+                id=booking.id,
+                session=session,
+                commit=False,
+                to_status=BOOKING_STATUS.payment_confirmed,
+            )
+            Booking.transition_status(
+                id=booking.id,
+                session=session,
+                commit=False,
+                to_status=BOOKING_STATUS.completed,
+            )
+            Booking.create_booking_flight_passengers(
+                booking_id=booking.id,
+                session=session,
+                commit=False,
+            )
+            Booking.save_snapshot(
+                id=booking.id,
+                session=session,
+                commit=True,
+            )
         payment_succeeded = True
 
     else:
@@ -545,3 +563,51 @@ def handle_yookassa_webhook(payload: Dict[str, Any]) -> None:
         __send_confirmation_email(booking)
 
     return
+
+
+def record_yookassa_webhook(payload: Dict[str, Any]) -> Optional[int]:
+    """Persist a YooKassa notification once, return its id or None for duplicates"""
+    event = payload.get('event')
+    obj = payload.get('object') or {}
+    provider_id = obj.get('id')
+
+    if not provider_id or not event:
+        return None
+
+    return PaymentWebhookEvent.record(
+        PAYMENT_METHOD.yookassa,
+        provider_id,
+        event,
+        payload,
+        session=db.session,
+        commit=True,
+    )
+
+
+def process_yookassa_webhook_events(event_id: int) -> Optional[int]:
+    """Apply stored notifications for the event's booking in arrival order.
+
+    Returns the number of applied events, or None when the booking is busy.
+    """
+    session = db.session
+    event_ids = PaymentWebhookEvent.claim_for_processing(event_id, session)
+    if event_ids is None:
+        return None
+
+    for index, claimed_id in enumerate(event_ids):
+        event = PaymentWebhookEvent.get_or_404(claimed_id, session)
+        try:
+            handle_yookassa_webhook(event.payload)
+            PaymentWebhookEvent.mark_processed(claimed_id, session=session, commit=True)
+        except Exception as exc:
+            session.rollback()
+            PaymentWebhookEvent.mark_failed(
+                claimed_id,
+                str(exc),
+                event_ids[index + 1:],
+                session=session,
+                commit=True,
+            )
+            raise
+
+    return len(event_ids)
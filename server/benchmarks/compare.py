@@ -0,0 +1,48 @@
+"""Compare two booking funnel benchmark reports
+
+    python benchmarks/compare.py benchmarks/results/<base>.json benchmarks/results/<head>.json
+"""
+import argparse
+import json
+
+from pathlib import Path
+
+
+METRICS = ('p50_ms', 'p95_ms', 'p99_ms', 'error_rate', 'queries_per_request')
+
+
+def _delta(base, head) -> str:
+    if base is None or head is None:
+        return 'n/a'
+    if not base:
+        return f'{head - base:+.2f}'
+    return f'{(head - base) / base * 100:+.1f}%'
+
+
+def compare(base: dict, head: dict) -> list[str]:
+    lines = [f"{'step':<30}{'metric':<22}{base['label']:>12}{head['label']:>12}{'delta':>10}"]
+    for step in [*base['steps'], *[s for s in head['steps'] if s not in base['steps']]]:
+        base_step = base['steps'].get(step, {})
+        head_step = head['steps'].get(step, {})
+        for metric in METRICS:
+            b = base_step.get(metric)
+            h = head_step.get(metric)
+            lines.append(
+                f"{step:<30}{metric:<22}{'' if b is None else b:>12}{'' if h is None else h:>12}{_delta(b, h):>10}"
+            )
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('base')
+    parser.add_argument('head')
+    args = parser.parse_args()
+
+    base = json.loads(Path(args.base).read_text(encoding='utf-8'))
+    head = json.loads(Path(args.head).read_text(encoding='utf-8'))
+    print('\n'.join(compare(base, head)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,294 @@
+"""Index advisor for the search and availability hot paths
+
+    docker compose exec server-app python benchmarks/index_advisor.py --label <name>
+    python benchmarks/index_advisor.py --compare benchmarks/results/explain-<base>.json benchmarks/results/explain-<head>.json
+
+Runs EXPLAIN (ANALYZE, BUFFERS) for the SQL issued by flight search, seat
+availability, upcoming SEO routes and the booking expiry tasks against the
+current database (seed it with benchmarks/seed.py first), checks that the
+expected indexes exist and are used, and writes a plan snapshot to
+benchmarks/results/explain-<label>.json. EXPLAIN ANALYZE executes the
+statements, so everything runs in a transaction that is rolled back.
+"""
+import argparse
+import json
+import subprocess
+import sys
+
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import text  # noqa: E402
+
+
+RESULTS_DIR = Path(__file__).resolve().parent / 'results'
+
+# Sequential scans over tables smaller than this are not worth an index
+SEQ_SCAN_ROW_THRESHOLD = 1000
+
+EXPECTED_INDEXES = {
+    'flights': [
+        'ix_flights_route_departure',
+        'ix_flights_scheduled_departure_at',
+        'ix_flights_scheduled_departure_at_utc',
+        'ix_flights_departure_at_effective',
+    ],
+    'booking_flights': ['ix_booking_flights_flight_tariff_booking'],
+    'bookings': ['ix_bookings_active_status', 'ix_bookings_expired_created_at'],
+    'booking_holds': ['ix_booking_holds_expires_at'],
+}
+
+QUERIES = {
+    'search_flights': """
+        SELECT f.*
+        FROM flights AS f
+        JOIN routes AS r ON r.id = f.route_id
+        JOIN airports AS o ON o.id = r.origin_airport_id
+        JOIN airports AS d ON d.id = r.destination_airport_id
+        WHERE o.iata_code = :origin
+          AND d.iata_code = :dest
+          AND f.scheduled_departure = :departure
+          AND coalesce(f.scheduled_departure_at_utc, f.scheduled_departure_at) >= :min_departure
+    """,
+    'search_flights_range': """
+        SELECT f.*
+        FROM flights AS f
+        JOIN routes AS r ON r.id = f.route_id
+        JOIN airports AS o ON o.id = r.origin_airport_id
+        JOIN airports AS d ON d.id = r.destination_airport_id
+        WHERE o.iata_code = :origin
+          AND d.iata_code = :dest
+          AND f.scheduled_departure BETWEEN :departure AND :departure_to
+          AND coalesce(f.scheduled_departure_at_utc, f.scheduled_departure_at) >= :min_departure
+    """,
+    'seat_availability': """
+        SELECT bf.flight_tariff_id, coalesce(sum(bf.seats_number), 0) AS taken
+        FROM booking_flights AS bf
+        JOIN bookings AS b ON bf.booking_id = b.id
+        JOIN flight_tariffs AS ft ON ft.id = bf.flight_tariff_id
+        WHERE ft.flight_id = :flight_id
+          AND (
+            b.status = 'completed'
+            OR (
+              b.status NOT IN ('expired', 'cancelled')
+              AND EXISTS (
+                SELECT 1 FROM booking_holds AS h
+                WHERE h.booking_id = b.id AND h.expires_at IS NOT NULL AND h.expires_at > now()
+              )
+            )
+          )
+        GROUP BY bf.flight_tariff_id
+    """,
+    'upcoming_routes': """
+        SELECT o.iata_code, d.iata_code
+        FROM flights AS f
+        JOIN routes AS r ON r.id = f.route_id
+        JOIN airports AS o ON o.id = r.origin_airport_id
+        JOIN airports AS d ON d.id = r.destination_airport_id
+        WHERE coalesce(f.scheduled_departure_at_utc, f.scheduled_departure_at) >= :min_departure
+        GROUP BY o.iata_code, d.iata_code
+        ORDER BY min(f.scheduled_departure)
+    """,
+    'set_expired_bookings': """
+        SELECT b.id
+        FROM bookings AS b
+        JOIN booking_holds AS h ON h.booking_id = b.id
+        WHERE h.expires_at < :now
+          AND b.status NOT IN ('completed', 'expired', 'cancelled')
+        ORDER BY h.expires_at
+        LIMIT 200
+        FOR UPDATE OF b SKIP LOCKED
+    """,
+    'delete_expired_bookings': """
+        SELECT b.id
+        FROM bookings AS b
+        WHERE b.status = 'expired'
+          AND b.created_at < :expired_before
+    """,
+}
+
+
+def _label() -> str:
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=Path(__file__).resolve().parent,
+            text=True,
+        ).strip()
+    except Exception:
+        return 'local'
+
+
+def _sample_params(session) -> dict:
+    """Pick a representative upcoming flight to parameterize the queries"""
+    now = datetime.now()
+    min_departure = datetime.now(timezone.utc).replace(tzinfo=None) + timedelta(hours=24)
+    row = session.execute(text("""
+        SELECT f.id, f.scheduled_departure, o.iata_code AS origin, d.iata_code AS dest
+        FROM flights AS f
+        JOIN routes AS r ON r.id = f.route_id
+        JOIN airports AS o ON o.id = r.origin_airport_id
+        JOIN airports AS d ON d.id = r.destination_airport_id
+        WHERE f.scheduled_departure >= :min_date
+        ORDER BY f.scheduled_departure
+        LIMIT 1
+    """), {'min_date': min_departure.date()}).first()
+    if row is None:
+        raise RuntimeError('No upcoming flights found, seed the database with benchmarks/seed.py')
+
+    return {
+        'origin': row.origin,
+        'dest': row.dest,
+        'departure': row.scheduled_departure,
+        'departure_to': row.scheduled_departure + timedelta(days=30),
+        'min_departure': min_departure,
+        'flight_id': row.id,
+        'now': now,
+        'expired_before': now - timedelta(days=30),
+    }
+
+
+def _walk(node: dict):
+    yield node
+    for child in node.get('Plans', []):
+        yield from _walk(child)
+
+
+def summarize_plan(plan: dict) -> dict:
+    """Reduce an EXPLAIN JSON plan to the numbers worth comparing"""
+    root = plan['Plan']
+    seq_scans = []
+    indexes = set()
+    for node in _walk(root):
+        if node.get('Index Name'):
+            indexes.add(node['Index Name'])
+        if node['Node Type'] == 'Seq Scan':
+            seq_scans.append({
+                'relation': node.get('Relation Name'),
+                'rows': node.get('Actual Rows', 0) * node.get('Actual Loops', 1),
+                'removed_by_filter': node.get('Rows Removed by Filter', 0),
+                'filter': node.get('Filter'),
+            })
+
+    return {
+        'execution_ms': round(plan.get('Execution Time', 0.0), 3),
+        'planning_ms': round(plan.get('Planning Time', 0.0), 3),
+        'total_cost': root.get('Total Cost'),
+        'shared_hit_blocks': root.get('Shared Hit Blocks', 0),
+        'shared_read_blocks': root.get('Shared Read Blocks', 0),
+        'indexes': sorted(indexes),
+        'seq_scans': seq_scans,
+    }
+
+
+def explain_all(session, params: dict) -> dict:
+    results = {}
+    for name, sql in QUERIES.items():
+        statement = text(f'EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql}')
+        plan = session.execute(statement, params).scalar()
+        results[name] = summarize_plan(plan[0])
+    return results
+
+
+def existing_indexes(session) -> dict:
+    rows = session.execute(text("""
+        SELECT tablename, indexname
+        FROM pg_indexes
+        WHERE schemaname = current_schema() AND tablename = ANY(:tables)
+    """), {'tables': list(EXPECTED_INDEXES)}).all()
+    found = {}
+    for row in rows:
+        found.setdefault(row.tablename, set()).add(row.indexname)
+    return found
+
+
+def advise(queries: dict, indexes: dict) -> list[str]:
+    advice = []
+    for table, names in EXPECTED_INDEXES.items():
+        for name in names:
+            if name not in indexes.get(table, set()):
+                advice.append(f'missing index {name} on {table}, run flask db upgrade')
+
+    used = {name for summary in queries.values() for name in summary['indexes']}
+    for table, names in EXPECTED_INDEXES.items():
+        for name in names:
+            if name in indexes.get(table, set()) and name not in used:
+                advice.append(f'index {name} on {table} is not used by any hot path plan')
+
+    for query, summary in queries.items():
+        for scan in summary['seq_scans']:
+            scanned = scan['rows'] + scan['removed_by_filter']
+            if scanned >= SEQ_SCAN_ROW_THRESHOLD:
+                advice.append(
+                    f"{query}: seq scan on {scan['relation']} read {scanned} rows"
+                    f" (filter: {scan['filter'] or '-'})"
+                )
+    return advice
+
+
+def compare(base: dict, head: dict) -> list[str]:
+    lines = [f"{'query':<26}{'metric':<20}{base['label']:>12}{head['label']:>12}"]
+    for query in [*base['queries'], *[q for q in head['queries'] if q not in base['queries']]]:
+        base_query = base['queries'].get(query, {})
+        head_query = head['queries'].get(query, {})
+        for metric in ('execution_ms', 'shared_hit_blocks', 'shared_read_blocks'):
+            b = base_query.get(metric, '')
+            h = head_query.get(metric, '')
+            lines.append(f'{query:<26}{metric:<20}{b:>12}{h:>12}')
+        lines.append(
+            f"{query:<26}{'seq_scans':<20}{len(base_query.get('seq_scans', [])):>12}"
+            f"{len(head_query.get('seq_scans', [])):>12}"
+        )
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--label', default=None)
+    parser.add_argument('--output', default=None)
+    parser.add_argument('--compare', nargs=2, metavar=('BASE', 'HEAD'))
+    args = parser.parse_args()
+
+    if args.compare:
+        base, head = (json.loads(Path(path).read_text(encoding='utf-8')) for path in args.compare)
+        print('\n'.join(compare(base, head)))
+        return
+
+    from app.app import app
+    from app.database import db
+
+    with app.app_context():
+        session = db.session
+        try:
+            session.execute(text('ANALYZE flights, booking_flights, bookings, booking_holds'))
+            params = _sample_params(session)
+            queries = explain_all(session, params)
+            indexes = existing_indexes(session)
+        finally:
+            session.rollback()
+
+    label = args.label or _label()
+    advice = advise(queries, indexes)
+    snapshot = {
+        'label': label,
+        'generated_at': datetime.now(timezone.utc).isoformat(),
+        'queries': queries,
+        'indexes': {table: sorted(names) for table, names in indexes.items()},
+        'advice': advice,
+    }
+
+    output = Path(args.output or RESULTS_DIR / f'explain-{label}.json')
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(snapshot, indent=2, default=str), encoding='utf-8')
+
+    for name, summary in queries.items():
+        print(f"{name:<26}{summary['execution_ms']:>10} ms  indexes: {', '.join(summary['indexes']) or '-'}")
+    for line in advice:
+        print(f'advice: {line}')
+    print(f'Snapshot written to {output}')
+
+
+if __name__ == '__main__':
+    main()
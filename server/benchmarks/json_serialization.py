@@ -0,0 +1,100 @@
+"""Compare Flask's default JSON provider with OrjsonProvider on search results
+
+    docker compose exec server-app python benchmarks/json_serialization.py --flights 1000 --repeat 20
+
+Loads upcoming flights from the current database (seed it with
+benchmarks/seed.py first) and serializes them the way flight search does,
+through Flight.to_dict and the tariff lookup. Both providers then build a
+response from the same rows with sorted keys and compact output, so the
+timings differ only by the encoder. The default provider escapes non-ASCII
+characters, so its bodies are larger for Cyrillic names.
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from flask.json.provider import DefaultJSONProvider  # noqa: E402
+
+
+def _search_rows(flights: int) -> list[dict]:
+    from app.database import db
+    from app.models.flight import Flight
+    from app.utils.datetime import utc_now
+    from app.utils.search import _flight_load_options, _serialize_flights
+
+    query = (
+        db.session.query(Flight)
+        .options(*_flight_load_options())
+        .filter(Flight.departure_at_utc >= utc_now())
+        .order_by(Flight.departure_at_utc)
+        .limit(flights)
+    )
+    return _serialize_flights(query.all())
+
+
+def _provider(app, provider_class):
+    provider = provider_class(app)
+    provider.sort_keys = True
+    provider.compact = True
+    return provider
+
+
+def _measure(provider, rows: list[dict], repeat: int) -> dict:
+    samples = []
+    size = 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        response = provider.response(rows)
+        size = len(response.get_data())
+        samples.append((time.perf_counter() - started) * 1000)
+    return {
+        'median_ms': round(statistics.median(samples), 2),
+        'min_ms': round(min(samples), 2),
+        'bytes': size,
+    }
+
+
+def run(flights: int, repeat: int) -> dict:
+    from app.app import app
+    from app.utils.json_provider import OrjsonProvider
+
+    with app.app_context():
+        rows = _search_rows(flights)
+        if not rows:
+            raise SystemExit('No upcoming flights with available tariffs, seed the database first')
+
+        stdlib = _provider(app, DefaultJSONProvider)
+        fast = _provider(app, OrjsonProvider)
+        # Both bodies have to carry the same document for the timings to compare
+        if json.loads(stdlib.response(rows).get_data()) != json.loads(fast.response(rows).get_data()):
+            raise SystemExit('Providers produced different documents')
+
+        default_result = _measure(stdlib, rows, repeat)
+        orjson_result = _measure(fast, rows, repeat)
+
+    return {
+        'flights': len(rows),
+        'repeat': repeat,
+        'default': default_result,
+        'orjson': orjson_result,
+        'speedup': round(default_result['median_ms'] / orjson_result['median_ms'], 1) if orjson_result['median_ms'] else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--flights', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    print(json.dumps(run(args.flights, max(args.repeat, 1)), indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,208 @@
+"""Locust scenarios for the booking funnel
+
+search -> calculate price -> create booking -> passengers -> confirm ->
+YooKassa webhooks. Requires a dataset from benchmarks/seed.py and the
+server started with SERVER_QUERY_COUNT_HEADER=True and YOOKASSA_API_URL
+pointing at benchmarks/yookassa_stub.py.
+
+On stop a JSON report with p50/p95/p99 latency, error rate and queries
+per request for every step is written to BENCHMARK_OUTPUT (default
+benchmarks/results/<BENCHMARK_LABEL>.json) for comparison across commits.
+"""
+import json
+import os
+import random
+import subprocess
+import uuid
+
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+
+from locust import HttpUser, between, events, task
+
+
+RESULTS_DIR = Path(__file__).resolve().parent / 'results'
+MANIFEST_PATH = Path(os.environ.get('BENCHMARK_MANIFEST', RESULTS_DIR / 'manifest.json'))
+QUERY_COUNT_HEADER = 'X-Query-Count'
+
+STEPS = (
+    'search_flights',
+    'calculate_price',
+    'create_booking',
+    'add_passengers',
+    'confirm_booking',
+    'webhook_waiting_for_capture',
+    'webhook_succeeded',
+)
+
+_manifest = json.loads(MANIFEST_PATH.read_text(encoding='utf-8')) if MANIFEST_PATH.exists() else None
+_stats = defaultdict(lambda: {'latencies': [], 'queries': [], 'errors': 0})
+
+
+def _label() -> str:
+    label = os.environ.get('BENCHMARK_LABEL')
+    if label:
+        return label
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=Path(__file__).resolve().parent,
+            text=True,
+        ).strip()
+    except Exception:
+        return 'local'
+
+
+def _percentile(samples, pct):
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return ordered[min(int(round(pct / 100 * (len(ordered) - 1))), len(ordered) - 1)]
+
+
+@events.request.add_listener
+def _record_request(name, response_time, response, exception, **kwargs):
+    stats = _stats[name]
+    stats['latencies'].append(response_time)
+    if exception is not None:
+        stats['errors'] += 1
+    if response is not None and QUERY_COUNT_HEADER in response.headers:
+        stats['queries'].append(int(response.headers[QUERY_COUNT_HEADER]))
+
+
+@events.test_stop.add_listener
+def _write_report(environment, **kwargs):
+    steps = {}
+    for name in [*STEPS, *sorted(set(_stats) - set(STEPS))]:
+        stats = _stats.get(name)
+        if not stats or not stats['latencies']:
+            continue
+        requests = len(stats['latencies'])
+        queries = stats['queries']
+        steps[name] = {
+            'requests': requests,
+            'error_rate': round(stats['errors'] / requests, 4),
+            'p50_ms': _percentile(stats['latencies'], 50),
+            'p95_ms': _percentile(stats['latencies'], 95),
+            'p99_ms': _percentile(stats['latencies'], 99),
+            'queries_per_request': round(sum(queries) / len(queries), 2) if queries else None,
+        }
+
+    label = _label()
+    report = {
+        'label': label,
+        'generated_at': datetime.now(timezone.utc).isoformat(),
+        'users': environment.runner.user_count if environment.runner else None,
+        'steps': steps,
+    }
+    output = Path(os.environ.get('BENCHMARK_OUTPUT', RESULTS_DIR / f'{label}.json'))
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2), encoding='utf-8')
+
+
+class BookingFunnelUser(HttpUser):
+    wait_time = between(0.5, 2)
+
+    def on_start(self):
+        if not _manifest or not _manifest.get('routes'):
+            raise RuntimeError(f'Benchmark manifest not found: {MANIFEST_PATH}')
+        self.citizenship_id = _manifest['citizenship_id']
+
+    def _pick_search(self):
+        route = random.choice([r for r in _manifest['routes'] if r['dates']])
+        return route, random.choice(route['dates'])
+
+    def _search(self, route, departure):
+        params = {
+            'from': route['from'],
+            'to': route['to'],
+            'when': departure,
+            'date_mode': 'exact',
+            'class': 'economy',
+            'adults': 1,
+        }
+        with self.client.get('/search/flights', params=params, name='search_flights', catch_response=True) as resp:
+            flights = resp.json() if resp.ok else []
+            candidates = [
+                (flight, tariff)
+                for flight in flights
+                for tariff in flight.get('tariffs', [])
+                if tariff.get('seats_left', 0) > 0
+            ]
+            if resp.ok and not candidates:
+                resp.success()
+            return random.choice(candidates) if candidates else (None, None)
+
+    @task(3)
+    def browse(self):
+        route, departure = self._pick_search()
+        self._search(route, departure)
+
+    @task(1)
+    def book(self):
+        route, departure = self._pick_search()
+        flight, tariff = self._search(route, departure)
+        if flight is None:
+            return
+
+        selection = {
+            'outbound_id': flight['id'],
+            'outbound_tariff_id': tariff['id'],
+            'passengers': {'adults': 1},
+        }
+        self.client.post('/search/calculate/price', json=selection, name='calculate_price')
+
+        resp = self.client.post('/booking/create', json=selection, name='create_booking')
+        if not resp.ok:
+            return
+        booking = resp.json()
+        params = {'access_token': booking['access_token']}
+
+        passengers = {
+            'public_id': booking['public_id'],
+            'buyer': {
+                'buyer_last_name': 'Бенчмарков',
+                'buyer_first_name': 'Бенчмарк',
+                'email_address': 'benchmark@example.com',
+                'phone_number': '+70000000000',
+                'consent': False,
+            },
+            'passengers': [{
+                'category': 'adult',
+                'first_name': 'Бенчмарк',
+                'last_name': 'Бенчмарков',
+                'gender': 'м',
+                'birth_date': '1990-01-01',
+                'document_type': 'passport',
+                'document_number': uuid.uuid4().hex[:10],
+                'citizenship_id': self.citizenship_id,
+            }],
+        }
+        resp = self.client.post('/booking/passengers', params=params, json=passengers, name='add_passengers')
+        if not resp.ok:
+            return
+
+        resp = self.client.post(
+            '/booking/confirm',
+            params=params,
+            json={'public_id': booking['public_id'], 'is_payment': True},
+            name='confirm_booking',
+        )
+        if not resp.ok:
+            return
+        provider_payment_id = resp.json().get('provider_payment_id')
+
+        self.client.post('/webhooks/yookassa', name='webhook_waiting_for_capture', json={
+            'event': 'payment.waiting_for_capture',
+            'object': {'id': provider_payment_id, 'status': 'waiting_for_capture', 'paid': True},
+        })
+        self.client.post('/webhooks/yookassa', name='webhook_succeeded', json={
+            'event': 'payment.succeeded',
+            'object': {
+                'id': provider_payment_id,
+                'status': 'succeeded',
+                'paid': True,
+                'captured_at': datetime.now(timezone.utc).isoformat(),
+            },
+        })
@@ -0,0 +1,246 @@
+"""Seed a deterministic dataset for the booking funnel benchmark
+
+    docker compose exec server-app python benchmarks/seed.py \\
+        --routes 20 --flights 2000 --bookings 5000 --manifest benchmarks/results/manifest.json
+
+Seeded reference data uses reserved codes (airports `Z??`, airline `ZZ`,
+country `ZZ`, tariffs numbered from 901 with a marker in their conditions)
+so repeated runs reuse it instead of duplicating rows or touching real
+tariffs. Flights and bookings are appended on every run, and bookings only
+take seats on the flights seeded by the same run.
+"""
+import argparse
+import json
+import os
+import random
+import string
+import sys
+import uuid
+
+from datetime import date, datetime, time, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.app import app  # noqa: E402
+from app.database import db  # noqa: E402
+from app.models.airline import Airline  # noqa: E402
+from app.models.airport import Airport  # noqa: E402
+from app.models.booking import Booking  # noqa: E402
+from app.models.booking_flight import BookingFlight  # noqa: E402
+from app.models.country import Country  # noqa: E402
+from app.models.flight import Flight  # noqa: E402
+from app.models.flight_tariff import FlightTariff  # noqa: E402
+from app.models.route import Route  # noqa: E402
+from app.models.tariff import Tariff  # noqa: E402
+from app.models.timezone import Timezone  # noqa: E402
+from app.utils.enum import BOOKING_STATUS, CURRENCY, SEAT_CLASS  # noqa: E402
+
+
+TIMEZONE_NAME = 'Europe/Moscow'
+SEATS_PER_TARIFF = 60
+TARIFF_MARKER = 'benchmark-seed'
+TARIFFS = [
+    {'seat_class': SEAT_CLASS.economy, 'order_number': 901, 'title': 'Бенчмарк эконом', 'price': 4500.0},
+    {'seat_class': SEAT_CLASS.economy, 'order_number': 902, 'title': 'Бенчмарк эконом плюс', 'price': 6500.0},
+    {'seat_class': SEAT_CLASS.business, 'order_number': 901, 'title': 'Бенчмарк бизнес', 'price': 15000.0},
+]
+
+
+def _code(index: int, length: int) -> str:
+    letters = []
+    for _ in range(length):
+        index, rem = divmod(index, 26)
+        letters.append(string.ascii_uppercase[rem])
+    return ''.join(reversed(letters))
+
+
+def _get_or_add(session, model, lookup: dict, **values):
+    instance = session.query(model).filter_by(**lookup).one_or_none()
+    if instance is None:
+        instance = model(**lookup, **values)
+        session.add(instance)
+        session.flush()
+    return instance
+
+
+def seed_reference(session, route_count: int):
+    country = _get_or_add(
+        session, Country, {'code_a2': 'ZZ'},
+        code_a3='ZZZ', name='Бенчмарк', name_en='Benchmark',
+    )
+    timezone = _get_or_add(session, Timezone, {'name': TIMEZONE_NAME})
+    airline = _get_or_add(
+        session, Airline, {'iata_code': 'ZZ'},
+        icao_code='ZZZ', name='Benchmark Air', country_id=country.id,
+    )
+
+    tariffs = []
+    for data in TARIFFS:
+        tariff = (
+            session.query(Tariff)
+            .filter_by(seat_class=data['seat_class'], order_number=data['order_number'], conditions=TARIFF_MARKER)
+            .one_or_none()
+        )
+        if tariff is None:
+            tariff = Tariff(
+                **data,
+                conditions=TARIFF_MARKER,
+                currency=CURRENCY.rub,
+                baggage=20,
+                hand_luggage=10,
+                refund_allowed=True,
+            )
+            session.add(tariff)
+            session.flush()
+        tariffs.append(tariff)
+
+    # Routes come in pairs (A -> B, B -> A) so round trips can be searched
+    pair_count = (route_count + 1) // 2
+    routes = []
+    for pair in range(pair_count):
+        airports = []
+        for offset in (0, 1):
+            index = pair * 2 + offset
+            suffix = _code(index, 2)
+            airports.append(_get_or_add(
+                session, Airport, {'iata_code': f'Z{suffix}'},
+                icao_code=f'ZZ{suffix}',
+                name=f'Benchmark {suffix}',
+                city_name=f'Бенчмарк {suffix}',
+                city_code=f'Z{suffix}',
+                country_id=country.id,
+                timezone_id=timezone.id,
+            ))
+        origin, dest = airports
+        for a, b in ((origin, dest), (dest, origin)):
+            if len(routes) >= route_count:
+                break
+            routes.append(_get_or_add(
+                session, Route,
+                {'origin_airport_id': a.id, 'destination_airport_id': b.id},
+            ))
+
+    session.commit()
+    return country, airline, tariffs, routes
+
+
+def seed_flights(session, rng, airline, tariffs, routes, flight_count: int, days: int):
+    start = date.today() + timedelta(days=2)
+    existing = session.query(Flight).filter(Flight.airline_id == airline.id).count()
+
+    flights = []
+    for i in range(flight_count):
+        route = routes[i % len(routes)]
+        departure_date = start + timedelta(days=rng.randrange(days))
+        departure_time = time(hour=rng.randrange(6, 22), minute=rng.choice((0, 15, 30, 45)))
+        arrival_dt = datetime.combine(departure_date, departure_time) + timedelta(minutes=rng.randrange(60, 300))
+        flights.append(Flight(
+            flight_number=str(1000 + existing + i),
+            route_id=route.id,
+            airline_id=airline.id,
+            scheduled_departure=departure_date,
+            scheduled_departure_time=departure_time,
+            scheduled_arrival=arrival_dt.date(),
+            scheduled_arrival_time=arrival_dt.time(),
+        ))
+    session.add_all(flights)
+    session.flush()
+    Flight.sync_schedule_utc(flights, session)
+
+    flight_tariffs = [
+        FlightTariff(flight_id=flight.id, tariff_id=tariff.id, seats_number=SEATS_PER_TARIFF)
+        for flight in flights
+        for tariff in tariffs
+    ]
+    session.add_all(flight_tariffs)
+    session.flush()
+    flight_tariff_ids = [flight_tariff.id for flight_tariff in flight_tariffs]
+    session.commit()
+    return flight_tariff_ids
+
+
+def seed_bookings(session, rng, flight_tariff_ids: list[int], booking_count: int):
+    if not flight_tariff_ids:
+        return 0
+
+    now = datetime.now().isoformat()
+    for offset in range(0, booking_count, 500):
+        batch = []
+        for _ in range(min(500, booking_count - offset)):
+            booking = Booking(
+                status=BOOKING_STATUS.completed,
+                status_history=[{'status': BOOKING_STATUS.completed.value, 'at': now}],
+                access_token=uuid.uuid4(),
+                currency=CURRENCY.rub,
+                fare_price=4500.0,
+                total_price=4500.0,
+                passenger_counts={'adults': 1},
+                buyer_last_name='Бенчмарков',
+                buyer_first_name='Бенчмарк',
+                email_address='benchmark@example.com',
+            )
+            batch.append(booking)
+        session.add_all(batch)
+        session.flush()
+        session.add_all([
+            BookingFlight(
+                booking_id=booking.id,
+                flight_tariff_id=rng.choice(flight_tariff_ids),
+                seats_number=1,
+            )
+            for booking in batch
+        ])
+        session.commit()
+
+    return booking_count
+
+
+def build_manifest(session, country, airline, routes):
+    searches = []
+    for route in routes:
+        rows = (
+            session.query(Flight.scheduled_departure)
+            .filter(Flight.route_id == route.id, Flight.airline_id == airline.id)
+            .distinct()
+            .order_by(Flight.scheduled_departure)
+            .limit(30)
+            .all()
+        )
+        searches.append({
+            'from': route.origin_airport.iata_code,
+            'to': route.destination_airport.iata_code,
+            'dates': [row.scheduled_departure.isoformat() for row in rows],
+        })
+    return {'citizenship_id': country.id, 'routes': searches}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--routes', type=int, default=20)
+    parser.add_argument('--flights', type=int, default=2000)
+    parser.add_argument('--bookings', type=int, default=5000)
+    parser.add_argument('--days', type=int, default=60)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument(
+        '--manifest',
+        default=os.path.join(os.path.dirname(__file__), 'results', 'manifest.json'),
+    )
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+
+    with app.app_context():
+        session = db.session
+        country, airline, tariffs, routes = seed_reference(session, args.routes)
+        flight_tariff_ids = seed_flights(session, rng, airline, tariffs, routes, args.flights, args.days)
+        seed_bookings(session, rng, flight_tariff_ids, args.bookings)
+        manifest = build_manifest(session, country, airline, routes)
+
+    Path(args.manifest).parent.mkdir(parents=True, exist_ok=True)
+    Path(args.manifest).write_text(json.dumps(manifest, ensure_ascii=False, indent=2), encoding='utf-8')
+    print(f'Seeded {args.routes} routes, {args.flights} flights, {args.bookings} bookings -> {args.manifest}')
+
+
+if __name__ == '__main__':
+    main()
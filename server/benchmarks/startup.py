@@ -0,0 +1,95 @@
+"""Measure import time and memory of each worker type at boot
+
+Run from the server directory with the usual environment loaded:
+
+    python benchmarks/startup.py --repeat 5
+
+Every sample boots a fresh interpreter the way gunicorn or celery would,
+so module caches never leak between runs. 'public' and 'admin' build the
+split web tiers. 'web-warm' also resolves every lazily registered view,
+which matches the cost of the old eager controller imports.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from pathlib import Path
+
+
+SERVER_DIR = Path(__file__).resolve().parent.parent
+
+HEAVY_MODULES = ('weasyprint', 'openpyxl', 'xlrd', 'xlwt', 'yookassa', 'PIL', 'boto3')
+
+PROFILES = {
+    'web': ('web', 'web', 'from app.app import app'),
+    'web-warm': ('web', 'web', 'from app.app import app\n'
+                               'from app.utils.lazy_import import resolve_lazy_views\n'
+                               'resolve_lazy_views(app)'),
+    'public': ('web', 'public', 'from app.app import app'),
+    'admin': ('web', 'admin', 'from app.app import app'),
+    'celery': ('celery', 'celery', 'from app.celery_app import celery\ncelery.loader.import_default_modules()'),
+    'beat': ('beat', 'celery', 'from app.celery_app import celery'),
+}
+
+PROBE = '''
+import json, sys, time
+started = time.perf_counter()
+{boot}
+elapsed = time.perf_counter() - started
+rss_kb = None
+try:
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith('VmRSS:'):
+                rss_kb = int(line.split()[1])
+except OSError:
+    import resource
+    rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+heavy = sorted(name for name in {heavy!r} if name in sys.modules)
+print(json.dumps({{'import_s': elapsed, 'rss_kb': rss_kb, 'modules': len(sys.modules), 'heavy': heavy}}))
+'''
+
+
+def _boot(process_type: str, app_profile: str, boot: str) -> dict:
+    # dev and test resolve every view at boot, which would hide the cost of lazy imports
+    env = {**os.environ, 'SERVER_PROCESS_TYPE': process_type, 'SERVER_APP_PROFILE': app_profile, 'SERVER_APP_ENV': 'prod'}
+    result = subprocess.run(
+        [sys.executable, '-c', PROBE.format(boot=boot, heavy=HEAVY_MODULES)],
+        cwd=SERVER_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def run(profiles: list[str], repeat: int) -> dict:
+    report = {}
+    for name in profiles:
+        samples = [_boot(*PROFILES[name]) for _ in range(repeat)]
+        report[name] = {
+            'import_ms_median': round(statistics.median(s['import_s'] for s in samples) * 1000, 1),
+            'import_ms_max': round(max(s['import_s'] for s in samples) * 1000, 1),
+            'rss_mb_median': round(statistics.median(s['rss_kb'] for s in samples) / 1024, 1),
+            'modules': samples[-1]['modules'],
+            'heavy_modules': samples[-1]['heavy'],
+        }
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--profile', action='append', choices=sorted(PROFILES), dest='profiles')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    report = run(args.profiles or list(PROFILES), max(args.repeat, 1))
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
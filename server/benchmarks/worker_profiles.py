@@ -0,0 +1,116 @@
+"""Compare gunicorn worker profiles under a mixed fast/slow workload
+
+Start the server with the profile under test, e.g.
+
+    SERVER_GUNICORN_PROFILE=sync gunicorn --config gunicorn_conf.py app.app:app
+    SERVER_GUNICORN_PROFILE=gthread gunicorn --config gunicorn_conf.py app.app:app
+
+and run
+
+    python benchmarks/worker_profiles.py --base-url http://localhost:8000 \\
+        --fast /search/airports --slow '/booking/<public_id>/pdf?access_token=<token>'
+
+Slow requests keep workers busy while fast requests measure how much the
+remaining capacity degrades. Run once per profile and compare the output.
+"""
+import argparse
+import json
+import statistics
+import threading
+import time
+import urllib.error
+import urllib.request
+
+from concurrent.futures import ThreadPoolExecutor
+
+
+def _fetch(url: str, timeout: float) -> tuple[float, int]:
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(url, timeout=timeout) as response:
+            response.read()
+            status = response.status
+    except urllib.error.HTTPError as exc:
+        status = exc.code
+    except Exception:
+        status = 0
+    return time.perf_counter() - started, status
+
+
+def _percentile(samples: list[float], pct: float) -> float | None:
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    index = min(int(round(pct / 100 * (len(ordered) - 1))), len(ordered) - 1)
+    return ordered[index]
+
+
+def _summarize(samples: list[tuple[float, int]], duration: float) -> dict:
+    latencies = [latency * 1000 for latency, status in samples if 200 <= status < 400]
+    errors = sum(1 for _, status in samples if not 200 <= status < 400)
+    return {
+        'requests': len(samples),
+        'errors': errors,
+        'rps': round(len(samples) / duration, 2) if duration else None,
+        'p50_ms': _percentile(latencies, 50),
+        'p95_ms': _percentile(latencies, 95),
+        'p99_ms': _percentile(latencies, 99),
+        'mean_ms': statistics.fmean(latencies) if latencies else None,
+    }
+
+
+def run(base_url: str, fast: str, slow: str | None, concurrency: int,
+        slow_concurrency: int, duration: float, timeout: float) -> dict:
+    deadline = time.monotonic() + duration
+    results: dict[str, list[tuple[float, int]]] = {'fast': [], 'slow': []}
+    lock = threading.Lock()
+
+    def loop(kind: str, url: str):
+        while time.monotonic() < deadline:
+            sample = _fetch(url, timeout)
+            with lock:
+                results[kind].append(sample)
+
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=concurrency + slow_concurrency) as pool:
+        for _ in range(concurrency):
+            pool.submit(loop, 'fast', base_url.rstrip('/') + fast)
+        if slow:
+            for _ in range(slow_concurrency):
+                pool.submit(loop, 'slow', base_url.rstrip('/') + slow)
+    elapsed = time.monotonic() - started
+
+    return {
+        'duration_s': round(elapsed, 2),
+        'concurrency': concurrency,
+        'slow_concurrency': slow_concurrency if slow else 0,
+        'fast': _summarize(results['fast'], elapsed),
+        'slow': _summarize(results['slow'], elapsed) if slow else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--base-url', default='http://localhost:8000')
+    parser.add_argument('--fast', default='/search/airports')
+    parser.add_argument('--slow', default=None)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--slow-concurrency', type=int, default=4)
+    parser.add_argument('--duration', type=float, default=30.0)
+    parser.add_argument('--timeout', type=float, default=60.0)
+    args = parser.parse_args()
+
+    report = run(
+        args.base_url,
+        args.fast,
+        args.slow,
+        args.concurrency,
+        args.slow_concurrency,
+        args.duration,
+        args.timeout,
+    )
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+"""Minimal YooKassa API stub for load testing
+
+Implements the subset of the v3 API used by app.utils.yookassa. Point the
+server at it with YOOKASSA_API_URL=http://yookassa-stub:8090/v3.
+"""
+import argparse
+import json
+import threading
+import uuid
+
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+_payments: dict[str, dict] = {}
+_lock = threading.Lock()
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec='milliseconds').replace('+00:00', 'Z')
+
+
+def _payment(body: dict, status: str) -> dict:
+    payment_id = str(uuid.uuid4())
+    return {
+        'id': payment_id,
+        'status': status,
+        'paid': False,
+        'amount': body.get('amount') or (body.get('payment_data') or {}).get('amount'),
+        'confirmation': {'type': 'embedded', 'confirmation_token': f'ct-{payment_id}'},
+        'created_at': _now(),
+        'metadata': body.get('metadata') or {},
+        'test': True,
+        'refundable': False,
+    }
+
+
+class YooKassaStubHandler(BaseHTTPRequestHandler):
+
+    def _read_body(self) -> dict:
+        length = int(self.headers.get('Content-Length') or 0)
+        if not length:
+            return {}
+        return json.loads(self.rfile.read(length) or b'{}')
+
+    def _send(self, payload: dict, status: int = 200) -> None:
+        data = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        body = self._read_body()
+        parts = [part for part in self.path.split('/') if part]
+
+        if parts[-1] == 'payments':
+            payment = _payment(body, 'pending')
+        elif parts[-1] == 'invoices':
+            payment = _payment(body, 'pending')
+            payment['payment_url'] = f'http://localhost/invoice/{payment["id"]}'
+        elif parts[-1] == 'refunds':
+            payment = _payment(body, 'succeeded')
+            payment['payment_id'] = body.get('payment_id')
+        elif parts[-1] == 'capture' and len(parts) >= 2:
+            with _lock:
+                payment = _payments.get(parts[-2]) or _payment(body, 'pending')
+                payment.update(status='succeeded', paid=True, captured_at=_now())
+            return self._send(payment)
+        else:
+            return self._send({'type': 'error', 'code': 'not_found'}, 404)
+
+        with _lock:
+            _payments[payment['id']] = payment
+        return self._send(payment)
+
+    def do_GET(self):
+        parts = [part for part in self.path.split('/') if part]
+        payment_id = parts[-1] if parts else ''
+        with _lock:
+            payment = _payments.get(payment_id)
+        if payment is None:
+            # Payments created before a stub restart are reported as authorized
+            payment = {'id': payment_id, 'status': 'waiting_for_capture', 'paid': True, 'created_at': _now()}
+        elif payment['status'] == 'pending':
+            payment = {**payment, 'status': 'waiting_for_capture', 'paid': True}
+        return self._send(payment)
+
+    def log_message(self, format, *args):
+        return
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=8090)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer((args.host, args.port), YooKassaStubHandler)
+    server.serve_forever()
+
+
+if __name__ == '__main__':
+    main()
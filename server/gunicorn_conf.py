@@ -1,12 +1,123 @@
-from app.logging_config import build_logging_config, configure_logging
+import logging
+import multiprocessing
+import os
+import re
+import time
+
+from app.config import Config
+from app.logging_config import build_logging_config, configure_logging, restart_queue_listeners
+
+
+WORKER_PROFILE = os.environ.get('SERVER_GUNICORN_PROFILE', 'gthread')
+CPU_COUNT = multiprocessing.cpu_count()
+
+# Requests slower than this are logged, routes with a longer statement_timeout class get its limit
+SLOW_REQUEST_SECONDS = float(os.environ.get('SERVER_GUNICORN_SLOW_REQUEST_SECONDS', 5))
+SLOW_ROUTE_TIMEOUT_CLASSES = [
+    (re.compile(pattern), timeout_class) for pattern, timeout_class in (
+        (r'^/exports/', 'report'),
+        (r'^/imports/', 'report'),
+        (r'^/[a-z_]+/upload$', 'report'),
+        (r'^/[a-z_]+/download$', 'report'),
+        (r'^/webhooks/', 'webhook'),
+    )
+]
+
+
+def _web_pool_capacity() -> int:
+    profile = Config.DB_ENGINE_PROFILES['web']
+    return profile['pool_size'] + profile['max_overflow']
+
+
+def _default_workers() -> int:
+    if WORKER_PROFILE == 'sync':
+        return CPU_COUNT * 2 + 1
+    if WORKER_PROFILE == 'gevent':
+        return CPU_COUNT
+    return CPU_COUNT + 1
+
+
+def _default_threads() -> int:
+    # One DB connection per thread so threads never queue on the pool
+    if Config.DB_USE_NULL_POOL:
+        return 4
+    return max(_web_pool_capacity(), 1)
+
 
 bind = '0.0.0.0:8000'
-timeout = 600
 accesslog = '-'
 errorlog = '-'
+# The request id header ties access lines to the application's structured records
+access_log_format = '%(h)s "%(r)s" %(s)s %(b)s %(M)sms rid=%({x-request-id}o)s'
 logconfig_dict = build_logging_config()
 
+workers = int(os.environ.get('SERVER_GUNICORN_WORKERS', _default_workers()))
+max_requests = int(os.environ.get('SERVER_GUNICORN_MAX_REQUESTS', 1000))
+max_requests_jitter = int(os.environ.get('SERVER_GUNICORN_MAX_REQUESTS_JITTER', 100))
+graceful_timeout = 30
+keepalive = 5
+
+if WORKER_PROFILE == 'gthread':
+    worker_class = 'gthread'
+    threads = int(os.environ.get('SERVER_GUNICORN_THREADS', _default_threads()))
+    # The heartbeat runs outside request threads, so slow routes do not trip it
+    timeout = int(os.environ.get('SERVER_GUNICORN_TIMEOUT', 30))
+elif WORKER_PROFILE == 'gevent':
+    worker_class = 'gevent'
+    # Greenlets past the pool capacity would only wait on the pool and time out there
+    worker_connections = int(os.environ.get('SERVER_GUNICORN_WORKER_CONNECTIONS', _default_threads()))
+    if not Config.DB_USE_NULL_POOL:
+        worker_connections = min(worker_connections, max(_web_pool_capacity(), 1))
+    timeout = int(os.environ.get('SERVER_GUNICORN_TIMEOUT', 30))
+else:
+    worker_class = 'sync'
+    # A sync worker is blocked for the whole request, so slow routes need the long limit
+    timeout = int(os.environ.get('SERVER_GUNICORN_TIMEOUT', 600))
+
+
+def _slow_request_seconds(path: str) -> float:
+    """Slow threshold of a route, the statement_timeout that bounds its queries when that is longer"""
+    for pattern, timeout_class in SLOW_ROUTE_TIMEOUT_CLASSES:
+        if pattern.search(path):
+            return max(Config.DB_STATEMENT_TIMEOUTS_MS[timeout_class] / 1000, SLOW_REQUEST_SECONDS)
+    return SLOW_REQUEST_SECONDS
+
 
 def on_starting(server):
     """Ensure logging is configured before workers fork"""
     configure_logging(force=True)
+
+
+def post_fork(server, worker):
+    """Restart log listener threads and make psycopg2 cooperative under gevent"""
+    restart_queue_listeners()
+
+    if WORKER_PROFILE != 'gevent':
+        return
+
+    from psycogreen.gevent import patch_psycopg
+    patch_psycopg()
+
+
+def pre_request(worker, req):
+    req.started_at = time.monotonic()
+
+
+def post_request(worker, req, environ, resp):
+    started_at = getattr(req, 'started_at', None)
+    if started_at is None:
+        return
+
+    duration = time.monotonic() - started_at
+    if duration < _slow_request_seconds(req.path):
+        return
+
+    logging.getLogger('gunicorn.error').warning(
+        'Slow request',
+        extra={
+            'method': req.method,
+            'path': req.path,
+            'duration_ms': int(duration * 1000),
+            'worker_profile': WORKER_PROFILE,
+        },
+    )
@@ -0,0 +1,34 @@
+"""Flight effective departure index
+
+Revision ID: d8b3f6a1c429
+Revises: c5f1a8d3e274
+Create Date: 2026-10-19 19:12:44.518203
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd8b3f6a1c429'
+down_revision = 'c5f1a8d3e274'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Built concurrently so search and booking writes are not blocked
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_flights_departure_at_effective',
+            'flights',
+            [sa.text('coalesce(scheduled_departure_at_utc, scheduled_departure_at)')],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_flights_departure_at_effective', table_name='flights', postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,73 @@
+"""Hot path indexes
+
+Revision ID: e7a9c2d41b68
+Revises: 8d41c6b9e027
+Create Date: 2026-10-19 12:36:09.640512
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e7a9c2d41b68'
+down_revision = '8d41c6b9e027'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Built concurrently so search and booking writes are not blocked
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_flights_route_departure',
+            'flights',
+            ['route_id', 'scheduled_departure', 'scheduled_departure_time'],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            'ix_booking_flights_flight_tariff_booking',
+            'booking_flights',
+            ['flight_tariff_id', 'booking_id'],
+            unique=False,
+            postgresql_include=['seats_number'],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            'ix_bookings_active_status',
+            'bookings',
+            ['status'],
+            unique=False,
+            postgresql_where=sa.text("status NOT IN ('completed', 'expired', 'cancelled')"),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            'ix_bookings_expired_created_at',
+            'bookings',
+            ['created_at'],
+            unique=False,
+            postgresql_where=sa.text("status = 'expired'"),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            op.f('ix_booking_holds_expires_at'),
+            'booking_holds',
+            ['expires_at'],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index(op.f('ix_booking_holds_expires_at'), table_name='booking_holds', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_bookings_expired_created_at', table_name='bookings', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_bookings_active_status', table_name='bookings', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_booking_flights_flight_tariff_booking', table_name='booking_flights', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_flights_route_departure', table_name='flights', postgresql_concurrently=True, if_exists=True)
@@ -42,4 +42,9 @@ done
 export APP_LOG_DIR="$LOG_DIR/app"
 export STORAGE_DIR
 
+# Worker processes per Celery queue, see supervisord.conf
+export SERVER_CELERY_BOOKING_CONCURRENCY="${SERVER_CELERY_BOOKING_CONCURRENCY:-2}"
+export SERVER_CELERY_RENDERING_CONCURRENCY="${SERVER_CELERY_RENDERING_CONCURRENCY:-1}"
+export SERVER_CELERY_REPORTS_CONCURRENCY="${SERVER_CELERY_REPORTS_CONCURRENCY:-1}"
+
 exec supervisord -c "$SCRIPT_DIR/supervisord.conf"